@@ -3,10 +3,54 @@ Recipe Search with AI
 
 Allows searches in natural language using local AI models.
 Examples: "Cena rápida sin gluten", "Postre vegano fácil"
+
+With RECIPES_STORAGE=sqlite the candidates sent to the model are
+preselected with the full-text index (name, description, ingredients)
+instead of being the first recipes of the file.
 """
 
 import ollama
 import json
+import sys
+from pathlib import Path
+
+# Agregar el directorio scripts al path para importar constants y services
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import RECIPES_FILE, RECIPES_STORAGE
+from services.parser_service import ParserService
+from services.storage import SqliteRecipeStore
+
+# Recetas que se le pasan al modelo por consulta
+MAX_CANDIDATES = 20
+
+
+def preseleccionar_recetas(consulta, recetas):
+    """
+    Pick the candidate recipes for a query.
+
+    With RECIPES_STORAGE=sqlite they come from the FTS5 index, ordered by
+    relevance. Otherwise (or with no full-text match) the first
+    MAX_CANDIDATES recipes are used.
+
+    Args:
+        consulta: Search query in natural language
+        recetas: Enriched recipes
+
+    Returns:
+        List of indices into recetas
+    """
+    store = ParserService(RECIPES_FILE, storage=RECIPES_STORAGE).store
+    if isinstance(store, SqliteRecipeStore) and store.exists():
+        posiciones = {r.get("id"): idx for idx, r in enumerate(recetas)}
+        encontradas = [
+            posiciones[r["id"]]
+            for r in store.search(consulta, limit=MAX_CANDIDATES)
+            if r.get("id") in posiciones
+        ]
+        if encontradas:
+            return encontradas
+
+    return list(range(min(MAX_CANDIDATES, len(recetas))))
 
 
 def buscar_recetas(consulta, archivo_recetas="src/data/recipes_enriquecidas.json"):
@@ -24,9 +68,10 @@ def buscar_recetas(consulta, archivo_recetas="src/data/recipes_enriquecidas.json
     with open(archivo_recetas, "r", encoding="utf-8") as f:
         recetas = json.load(f)
 
-    # Crear un resumen de todas las recetas
+    # Crear un resumen de las recetas candidatas
     resumen_recetas = []
-    for idx, r in enumerate(recetas):
+    for idx in preseleccionar_recetas(consulta, recetas):
+        r = recetas[idx]
         resumen_recetas.append(
             {
                 "id": idx,
@@ -39,7 +84,7 @@ def buscar_recetas(consulta, archivo_recetas="src/data/recipes_enriquecidas.json
 
     prompt = f"""
     Tengo estas recetas:
-    {json.dumps(resumen_recetas[:20], ensure_ascii=False)}
+    {json.dumps(resumen_recetas, ensure_ascii=False)}
     
     El usuario busca: "{consulta}"
     
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Bench Related Recipes - Compara los motores de recetas relacionadas
+Genera catálogos sintéticos, mide cuánto tarda cada backend y verifica que
+los backends exactos devuelvan exactamente las mismas related_recipes. Para
+los backends aproximados (minhash) reporta el recall contra el exacto.
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from constants import MINHASH_BANDS, MINHASH_MAX_TOKEN_DF, MINHASH_NUM_PERM
+from services.related import ENGINES, resolve_engine_cls
+
+# Vocabulario sintético: unos pocos ingredientes/tags muy comunes ("sal",
+# "huevo") y una cola larga de poco frecuentes, como en el catálogo real
+COMMON_INGREDIENTS = ["sal", "huevo", "aceite", "azúcar", "harina", "leche", "ajo"]
+COMMON_TAGS = ["Facil", "Postres", "Vegetariano", "Pastas", "Tortas", "Sin_gluten"]
+
+
+def generate_synthetic_recipes(count, seed=42):
+    """
+    Genera recetas sintéticas con la forma de recipes.json
+
+    Args:
+        count: Cantidad de recetas
+        seed: Semilla para que el catálogo sea reproducible
+
+    Returns:
+        list: Recetas con id, name, tags, cleaned_ingredientes y easy
+    """
+    rng = random.Random(seed)
+    ingredients = COMMON_INGREDIENTS + [f"ingrediente {i}" for i in range(2000)]
+    tags = COMMON_TAGS + [f"Tag{i}" for i in range(300)]
+    # Pesos tipo Zipf: los primeros términos aparecen muchísimo más
+    ingredient_weights = [1 / (rank + 1) for rank in range(len(ingredients))]
+    tag_weights = [1 / (rank + 1) for rank in range(len(tags))]
+
+    recipes = []
+    for i in range(count):
+        recipe_ingredients = set(
+            rng.choices(ingredients, ingredient_weights, k=rng.randint(3, 12))
+        )
+        recipe_tags = set(rng.choices(tags, tag_weights, k=rng.randint(1, 5)))
+        recipes.append(
+            {
+                "id": 3_000_000_000_000_000_000 + i,
+                "name": f"Receta sintética {i}",
+                "tags": sorted(recipe_tags),
+                "cleaned_ingredientes": sorted(recipe_ingredients),
+                "easy": rng.random() < 0.7,
+            }
+        )
+    return recipes
+
+
+def run_backend(name, recipes, max_results, engine_options=None):
+    """
+    Calcula las related_recipes con un backend y mide el tiempo total
+    (incluye la construcción de índices/matrices/firmas)
+
+    Args:
+        engine_options: kwargs extra para el motor (perillas de minhash)
+
+    Returns:
+        tuple: (lista de related_recipes por receta, segundos)
+    """
+    start = time.perf_counter()
+    engine = resolve_engine_cls(name)(recipes, **(engine_options or {}))
+    related = engine.compute(max_results)
+    return related, time.perf_counter() - start
+
+
+def measure_recall(exact, approx):
+    """
+    Compara un resultado aproximado contra el exacto
+
+    Returns:
+        tuple: (recall por id, recall por score). El recall por score cuenta
+        como acierto una receta distinta con el mismo score (empates).
+    """
+    total = hits_id = hits_score = 0
+    for exact_related, approx_related in zip(exact, approx):
+        exact_ids = {e["recipe_id"] for e in exact_related}
+        approx_ids = {e["recipe_id"] for e in approx_related}
+        exact_scores = Counter(e["score"] for e in exact_related)
+        approx_scores = Counter(e["score"] for e in approx_related)
+
+        total += len(exact_related)
+        hits_id += len(exact_ids & approx_ids)
+        hits_score += sum((exact_scores & approx_scores).values())
+
+    if not total:
+        return 1.0, 1.0
+    return hits_id / total, hits_score / total
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark de los motores de recetas relacionadas"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 50_000],
+        help="Tamaños de catálogo sintético (default: 1000 10000 50000)",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=sorted(ENGINES),
+        default=sorted(ENGINES),
+        help="Backends a comparar (default: todos)",
+    )
+    parser.add_argument(
+        "--max-results",
+        type=int,
+        default=3,
+        help="Recetas relacionadas por receta (default: 3)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (default: 42)")
+    parser.add_argument(
+        "--num-perm",
+        type=int,
+        default=MINHASH_NUM_PERM,
+        help=f"minhash: largo de la firma (default: {MINHASH_NUM_PERM})",
+    )
+    parser.add_argument(
+        "--bands",
+        type=int,
+        default=MINHASH_BANDS,
+        help=f"minhash: bandas LSH, más = más recall (default: {MINHASH_BANDS})",
+    )
+    parser.add_argument(
+        "--max-token-df",
+        type=float,
+        default=MINHASH_MAX_TOKEN_DF,
+        help="minhash: fracción máxima del catálogo de un token para entrar en "
+        f"la firma (default: {MINHASH_MAX_TOKEN_DF})",
+    )
+    args = parser.parse_args()
+
+    # Primero los exactos: el primero es la referencia para todos los demás
+    backends = sorted(args.backends, key=lambda name: not ENGINES[name].EXACT)
+    engine_options = {
+        "minhash": {
+            "num_perm": args.num_perm,
+            "bands": args.bands,
+            "max_token_df": args.max_token_df,
+        }
+    }
+
+    print("⏱️  Benchmark de recetas relacionadas")
+    print("=" * 50)
+
+    all_equal = True
+    for size in args.sizes:
+        recipes = generate_synthetic_recipes(size, seed=args.seed)
+        print(f"\n📚 {size} recetas sintéticas")
+
+        reference = None
+        for name in backends:
+            related, elapsed = run_backend(
+                name, recipes, args.max_results, engine_options.get(name)
+            )
+            print(f"  • {name:<8} {elapsed:8.2f}s")
+
+            if reference is None:
+                if ENGINES[name].EXACT:
+                    reference = (name, related)
+            elif not ENGINES[name].EXACT:
+                id_recall, score_recall = measure_recall(reference[1], related)
+                print(
+                    f"    recall vs {reference[0]}: {id_recall:.1%} por id, "
+                    f"{score_recall:.1%} por score"
+                )
+            elif related != reference[1]:
+                all_equal = False
+                print(f"  ❌ {name} difiere de {reference[0]}")
+
+        exact_count = sum(1 for name in backends if ENGINES[name].EXACT)
+        if exact_count > 1 and all_equal:
+            print("  ✅ Todos los backends exactos devuelven el mismo resultado")
+
+    if not all_equal:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Compact Recipes - Exporta recipes.json a partir del almacenamiento configurado
+(RECIPES_STORAGE=sharded: un archivo por id + manifest en RECIPES_SHARDS_DIR;
+RECIPES_STORAGE=sqlite: la base RECIPES_DB; RECIPES_STORAGE=journal: vuelca
+los cambios de RECIPES_JOURNAL en recipes.json y vacía el journal).
+Con --split hace lo inverso: carga el recipes.json actual en ese
+almacenamiento (para empezar a usarlo; con journal no hace falta).
+"""
+
+import argparse
+
+from constants import RECIPES_FILE, RECIPES_STORAGE
+from services.parser_service import ParserService
+from services.storage import STORES
+
+
+def main():
+    """Función principal"""
+    choices = [name for name in STORES if name != "json"]
+    parser_args = argparse.ArgumentParser(
+        description="Exporta recipes.json desde el almacenamiento de recetas (o lo carga con --split)"
+    )
+    parser_args.add_argument(
+        "--storage",
+        choices=choices,
+        default=RECIPES_STORAGE if RECIPES_STORAGE in choices else "sharded",
+        help="Almacenamiento de origen/destino (default: RECIPES_STORAGE o sharded)",
+    )
+    parser_args.add_argument(
+        "--split",
+        action="store_true",
+        help="Cargar el recipes.json actual en el almacenamiento",
+    )
+    args = parser_args.parse_args()
+
+    parser = ParserService(RECIPES_FILE, storage=args.storage)
+    store = parser.store
+
+    if args.split:
+        recipes = parser.json_store.load() if parser.json_store.exists() else []
+        if not recipes:
+            print("❌ No se encontraron recetas en recipes.json")
+            return
+        detail = store.save(recipes)
+        print(f"✅ {len(recipes)} recetas en {store.location}")
+        print(f"📝 {detail}")
+        return
+
+    if not store.exists():
+        print(f"❌ No hay recetas en {store.location} (usá --split para crearlo)")
+        return
+
+    # Reescribir recipes.json receta por receta, con el mismo formato y orden
+    # que save_recipes
+    total = store.export_json(parser.recipes_path)
+    print(f"✅ Archivo actualizado: {parser.recipes_path}")
+    print(f"📊 Total de recetas: {total}")
+
+    # Regenerar el índice de metadatos del archivo nuevo
+    parser.json_store.get_index()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,9 +22,14 @@ INSTAGRAM_USERNAME = os.getenv("INSTAGRAM_USERNAME", "al.horno.con.papa")
 LOGIN_USERNAME = os.getenv("INSTAGRAM_LOGIN_USERNAME", "")
 LOGIN_PASSWORD = os.getenv("INSTAGRAM_LOGIN_PASSWORD", "")
 
-# Adapter a usar para traer posts: "apify" (por defecto) o "instaloader"
+# Adapter a usar para traer posts: "apify" (por defecto), "instaloader" o
+# "replay" (reproduce INSTAGRAM_ARCHIVE sin red)
 INSTAGRAM_ADAPTER = os.getenv("INSTAGRAM_ADAPTER") or "apify"
 
+# Posts crudos grabados con main.py --record (JSONL con gzip), que lee el
+# adapter "replay"
+INSTAGRAM_ARCHIVE = os.getenv("INSTAGRAM_ARCHIVE") or "data/instagram_raw.jsonl.gz"
+
 # Configuración de Apify (adapter alternativo a instaloader para traer posts)
 APIFY_TOKEN = os.getenv("APIFY_TOKEN", "")
 # Límite de posts por corrida del actor. Con 5 entran los 2 pinned (que se
@@ -34,9 +39,42 @@ try:
 except ValueError:
     APIFY_RESULTS_LIMIT = 8
 
+# Ritmo de instaloader entre posts (token bucket): en promedio un post cada
+# INSTALOADER_PACING_INTERVAL segundos, hasta INSTALOADER_PACING_BURST
+# seguidos, con hasta INSTALOADER_PACING_JITTER segundos extra al azar
+INSTALOADER_PACING_INTERVAL = 2.0
+INSTALOADER_PACING_BURST = 1
+INSTALOADER_PACING_JITTER = 1.0
+
+# get_posts deja de pedir posts después de esta cantidad de posts no pinned
+# seguidos que ya están en recipes.json (0 = no cortar por posts conocidos)
+KNOWN_POSTS_STOP = 3
+
+# Descarga de imágenes de posts nuevos: descargas en paralelo (también es el
+# tamaño del pool de conexiones HTTP) y timeout por imagen en segundos
+IMAGE_DOWNLOAD_WORKERS = 8
+IMAGE_DOWNLOAD_TIMEOUT = 10
+# Posts que el fetch puede adelantarse al parseo en main.py (ingest_pipeline)
+INGEST_QUEUE_SIZE = 32
+
 # Rutas de archivos
 RECIPES_FILE = "src/data/recipes.json"
 IMAGES_DIR = "public/images"
+# Caches locales entre corridas (no se versionan; se pueden borrar)
+CACHE_DIR = "scripts/.cache"
+
+# Almacenamiento de recetas: "json" (solo recipes.json), "sharded" (un
+# archivo por receta en RECIPES_SHARDS_DIR + manifest), "sqlite" (RECIPES_DB,
+# con índices y búsqueda full-text) o "journal" (recipes.json + los cambios
+# en RECIPES_JOURNAL). Con los tres últimos recipes.json se exporta/compacta
+# con compact_recipes.py
+RECIPES_STORAGE = os.getenv("RECIPES_STORAGE", "json")
+RECIPES_SHARDS_DIR = "data/recipes"
+RECIPES_DB = "data/recipes.sqlite3"
+RECIPES_JOURNAL = "data/recipes.journal.jsonl"
+# Con "journal": compactar en recipes.json al superar esta cantidad de
+# operaciones (0 = solo con compact_recipes.py)
+JOURNAL_COMPACT_ENTRIES = 2000
 
 # Tags a omitir durante el procesamiento
 TAGS_TO_SKIP = [
@@ -372,8 +410,10 @@ TAG_SYNONYMS = {
     "frozen": ["congelado", "congelada", "freezer friendly", "freezerfriendly", "freezertesting"],
 }
 
-# Marcadores de fin de sección al parsear ingredientes
-SECTION_END_MARKERS = ["👣", "🔪", "👨‍🍳", "📝", "🍽️", "⏰", "💡", "pasos", "Pasos"]
+# Marcadores de fin de sección al parsear ingredientes (la línea empieza con
+# alguno). "👨‍🍳" y "💡" no cierran la sección: se usan dentro de ella para
+# "Rinde: ..." y tips antes de la lista. "Pasos" se detecta por palabra clave.
+SECTION_END_MARKERS = ["👣", "🔪", "📝", "🍽️", "⏰", "👨‍👦", "🧒"]
 
 # Post pineados
 PINNED_MEDIAIDS = [3283787029367823611, 3280944293224657232]
@@ -458,3 +498,17 @@ BING_BULK_SIZE = 10
 TAG_SCORE = 3
 EASY_SCORE = 2
 INGREDIENT_SCORE = 1
+
+# Recetas relacionadas aproximadas (backend "minhash", catálogos muy grandes).
+# Umbral de Jaccard aprox. (1 / BANDS) ** (1 / (NUM_PERM / BANDS)):
+# más bandas = más recall y más candidatos a puntuar.
+# MAX_TOKEN_DF: fracción máxima del catálogo en la que puede aparecer un
+# tag/ingrediente para entrar en la firma (1.0 = todos). Bajarlo saca "sal" o
+# "huevo" de la firma: menos candidatos, pero también menos recall.
+# Ver bench_related_recipes.py para medir recall vs velocidad. En 3000
+# recetas sintéticas: 64/32 da ~64% de recall por id (~87% por score) en
+# ~0.6x el tiempo del índice; con NUM_PERM == BANDS (una fila por banda) el
+# recall sube a ~99% pero ya es más lento que el índice exacto.
+MINHASH_NUM_PERM = 64
+MINHASH_BANDS = 32
+MINHASH_MAX_TOKEN_DF = 1.0
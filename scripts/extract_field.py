@@ -3,10 +3,10 @@
 Extract Field - Extrae un campo de todas las recetas y lo guarda en un archivo txt
 """
 
-import json
 import argparse
 from pathlib import Path
 from constants import RECIPES_FILE
+from services.recipe_snapshot import iter_catalogue
 
 
 def extract_field(field_name, unique=False, unsort=False):
@@ -24,15 +24,13 @@ def extract_field(field_name, unique=False, unsort=False):
         print(f"❌ No se encontró el archivo: {recipes_path}")
         return
 
-    with recipes_path.open("r", encoding="utf-8") as f:
-        recipes = json.load(f)
-
-    print(f"📚 Total de recetas: {len(recipes)}")
     print(f"🔍 Extrayendo campo: {field_name}")
 
-    # Extraer valores
+    # Extraer valores (recorriendo las recetas de a una, sin cargar el archivo)
     values = []
-    for recipe in recipes:
+    total_recipes = 0
+    for recipe in iter_catalogue(recipes_path):
+        total_recipes += 1
         field_value = recipe.get(field_name)
 
         if field_value is None:
@@ -44,6 +42,8 @@ def extract_field(field_name, unique=False, unsort=False):
         else:
             values.append(str(field_value))
 
+    print(f"📚 Total de recetas: {total_recipes}")
+
     # Aplicar trim (strip), eliminar duplicados (unique) y ordenar (sort a-Z)
     values = [str(v).strip() for v in values if str(v).strip()]  # Trim y filtrar vacíos
     if unique:
@@ -3,13 +3,22 @@
 Fix Reel URLs - Actualiza las URLs de Instagram de /p/ a /reel/ cuando corresponde
 """
 
-import json
 import time
 import random
 import instaloader
 from pathlib import Path
-from constants import LOGIN_USERNAME, LOGIN_PASSWORD, RECIPES_FILE
+from constants import LOGIN_USERNAME, LOGIN_PASSWORD, RECIPES_FILE, RECIPES_STORAGE
+from services.file_lock import (
+    StaleWriteError,
+    file_generation,
+    file_lock,
+    replace_atomic,
+    temp_path,
+)
 from services.instagram_service import ConservativeRateController
+from services.parser_service import ParserService
+from services.recipe_snapshot import iter_catalogue
+from services.recipe_stream import write_recipes
 
 
 def ensure_session(loader):
@@ -47,93 +56,252 @@ def ensure_session(loader):
         return False
 
 
+def create_loader():
+    """Instaloader con rate limit conservador y la sesión guardada (si la hay)"""
+    loader = instaloader.Instaloader(
+        sleep=True,
+        rate_controller=lambda ctx: ConservativeRateController(ctx),
+    )
+    ensure_session(loader)
+    return loader
+
+
+def check_reel_url(loader, recipe, position, total):
+    """
+    Consulta el post de una receta y cambia su URL de /p/ a /reel/ si es un video
+
+    Args:
+        loader: Instaloader con la sesión (si la hay)
+        recipe: Receta (se modifica en el lugar)
+        position: Índice de la receta (para el progreso)
+        total: Total de recetas
+
+    Returns:
+        bool: True si se actualizó la URL
+    """
+    instagram_url = recipe.get("instagramUrl", "")
+
+    if not instagram_url:
+        return False
+
+    # Extraer el shortcode de la URL
+    if "/p/" in instagram_url:
+        shortcode = instagram_url.split("/p/")[1].rstrip("/")
+    elif "/reel/" in instagram_url:
+        print(f"  ⏭️  [{position + 1}/{total}] {recipe['name']}: Ya es reel, omitiendo")
+        return False
+    else:
+        print(f"  ⚠️  [{position + 1}/{total}] {recipe['name']}: URL no reconocida")
+        return False
+
+    print(f"  🔍 [{position + 1}/{total}] Verificando {recipe['name']} ({shortcode})...")
+
+    try:
+        # Obtener el post de Instagram
+        post = instaloader.Post.from_shortcode(loader.context, shortcode)
+
+        # Verificar si es video (reel)
+        updated = False
+        if post.is_video:
+            # Actualizar la URL de /p/ a /reel/
+            new_url = instagram_url.replace("/p/", "/reel/")
+            recipe["instagramUrl"] = new_url
+            updated = True
+            print(f"  ✅ Actualizado a /reel/: {new_url}")
+        else:
+            print("  ℹ️  Es un post de imagen, no se modifica")
+
+        # Pausa para evitar rate limiting
+        time.sleep(1 + (random.random() * 1))
+        return updated
+
+    except Exception as e:
+        print(f"  ❌ Error procesando {shortcode}: {e}")
+        return False
+
+
 def fix_reel_urls():
     """
     Lee recipes.json, consulta Instagram y actualiza las URLs de /p/ a /reel/
     cuando el post es un video (reel). Usa acceso anónimo; solo hace login si
     hay credenciales configuradas y Instagram lo exige (reutilizando la sesión).
+
+    Las recetas se leen y se escriben de a una (a un archivo temporal que
+    reemplaza a recipes.json solo si hubo cambios), sin cargar todo el catálogo.
+    Si otro proceso guardó recipes.json mientras tanto, las URLs corregidas se
+    aplican sobre esa versión en lugar de pisarla.
+    Con RECIPES_STORAGE=journal cada URL corregida se agrega al journal en el
+    momento (ver fix_reel_urls_journal); con "sharded" o "sqlite" se lee y se
+    guarda en ese almacenamiento (ver fix_reel_urls_store).
     """
+    if RECIPES_STORAGE == "journal":
+        fix_reel_urls_journal()
+        return
+
+    parser = ParserService(RECIPES_FILE)
+    store = parser.get_source_store()
+    if store is not parser.json_store:
+        fix_reel_urls_store(store)
+        return
 
-    # Cargar recipes.json
+    # Contar las recetas de recipes.json (recorriéndolo sin cargarlo entero)
     recipes_path = Path(__file__).parent.parent / RECIPES_FILE
     print(f"📖 Leyendo recetas de {recipes_path}")
 
     try:
-        with open(recipes_path, "r", encoding="utf-8") as f:
-            recipes = json.load(f)
+        # Versión de recipes.json sobre la que se trabaja
+        generation = file_generation(recipes_path)
+        total = sum(1 for _ in iter_catalogue(recipes_path))
     except Exception as e:
         print(f"❌ Error leyendo recipes.json: {e}")
         return
 
-    if not recipes:
+    if not total:
         print("⚠️  No hay recetas para procesar")
         return
 
-    print(f"✅ Encontradas {len(recipes)} recetas")
-
-    # Inicializar Instaloader con rate limit conservador
-    loader = instaloader.Instaloader(
-        sleep=True,
-        rate_controller=lambda ctx: ConservativeRateController(ctx),
-    )
+    print(f"✅ Encontradas {total} recetas")
 
-    ensure_session(loader)
+    loader = create_loader()
 
-    # Procesar cada receta
+    # Procesar cada receta a medida que se escribe el archivo temporal
     updated_count = 0
+    # id → URL nueva (para reaplicarlas si recipes.json cambió en el medio)
+    updated_urls = {}
 
-    for i, recipe in enumerate(recipes):
-        instagram_url = recipe.get("instagramUrl", "")
-
-        if not instagram_url:
-            continue
-
-        # Extraer el shortcode de la URL
-        if "/p/" in instagram_url:
-            shortcode = instagram_url.split("/p/")[1].rstrip("/")
-        elif "/reel/" in instagram_url:
-            print(
-                f"  ⏭️  [{i + 1}/{len(recipes)}] {recipe['name']}: Ya es reel, omitiendo"
-            )
-            continue
-        else:
-            print(f"  ⚠️  [{i + 1}/{len(recipes)}] {recipe['name']}: URL no reconocida")
-            continue
-
-        print(
-            f"  🔍 [{i + 1}/{len(recipes)}] Verificando {recipe['name']} ({shortcode})..."
-        )
-
-        try:
-            # Obtener el post de Instagram
-            post = instaloader.Post.from_shortcode(loader.context, shortcode)
-
-            # Verificar si es video (reel)
-            if post.is_video:
-                # Actualizar la URL de /p/ a /reel/
-                new_url = instagram_url.replace("/p/", "/reel/")
-                recipe["instagramUrl"] = new_url
+    def checked_recipes():
+        nonlocal updated_count
+        for i, recipe in enumerate(iter_catalogue(recipes_path)):
+            if check_reel_url(loader, recipe, i, total):
                 updated_count += 1
-                print(f"  ✅ Actualizado a /reel/: {new_url}")
-            else:
-                print("  ℹ️  Es un post de imagen, no se modifica")
-
-            # Pausa para evitar rate limiting
-            time.sleep(1 + (random.random() * 1))
+                updated_urls[recipe.get("id")] = recipe["instagramUrl"]
+            yield recipe
 
-        except Exception as e:
-            print(f"  ❌ Error procesando {shortcode}: {e}")
-            continue
+    tmp_path = temp_path(recipes_path)
+    try:
+        write_recipes(tmp_path, checked_recipes())
+    except Exception as e:
+        print(f"❌ Error guardando archivo: {e}")
+        tmp_path.unlink(missing_ok=True)
+        return
 
     # Guardar el archivo actualizado
     if updated_count > 0:
         print(f"\n💾 Guardando cambios ({updated_count} recetas actualizadas)...")
         try:
-            with open(recipes_path, "w", encoding="utf-8") as f:
-                json.dump(recipes, f, ensure_ascii=False, indent=2)
+            replace_atomic(tmp_path, recipes_path, expected=generation)
             print("✅ Archivo guardado exitosamente")
+        except StaleWriteError:
+            print("⚠️  recipes.json cambió mientras se verificaba, reaplicando las URLs...")
+            apply_url_updates(updated_urls)
         except Exception as e:
             print(f"❌ Error guardando archivo: {e}")
+    else:
+        tmp_path.unlink(missing_ok=True)
+        print("\n✨ No se encontraron URLs para actualizar")
+
+
+def apply_url_updates(updated_urls, store=None):
+    """
+    Aplica URLs corregidas (id → URL) sobre las recetas actuales, con lock
+
+    Args:
+        updated_urls: Dict id → URL nueva
+        store: RecipeStore donde aplicarlas (None = recipes.json)
+    """
+    if store is None:
+        store = ParserService(RECIPES_FILE).json_store
+    try:
+        with file_lock(store.location):
+            recipes = store.load()
+            applied = 0
+            for recipe in recipes:
+                new_url = updated_urls.get(recipe.get("id"))
+                if new_url and recipe.get("instagramUrl") != new_url:
+                    recipe["instagramUrl"] = new_url
+                    applied += 1
+            store.save(recipes)
+        print(f"✅ Archivo guardado exitosamente ({applied} URLs aplicadas)")
+    except Exception as e:
+        print(f"❌ Error guardando archivo: {e}")
+
+
+def fix_reel_urls_store(store):
+    """
+    Igual que fix_reel_urls, pero sobre los almacenamientos "sharded" y
+    "sqlite": ahí recipes.json es solo un export (compact_recipes.py lo
+    pisa), así que las recetas se leen del almacenamiento y las URLs
+    corregidas se guardan en él. save solo reescribe las recetas que
+    cambiaron, y se aplica sobre la versión actual por si otro proceso
+    guardó mientras tanto.
+
+    Args:
+        store: RecipeStore configurado (ParserService.get_source_store)
+    """
+    print(f"📖 Leyendo recetas de {store.location}")
+
+    try:
+        recipes = store.load()
+    except Exception as e:
+        print(f"❌ Error leyendo recetas: {e}")
+        return
+
+    if not recipes:
+        print("⚠️  No hay recetas para procesar")
+        return
+
+    total = len(recipes)
+    print(f"✅ Encontradas {total} recetas")
+
+    loader = create_loader()
+
+    # id → URL nueva
+    updated_urls = {}
+    for i, recipe in enumerate(recipes):
+        if check_reel_url(loader, recipe, i, total):
+            updated_urls[recipe.get("id")] = recipe["instagramUrl"]
+
+    if updated_urls:
+        print(f"\n💾 Guardando cambios ({len(updated_urls)} recetas actualizadas)...")
+        apply_url_updates(updated_urls, store)
+        print("   (compact_recipes.py las exporta a recipes.json)")
+    else:
+        print("\n✨ No se encontraron URLs para actualizar")
+
+
+def fix_reel_urls_journal():
+    """
+    Igual que fix_reel_urls, pero sobre el almacenamiento "journal": cada URL
+    corregida se registra como un patch en el journal apenas se verifica, así
+    que cortar el proceso no pierde lo ya consultado a Instagram.
+    """
+    store = ParserService(RECIPES_FILE, storage="journal").store
+    print(f"📖 Leyendo recetas de {store.base.location} + {store.location}")
+
+    try:
+        recipes = store.load()
+    except Exception as e:
+        print(f"❌ Error leyendo recetas: {e}")
+        return
+
+    if not recipes:
+        print("⚠️  No hay recetas para procesar")
+        return
+
+    total = len(recipes)
+    print(f"✅ Encontradas {total} recetas")
+
+    loader = create_loader()
+
+    updated_count = 0
+    for i, recipe in enumerate(recipes):
+        if check_reel_url(loader, recipe, i, total):
+            store.patch(recipe["id"], {"instagramUrl": recipe["instagramUrl"]})
+            updated_count += 1
+
+    if updated_count > 0:
+        print(f"\n💾 {updated_count} recetas actualizadas en {store.location}")
+        print("   (compact_recipes.py --storage journal las vuelca en recipes.json)")
     else:
         print("\n✨ No se encontraron URLs para actualizar")
 
@@ -9,49 +9,91 @@ to add additional information like tags, difficulty, times, etc.
 import argparse
 import json
 import sys
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
 from collections import Counter
+from itertools import islice
+
+from constants import CACHE_DIR, RECIPES_FILE
 
 # Import AI service
 from services.ai_service import AIService
-
-
-def generate_global_context(recipes: List[Dict[str, Any]]) -> str:
+from services.file_lock import StaleWriteError, file_generation, write_atomic
+from services.fingerprints import (
+    SOURCE_FIELDS,
+    FingerprintSnapshot,
+    load_snapshot,
+    save_snapshot,
+)
+from services.parser_service import ParserService
+from services.recipe_snapshot import iter_catalogue
+from services.recipe_stream import iter_recipes, serialize_recipes, write_recipes
+
+# Campos que usa la IA: si no cambiaron, la receta enriquecida anterior sigue valiendo
+AI_INPUT_FIELDS = SOURCE_FIELDS + ("tags", "cleaned_ingredientes")
+
+
+def collect_recipe_stats(recipes: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Generate global context from all recipes so the AI has knowledge
-    of the complete set before processing individual recipes.
+    Collect the statistics used by the global context in a single pass,
+    so recipes can be streamed from disk instead of loaded all at once.
 
     Args:
-        recipes: Complete list of recipes
+        recipes: Iterable of recipes (list or stream)
 
     Returns:
-        String with formatted context
+        Dict with total, tag_counter, cleaned_counter and sample_names
     """
-    total = len(recipes)
+    total = 0
+    tag_counter = Counter()
+    cleaned_counter = Counter()
+    sample_names = []
 
-    # Extraer todos los tags existentes
-    all_tags = []
     for r in recipes:
+        total += 1
+
+        # Contar TODOS los tags existentes
         tags = r.get("tags", [])
         if isinstance(tags, list):
-            all_tags.extend(tags)
-
-    # Contar TODOS los tags únicos y ordenar por frecuencia
-    tag_counter = Counter(all_tags)
-    all_tags_sorted = tag_counter.most_common()  # Todos los tags ordenados
+            tag_counter.update(tags)
 
-    # Extraer ingredientes limpios más comunes
-    all_cleaned = []
-    for r in recipes:
+        # Contar ingredientes limpios
         cleaned = r.get("cleaned_ingredientes", [])
         if isinstance(cleaned, list):
-            all_cleaned.extend(cleaned)
+            cleaned_counter.update(cleaned)
+
+        # Muestra de nombres de recetas
+        if len(sample_names) < 10:
+            sample_names.append(r.get("name", "Sin nombre"))
+
+    return {
+        "total": total,
+        "tag_counter": tag_counter,
+        "cleaned_counter": cleaned_counter,
+        "sample_names": sample_names,
+    }
+
+
+def generate_global_context(stats: Dict[str, Any]) -> str:
+    """
+    Generate global context from all recipes so the AI has knowledge
+    of the complete set before processing individual recipes.
 
-    cleaned_counter = Counter(all_cleaned)
-    common_ingredients = cleaned_counter.most_common(20)
+    Args:
+        stats: Statistics of the complete set (see collect_recipe_stats)
+
+    Returns:
+        String with formatted context
+    """
+    total = stats["total"]
+
+    # Todos los tags ordenados por frecuencia
+    all_tags_sorted = stats["tag_counter"].most_common()
 
-    # Muestra de nombres de recetas
-    sample_names = [r.get("name", "Sin nombre") for r in recipes[:10]]
+    # Ingredientes limpios más comunes
+    common_ingredients = stats["cleaned_counter"].most_common(20)
+
+    sample_names = stats["sample_names"]
 
     context = f"""
 CONTEXTO GLOBAL DE LA BASE DE DATOS DE RECETAS:
@@ -84,9 +126,31 @@ REGLAS PARA TAGS:
     return context
 
 
+def iter_input_recipes(file_path: str) -> Iterable[Dict[str, Any]]:
+    """
+    Stream the input recipes.
+
+    If file_path is the catalogue (RECIPES_FILE) the recipes are read through
+    the configured store (RECIPES_STORAGE): with "journal", "sharded" or
+    "sqlite" recipes.json is only an export and can lag behind.
+
+    Args:
+        file_path: Path to the JSON recipes file
+
+    Returns:
+        Iterator of recipes
+    """
+    parser = ParserService(RECIPES_FILE)
+    if Path(file_path).resolve() == parser.recipes_path.resolve():
+        return parser.get_source_store().iter_recipes()
+    return iter_catalogue(file_path)
+
+
 def load_recipes(file_path: str, limit: int = None) -> List[Dict[str, Any]]:
     """
-    Load recipes from a JSON file.
+    Load recipes from a JSON file (see iter_input_recipes).
+
+    Recipes are streamed, so with a limit only the first ones are parsed.
 
     Args:
         file_path: Path to the JSON recipes file
@@ -96,15 +160,7 @@ def load_recipes(file_path: str, limit: int = None) -> List[Dict[str, Any]]:
         List of recipes
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        recipes = data if isinstance(data, list) else [data]
-
-        if limit:
-            recipes = recipes[:limit]
-
-        return recipes
+        return list(islice(iter_input_recipes(file_path), limit or None))
     except FileNotFoundError:
         print(f"❌ Error: No se encontró el archivo {file_path}")
         sys.exit(1)
@@ -113,6 +169,41 @@ def load_recipes(file_path: str, limit: int = None) -> List[Dict[str, Any]]:
         sys.exit(1)
 
 
+def snapshot_path(input_file: str) -> Path:
+    """Path del snapshot de hashes de las recetas ya enriquecidas."""
+    cache_dir = Path(__file__).parent.parent / CACHE_DIR
+    return cache_dir / f"{Path(input_file).stem}_ia_fingerprints.json"
+
+
+def select_changed_recipes(
+    input_file: str, output_file: str
+) -> tuple[List[Dict[str, Any]], Dict[Any, Dict[str, Any]]]:
+    """
+    Recipes whose AI input fields changed since the last saved run, plus the
+    previously enriched recipes (by id) to reuse for the rest.
+
+    Args:
+        input_file: Path to the JSON recipes file
+        output_file: Path to the previous enriched output
+
+    Returns:
+        Tuple (recipes to process, previous enriched recipes by id)
+    """
+    recipes = load_recipes(input_file)
+
+    previous = {}
+    if Path(output_file).exists():
+        previous = {r["id"]: r for r in iter_recipes(output_file) if "id" in r}
+
+    snapshot = load_snapshot(snapshot_path(input_file)) or FingerprintSnapshot()
+    changed_ids = snapshot.diff(recipes).changed_ids(AI_INPUT_FIELDS)
+
+    to_process = [
+        r for r in recipes if r.get("id") in changed_ids or r.get("id") not in previous
+    ]
+    return to_process, previous
+
+
 def enrich_recipe(
     recipe: Dict[str, Any], ai_service: AIService, global_context: str = ""
 ) -> Dict[str, Any]:
@@ -214,6 +305,7 @@ def process_recipes(
     dry_run: bool = False,
     model: str = "llama3.2",
     use_context: bool = True,
+    only_changed: bool = False,
 ):
     """
     Process recipes using AI to enrich them.
@@ -225,6 +317,9 @@ def process_recipes(
         dry_run: If True, only show result without saving
         model: Ollama model to use
         use_context: If True, load global context before processing
+        only_changed: If True, only process recipes that are new or whose
+            name, description, ingredients or tags changed since the last
+            run; the rest are copied from the previous output
     """
     print("🤖 IA Main - Mejorador de Recetas")
     print("=" * 60)
@@ -253,35 +348,49 @@ def process_recipes(
         print(f"\n💡 Descarga el modelo con: ollama pull {model}")
         sys.exit(1)
 
-    # Cargar TODAS las recetas para contexto global
-    print("📚 Cargando recetas completas para contexto...")
-    all_recipes = load_recipes(input_file, limit=None)
-    print(f"✓ {len(all_recipes)} recetas cargadas\n")
-
-    # Generar contexto global si está activado
+    # Generar contexto global si está activado (recorriendo TODAS las recetas
+    # de a una, sin cargarlas en memoria)
     global_context = ""
     if use_context:
         print("🌍 Generando contexto global del sistema...")
-        global_context = generate_global_context(all_recipes)
+        try:
+            stats = collect_recipe_stats(iter_input_recipes(input_file))
+        except FileNotFoundError:
+            print(f"❌ Error: No se encontró el archivo {input_file}")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"❌ Error al parsear JSON: {e}")
+            sys.exit(1)
+        global_context = generate_global_context(stats)
         print("✓ Contexto global generado")
-        print(f"   • {len(all_recipes)} recetas en contexto")
-
-        # Contar tags únicos
-        all_tags = []
-        for r in all_recipes:
-            tags = r.get("tags", [])
-            if isinstance(tags, list):
-                all_tags.extend(tags)
-        unique_tags = len(set(all_tags))
-        print(f"   • {unique_tags} tags únicos identificados")
+        print(f"   • {stats['total']} recetas en contexto")
+        print(f"   • {len(stats['tag_counter'])} tags únicos identificados")
         print(f"   • {len(global_context)} caracteres de contexto\n")
 
-    # Seleccionar recetas a procesar
-    recipes_to_process = all_recipes[:num_recipes] if num_recipes else all_recipes
+    # Versión del archivo de salida antes de procesar: al guardar no se pisa
+    # si otra etapa lo cambió mientras tanto
+    output_generation = file_generation(output_file)
+
+    # Cargar solo las recetas a procesar
+    print("📚 Cargando recetas a procesar...")
+    previous_enriched = {}
+    if only_changed:
+        recipes_to_process, previous_enriched = select_changed_recipes(
+            input_file, output_file
+        )
+        pending_ids = {r.get("id") for r in recipes_to_process}
+        recipes_to_process = recipes_to_process[:num_recipes]
+        print(f"✓ {len(recipes_to_process)} recetas nuevas o con cambios\n")
+    else:
+        recipes_to_process = load_recipes(input_file, limit=num_recipes)
+        print(f"✓ {len(recipes_to_process)} recetas cargadas\n")
+
     print(f"🔄 Procesando {len(recipes_to_process)} recetas...\n")
 
     # Procesar cada receta
     enriched_recipes = []
+    # Ids que la IA enriqueció (enrich_recipe devuelve la misma receta si falla)
+    enriched_ids = set()
 
     for idx, recipe in enumerate(recipes_to_process, 1):
         name = recipe.get("name", "Sin nombre")[:50]
@@ -290,6 +399,8 @@ def process_recipes(
         try:
             enriched_recipe = enrich_recipe(recipe, ai_service, global_context)
             enriched_recipes.append(enriched_recipe)
+            if enriched_recipe is not recipe:
+                enriched_ids.add(recipe.get("id"))
             print("  ✓ Procesada exitosamente")
 
         except Exception as e:
@@ -305,9 +416,40 @@ def process_recipes(
         print("\n💡 Este es un dry-run. No se guardaron cambios.")
         print("   Para guardar, ejecuta sin --dry-run")
     else:
-        # Guardar resultado
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(enriched_recipes, f, indent=2, ensure_ascii=False)
+        if only_changed:
+            # Catálogo completo: lo recién procesado + lo enriquecido antes
+            enriched_by_id = {
+                r.get("id"): r for r in enriched_recipes if r.get("id") in enriched_ids
+            }
+            source_recipes = load_recipes(input_file)
+            enriched_recipes = [
+                enriched_by_id.get(r.get("id"))
+                or previous_enriched.get(r.get("id"), r)
+                for r in source_recipes
+            ]
+            # Las que fallaron o no entraron en --recipes quedan fuera del
+            # snapshot y se procesan en la próxima corrida
+            pending_ids -= enriched_ids
+            processed_snapshot = FingerprintSnapshot.from_recipes(
+                r for r in source_recipes if r.get("id") not in pending_ids
+            )
+
+        # Guardar resultado (con lock, temporal + replace)
+        try:
+            write_atomic(
+                output_file,
+                serialize_recipes(enriched_recipes),
+                expected=output_generation,
+            )
+        except StaleWriteError as e:
+            conflict_file = Path(output_file).with_suffix(".conflicto.json")
+            write_recipes(conflict_file, enriched_recipes)
+            print(f"\n❌ {e}")
+            print(f"💾 Resultado guardado aparte en: {conflict_file}")
+            sys.exit(1)
+
+        if only_changed:
+            save_snapshot(processed_snapshot, snapshot_path(input_file))
 
         print("\n✅ Proceso completado!")
         print(f"📁 {len(enriched_recipes)} recetas guardadas en: {output_file}")
@@ -335,6 +477,9 @@ Ejemplos de uso:
   
   # Usar modelo específico
   python ia_main.py --recipes 5 --model llama3
+
+  # Procesar solo recetas nuevas o modificadas desde la última corrida
+  python ia_main.py --only-changed
         """,
     )
 
@@ -378,6 +523,13 @@ Ejemplos de uso:
         help="Desactiva la carga de contexto global (más rápido pero menos consistente)",
     )
 
+    parser.add_argument(
+        "--only-changed",
+        action="store_true",
+        help="Procesa solo recetas nuevas o con cambios desde la última corrida "
+        "(el resto se copia del archivo de salida anterior)",
+    )
+
     args = parser.parse_args()
 
     # Ejecutar procesamiento
@@ -388,6 +540,7 @@ Ejemplos de uso:
         dry_run=args.dry_run,
         model=args.model,
         use_context=not args.no_context,
+        only_changed=args.only_changed,
     )
 
 
@@ -5,8 +5,15 @@ Procesa recetas existentes para normalizar tags, aplicar sinónimos, etc.
 """
 
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
 from constants import RECIPES_FILE
 from services.parser_service import ParserService
+from services.related import DEFAULT_ENGINE, ENGINES
+from services.slug_registry import SlugRegistry
+from services.tag_synonyms import SYNONYM_CONFLICTS
 
 
 def print_statistics(recipes, title="📊 Estadísticas"):
@@ -62,6 +69,67 @@ def print_statistics(recipes, title="📊 Estadísticas"):
         print(f"📅 Fecha más reciente: {newest.strftime('%Y-%m-%d')}")
 
 
+# ParserService de cada proceso del pool (--jobs)
+_worker_parser = None
+
+
+def _init_worker():
+    """Inicializa el ParserService de un proceso del pool"""
+    global _worker_parser
+    _worker_parser = ParserService(RECIPES_FILE)
+
+
+def _refresh_chunk(chunk, force):
+    """
+    Corre refresh_recipe_fields sobre un bloque de recetas en un proceso del pool
+
+    Returns:
+        tuple: (lista de (receta actualizada, cambió), líneas de ingredientes
+            limpiadas en este bloque, hits, misses)
+    """
+    cleaner = _worker_parser.ingredient_cleaner
+    hits, misses, known = cleaner.hits, cleaner.misses, len(cleaner.cache)
+
+    results = [_worker_parser.refresh_recipe_fields(r, force=force) for r in chunk]
+
+    # Las entradas nuevas quedan al final del dict (orden de inserción)
+    new_entries = dict(islice(cleaner.cache.items(), known, None))
+    return results, new_entries, cleaner.hits - hits, cleaner.misses - misses
+
+
+def refresh_fields(parser, recipes, force=False, jobs=1):
+    """
+    Aplica refresh_recipe_fields a todas las recetas, en serie o repartidas
+    en bloques entre `jobs` procesos. El resultado es el mismo y en el mismo
+    orden en ambos casos.
+
+    Args:
+        parser: ParserService (su cache de ingredientes recibe lo limpiado
+            en los procesos del pool)
+        recipes: Lista de recetas
+        force: Forzar la actualización de todos los campos
+        jobs: Cantidad de procesos (1 = en serie)
+
+    Returns:
+        list: (receta actualizada, cambió) por receta, en orden
+    """
+    if jobs <= 1 or len(recipes) < 2:
+        return [parser.refresh_recipe_fields(r, force=force) for r in recipes]
+
+    # Varios bloques por proceso para repartir mejor la carga
+    chunk_size = max(1, -(-len(recipes) // (jobs * 4)))
+    chunks = [recipes[i : i + chunk_size] for i in range(0, len(recipes), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        for chunk_results, entries, hits, misses in executor.map(
+            _refresh_chunk, chunks, repeat(force)
+        ):
+            results.extend(chunk_results)
+            parser.ingredient_cleaner.merge(entries, hits, misses)
+    return results
+
+
 def main():
     """Función principal que ejecuta la actualización local"""
     # Parsear argumentos de línea de comandos
@@ -73,7 +141,32 @@ def main():
         action="store_true",
         help="Forzar la actualización de todos los campos, incluso los que ya existen",
     )
+    parser_args.add_argument(
+        "--related-backend",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="Motor para calcular recetas relacionadas: 'index' (índice "
+        "invertido, default) o 'numpy' (vectorizado, requiere numpy) dan el "
+        "mismo resultado; 'minhash' es aproximado (MinHash/LSH) para "
+        "catálogos muy grandes.",
+    )
+    parser_args.add_argument(
+        "--incremental-related",
+        action="store_true",
+        help="Recalcula related_recipes solo para recetas nuevas o cambiadas "
+        "(tags, cleaned_ingredientes, easy) y parchea las listas afectadas, "
+        "en lugar de recalcular todo el catálogo.",
+    )
+    parser_args.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Procesos para el refresh por receta (tags, ingredientes, "
+        "shortcode); los slugs se asignan después en serie. 0 = todos los "
+        "cores (default: 1, en serie)",
+    )
     args = parser_args.parse_args()
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
 
     print("🔄 Local Update - Actualización de Recetas")
     print("=" * 50)
@@ -83,8 +176,8 @@ def main():
     # Inicializar parser
     parser = ParserService(RECIPES_FILE)
 
-    # Leer recetas existentes
-    recipes, _ = parser.get_existing_recipes()
+    # Leer recetas existentes (como Recipe: slots y copy-on-write)
+    recipes, _ = parser.get_existing_recipes(as_models=True)
 
     if not recipes:
         print("❌ No se encontraron recetas para actualizar")
@@ -93,19 +186,33 @@ def main():
     # Mostrar estadísticas iniciales
     print_statistics(recipes, "📊 Estadísticas ANTES del refresh")
 
+    # Avisar sinónimos asignados a más de un tag en TAG_SYNONYMS (gana el primero)
+    if SYNONYM_CONFLICTS:
+        print(f"\n⚠️  {len(SYNONYM_CONFLICTS)} sinónimos en conflicto en TAG_SYNONYMS:")
+        for synonym, kept, dropped in SYNONYM_CONFLICTS:
+            print(f"   • {synonym}: {kept} (se ignora {dropped})")
+
     # Aplicar refresh a todas las recetas
     print(f"\n🔄 Aplicando refresh a {len(recipes)} recetas...")
     updated_recipes = []
     changes_count = 0
 
-    for i, recipe in enumerate(recipes, 1):
-        # Pasar recetas originales + las ya actualizadas para que tenga contexto completo
-        all_recipes_context = recipes + updated_recipes
+    if jobs > 1:
+        print(f"⚙️  Usando {jobs} procesos")
+    refreshed = refresh_fields(parser, recipes, force=args.force, jobs=jobs)
 
-        updated_recipe, changed = parser.refresh_recipe(
-            recipe, force=args.force, existing_recipes=all_recipes_context
+    # Slugs de las recetas originales + las ya actualizadas (contexto completo),
+    # asignados en serie y en orden para que el resultado sea determinístico
+    slug_registry = SlugRegistry.from_recipes(recipes)
+
+    for i, (recipe, (updated_recipe, changed)) in enumerate(zip(recipes, refreshed), 1):
+        updated_recipe, slug_changed = parser.refresh_recipe_slug(
+            recipe, updated_recipe, force=args.force, slug_registry=slug_registry
         )
+        if slug_changed:
+            changed = True
         updated_recipes.append(updated_recipe)
+        slug_registry.add(updated_recipe.get("slug"))
 
         if changed:
             changes_count += 1
@@ -128,21 +235,39 @@ def main():
 
     # Calcular recetas relacionadas
     print("\n🔗 Calculando recetas relacionadas...")
-    updated_recipes = parser.compute_related_recipes(updated_recipes)
+    if args.incremental_related:
+        updated_recipes = parser.update_related_recipes(updated_recipes, recipes)
+    else:
+        updated_recipes = parser.compute_related_recipes(
+            updated_recipes, backend=args.related_backend
+        )
     changes_count += 1
     print(f"✓ {len(updated_recipes)} recetas procesadas con related_recipes")
 
     # Mostrar estadísticas finales
     print_statistics(updated_recipes, "\n📊 Estadísticas DESPUÉS del refresh")
 
+    # Qué cambió respecto de lo que dejó la corrida anterior
+    changes = parser.changes_since("local_update", updated_recipes)
+    print(f"\n🧬 Cambios desde la corrida anterior: {changes.summary()}")
+
     # Guardar recetas actualizadas
     if changes_count > 0:
         print(f"\n💾 Guardando {changes_count} recetas modificadas...")
         parser.save_recipes(updated_recipes)
+        parser.save_snapshot("local_update", updated_recipes)
         print("✅ Actualización completada con éxito")
     else:
         print("\n✅ No hubo cambios, todas las recetas están actualizadas")
 
+    # Persistir la cache de limpieza de ingredientes para la próxima corrida
+    cleaner = parser.ingredient_cleaner
+    cleaner.save_cache()
+    print(
+        f"🧠 Cache de ingredientes: {cleaner.hits} hits / {cleaner.misses} misses "
+        f"({cleaner.hit_rate:.1%} hit rate)"
+    )
+
 
 if __name__ == "__main__":
     main()
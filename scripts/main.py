@@ -12,8 +12,11 @@ from constants import (
     LOGIN_PASSWORD,
     RECIPES_FILE,
 )
+from services.ingest_pipeline import ingest_posts
 from services.instagram_service import InstagramService
 from services.parser_service import ParserService
+from services.related import DEFAULT_ENGINE, ENGINES
+from services.slug_registry import SlugRegistry
 
 
 def main():
@@ -28,6 +31,28 @@ def main():
         "INSTAGRAM_LOGIN_USERNAME, o hace login fresco si no hay sesión previa. "
         "Útil cuando Instagram rechaza el acceso anónimo (429).",
     )
+    parser_args.add_argument(
+        "--related-backend",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="Motor para calcular recetas relacionadas: 'index' (índice "
+        "invertido, default) o 'numpy' (vectorizado, requiere numpy) dan el "
+        "mismo resultado; 'minhash' es aproximado (MinHash/LSH) para "
+        "catálogos muy grandes.",
+    )
+    parser_args.add_argument(
+        "--incremental-related",
+        action="store_true",
+        help="Recalcula related_recipes solo para recetas nuevas o cambiadas "
+        "(tags, cleaned_ingredientes, easy) y parchea las listas afectadas, "
+        "en lugar de recalcular todo el catálogo.",
+    )
+    parser_args.add_argument(
+        "--record",
+        action="store_true",
+        help="Graba los posts crudos que se revisan en INSTAGRAM_ARCHIVE, para "
+        "reprocesarlos después sin red con INSTAGRAM_ADAPTER=replay.",
+    )
     args = parser_args.parse_args()
 
     print("🍳 Instagram to Recipes.json Updater")
@@ -45,62 +70,72 @@ def main():
         login_username=LOGIN_USERNAME,
         login_password=LOGIN_PASSWORD,
         force_login=args.force_login,
+        record=args.record,
     )
     parser = ParserService(RECIPES_FILE)
 
-    # Obtener recetas existentes
-    existing_recipes, max_date = parser.get_existing_recipes()
-    existing_ids = {r["id"] for r in existing_recipes if "id" in r}
+    # Fecha más reciente e ids conocidos desde el índice (sin parsear el catálogo)
+    recipe_index = parser.get_recipe_index()
+    max_date = recipe_index.max_date
+    existing_ids = recipe_index.ids
 
-    print(f"📚 Recetas existentes: {len(existing_recipes)}")
+    print(f"📚 Recetas existentes: {recipe_index.count}")
     if max_date:
         print(f"📅 Fecha más reciente: {max_date.strftime('%Y-%m-%d %H:%M:%S')}")
 
-    # Obtener posts de Instagram
-    posts = instagram.get_posts(max_date)
+    # Obtener posts de Instagram y convertir los nuevos a medida que llegan,
+    # descargando las imágenes en paralelo. Los que ya existen (por ID o
+    # shortcode) no se devuelven, y varios seguidos cortan la búsqueda
+    new_recipes, _ = ingest_posts(
+        instagram.iter_posts(
+            max_date,
+            known_ids=existing_ids,
+            known_shortcodes=recipe_index.shortcodes,
+        ),
+        parser,
+        instagram.download_images,
+        skip_ids=existing_ids,
+    )
 
-    if not posts:
+    if not instagram.reviewed_count:
         print("\n⚠️  No se encontraron posts. Verifica:")
         print("   1. El usuario de Instagram es correcto")
         print("   2. La cuenta es pública (sin login) o configurá login en .env si es privada")
         print("   3. El perfil tiene posts recientes")
         return
 
-    # Procesar posts nuevos
-    new_recipes = []
-
-    for post in posts:
-        # Skip si ya existe (por ID)
-        if post.mediaid in existing_ids:
-            continue
-
-        # Descargar imagen localmente
-        local_image = instagram.download_image(post.url, post.shortcode)
-
-        # Convertir post a receta
-        recipe = parser.post_to_recipe(post, local_image)
-
-        new_recipes.append(recipe)
-        print(f"✨ Nueva: {recipe['name']} - {len(recipe['tags'])} tags")
+    # El catálogo completo solo hace falta para fusionar, relacionar y guardar
+    existing_recipes, _ = parser.get_existing_recipes(as_models=True)
 
     # Generar slugs únicos para las nuevas recetas
     if new_recipes:
-        # Combinar recetas existentes + nuevas para generar slugs únicos
-        all_recipes_for_slug = existing_recipes + new_recipes
+        # Slugs de las recetas existentes + nuevas para generar slugs únicos
+        slug_registry = SlugRegistry.from_recipes(existing_recipes + new_recipes)
 
         for i, recipe in enumerate(new_recipes):
-            recipe["slug"] = parser.generate_unique_slug(
-                recipe["name"], all_recipes_for_slug
-            )
-            # Actualizar el slug en la lista combinada para evitar colisiones entre recetas nuevas
-            all_recipes_for_slug[len(existing_recipes) + i] = recipe
-
-    # Combinar todas las recetas (existentes + nuevas)
-    all_recipes = existing_recipes + new_recipes
+            old_slug = recipe.get("slug")
+            slug = parser.generate_unique_slug(recipe["name"], slug_registry)
+            new_recipes[i] = recipe.with_changes({"slug": slug})
+            # Registrar el slug nuevo para evitar colisiones entre recetas nuevas
+            slug_registry.remove(old_slug)
+            slug_registry.add(slug)
+
+    # Combinar todas las recetas (existentes + nuevas) en el orden en que se
+    # guardan, así las related_recipes (desempate por posición) coinciden
+    # con las que calcula local_update.py sobre el archivo
+    all_recipes = parser.sort_recipes(existing_recipes + new_recipes)
 
     # Calcular recetas relacionadas
     print("\n🔗 Calculando recetas relacionadas...")
-    all_recipes = parser.compute_related_recipes(all_recipes)
+    if args.incremental_related:
+        all_recipes = parser.update_related_recipes(all_recipes, existing_recipes)
+    else:
+        all_recipes = parser.compute_related_recipes(
+            all_recipes, backend=args.related_backend
+        )
+
+    # Persistir la cache de limpieza de ingredientes para la próxima corrida
+    parser.ingredient_cleaner.save_cache()
 
     # Guardar archivo actualizado
     if new_recipes:
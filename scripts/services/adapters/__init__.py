@@ -9,6 +9,8 @@ from .apify import ApifyAdapter
 from .base import AdapterBase, AdapterConfig
 from .dto import InstagramPost
 from .instaloader import InstaloaderAdapter
+from .pacing import NoPacing, PacingPolicy, TokenBucketPacing, VirtualClock
+from .replay import ReplayAdapter
 
 __all__ = [
     "AdapterBase",
@@ -16,4 +18,9 @@ __all__ = [
     "InstagramPost",
     "InstaloaderAdapter",
     "ApifyAdapter",
+    "ReplayAdapter",
+    "PacingPolicy",
+    "NoPacing",
+    "TokenBucketPacing",
+    "VirtualClock",
 ]
\ No newline at end of file
@@ -14,11 +14,14 @@ from apify_client import ApifyClient
 
 from .base import AdapterBase, AdapterConfig
 from .dto import InstagramPost
+from .pacing import NoPacing, PacingPolicy
 
 
 class ApifyAdapter(AdapterBase):
     """Adapter que trae posts de Instagram usando el actor de Apify."""
 
+    SOURCE = "apify"
+
     # Actor de Apify usado y límite de posts por corrida (desde .env)
     ACTOR_ID = "apify/instagram-scraper"
     RESULTS_LIMIT = constants.APIFY_RESULTS_LIMIT
@@ -31,11 +34,16 @@ class ApifyAdapter(AdapterBase):
         "Carousel": "GraphSidecar",
     }
 
-    def __init__(self, config: AdapterConfig):
-        super().__init__(config)
+    def __init__(self, config: AdapterConfig, pacing: PacingPolicy | None = None):
+        super().__init__(config, pacing)
         self._token = constants.APIFY_TOKEN
         self.client = ApifyClient(self._token)
 
+    def default_pacing(self) -> PacingPolicy:
+        """Sin esperas: el actor ya corrió y el dataset está completo en
+        memoria, no se hacen requests a Instagram entre post y post."""
+        return NoPacing()
+
     def login(self) -> bool:
         """Apify no tiene login interactivo: la autenticación es el token.
 
@@ -52,8 +60,8 @@ class ApifyAdapter(AdapterBase):
     def _iter_raw_posts(self):
         """Ejecuta el actor de Apify y devuelve el iterator crudo del dataset.
 
-        El delay entre posts lo maneja el jitter del template method
-        (AdapterBase.get_posts), igual que con instaloader.
+        Recorrerlo no hace requests a Instagram, por eso no hay ritmo entre
+        posts (default_pacing).
         """
         if not self._token:
             raise RuntimeError("APIFY_TOKEN no configurado en .env")
@@ -87,7 +95,8 @@ class ApifyAdapter(AdapterBase):
             )
         )
 
-    def _to_post(self, raw_item) -> InstagramPost:
+    @classmethod
+    def _to_post(cls, raw_item) -> InstagramPost:
         """Convierte un item crudo del dataset de Apify a InstagramPost.
 
         Valida los campos requeridos: si alguno viene vacío o con un tipo no
@@ -108,7 +117,7 @@ class ApifyAdapter(AdapterBase):
             )
 
         post_type = raw_item.get("type")
-        typename = self._TYPE_MAP.get(post_type)
+        typename = cls._TYPE_MAP.get(post_type)
         if typename is None:
             raise ValueError(f"Tipo de post de Apify no soportado: {post_type!r}")
 
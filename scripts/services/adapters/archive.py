@@ -0,0 +1,84 @@
+"""
+Archivo de respuestas crudas de los adapters de Instagram.
+
+Con la grabación activada (--record en main.py) cada post que revisa
+get_posts se agrega a un JSONL comprimido con gzip: el item crudo de la
+fuente (el item del dataset de Apify, el JSON de instaloader del Post) más
+su id y fecha. ReplayAdapter lo vuelve a recorrer sin red, para reprocesar
+el historial después de tocar ParserService.
+
+Cada corrida agrega un miembro gzip nuevo al final del archivo (gzip lee
+los miembros concatenados como uno solo). Si una corrida se corta, el
+último miembro queda incompleto: al leer se usa todo lo anterior y se
+avisa.
+"""
+
+import gzip
+import json
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def record_time(record):
+    """
+    Fecha de un registro como datetime aware en UTC
+
+    Instaloader da fechas locales naive y Apify fechas aware: sin pasarlas a
+    una misma forma no se pueden comparar (los archivos viejos tienen de las
+    dos). Las naive se toman como hora local, igual que date_local.
+    """
+    return datetime.fromisoformat(record["timestamp"]).astimezone(timezone.utc)
+
+
+class RawArchive:
+    """JSONL comprimido de posts crudos, una línea por post."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Path del archivo (.jsonl.gz); se crea al primer append
+        """
+        self.path = Path(path)
+        self._file = None
+
+    def append(self, source, post, item):
+        """
+        Agrega un post crudo al archivo
+
+        Args:
+            source: Nombre de la fuente ("apify", "instaloader")
+            post: InstagramPost ya normalizado (de ahí salen id y fecha)
+            item: Item crudo, serializable a JSON
+        """
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        record = {
+            "source": source,
+            "id": post.mediaid,
+            # En UTC: todas las fuentes quedan comparables (ver record_time)
+            "timestamp": post.date_local.astimezone(timezone.utc).isoformat(),
+            "item": item,
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        """Cierra el miembro gzip de esta corrida."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self):
+        """Itera los registros en el orden en que se grabaron."""
+        if not self.path.exists():
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        print("⚠️  Archivo de posts: línea incompleta, se ignora")
+            except (EOFError, gzip.BadGzipFile, zlib.error):
+                print(f"⚠️  {self.path.name} termina en una grabación cortada, se usa lo anterior")
@@ -7,27 +7,48 @@ interfaz, de forma que InstagramService es transparente a la fuente usada.
 
 get_posts es un template method: el filtrado común (tipos soportados,
 posts pinned, PINNED_MEDIAIDS, max_date) vive acá y lo único que cambia
-por adapter es cómo se obtiene el iterator crudo (_iter_raw_posts) y cómo
-se normaliza cada post (_to_post).
+por adapter es cómo se obtiene el iterator crudo (_iter_raw_posts), cómo
+se normaliza cada post (_to_post) y el ritmo entre posts (default_pacing,
+ver pacing.py). Con config.record cada post crudo se graba además en el
+archivo que reproduce ReplayAdapter (_dump_raw / _load_raw, ver archive.py).
+
+Las imágenes se descargan con una requests.Session compartida (pool de
+conexiones del tamaño de IMAGE_DOWNLOAD_WORKERS): download_images baja las
+de varios posts en paralelo, a medida que llegan, escribiendo cada una en
+stream a un temporal que se renombra al terminar.
 """
 
-import random
 import sys
-import time
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator
+from typing import Collection, Iterable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # Agregar el directorio scripts al path para importar constants
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import constants
-from constants import IMAGES_DIR, PINNED_MEDIAIDS
-
+from constants import (
+    IMAGE_DOWNLOAD_TIMEOUT,
+    IMAGE_DOWNLOAD_WORKERS,
+    IMAGES_DIR,
+    INSTAGRAM_ARCHIVE,
+    KNOWN_POSTS_STOP,
+    PINNED_MEDIAIDS,
+)
+
+from ..file_lock import temp_path
+from .archive import RawArchive
 from .dto import InstagramPost
+from .pacing import PacingPolicy
+
+# Bytes por escritura al guardar una imagen
+IMAGE_CHUNK_SIZE = 1 << 16
 
 
 @dataclass
@@ -38,12 +59,16 @@ class AdapterConfig:
     login_username/login_password: Credenciales opcionales para cuentas
         privadas o cuando la fuente exige sesión.
     force_login: Si True, saltea el intento anónimo.
+    record: Si True, get_posts graba cada post crudo en archive_path.
+    archive_path: Archivo de posts crudos (None = INSTAGRAM_ARCHIVE).
     """
 
     username: str
     login_username: str | None = None
     login_password: str | None = None
     force_login: bool = False
+    record: bool = False
+    archive_path: str | None = None
 
 
 class AdapterBase(ABC):
@@ -57,14 +82,53 @@ class AdapterBase(ABC):
     SUPPORTED_TYPES = ("GraphImage", "GraphSidecar", "GraphVideo")
     # Heurística: los primeros N posts se tratan como pinned
     PINNED_DELTA = 5
+    # Nombre de la fuente en el archivo de posts crudos
+    SOURCE = ""
 
-    def __init__(self, config: AdapterConfig):
+    def __init__(self, config: AdapterConfig, pacing: PacingPolicy | None = None):
+        """
+        Args:
+            config: Parámetros de la cuenta a consultar
+            pacing: Política de ritmo entre posts (None = default_pacing();
+                se inyecta para correr en tiempo virtual)
+        """
         self.config = config
+        self.pacing = pacing if pacing is not None else self.default_pacing()
         self.logged_in = False
+        # Posts revisados (incluye los conocidos y salteados) en el último get_posts
+        self.reviewed_count = 0
         # Directorio de imágenes: común para todos los adapters
         repo_root = Path(constants.__file__).resolve().parent.parent
         self.images_path = repo_root / IMAGES_DIR
         self.images_path.mkdir(parents=True, exist_ok=True)
+        self.archive_path = repo_root / (config.archive_path or INSTAGRAM_ARCHIVE)
+        self._http = None
+        self._http_lock = threading.Lock()
+
+    @property
+    def http(self) -> requests.Session:
+        """Session HTTP compartida para las imágenes (se crea al primer uso).
+
+        Reutiliza conexiones al CDN entre descargas; el pool admite tantas
+        conexiones como descargas en paralelo. Con lock: las primeras
+        descargas en paralelo tienen que compartir una sola Session.
+        """
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    session = requests.Session()
+                    pool = HTTPAdapter(
+                        pool_connections=IMAGE_DOWNLOAD_WORKERS,
+                        pool_maxsize=IMAGE_DOWNLOAD_WORKERS,
+                    )
+                    session.mount("https://", pool)
+                    session.mount("http://", pool)
+                    self._http = session
+        return self._http
+
+    @abstractmethod
+    def default_pacing(self) -> PacingPolicy:
+        """Política de ritmo entre posts que necesita la fuente."""
 
     @abstractmethod
     def login(self) -> bool:
@@ -82,15 +146,54 @@ class AdapterBase(ABC):
     def _to_post(self, raw_post) -> InstagramPost:
         """Convierte un post crudo de la fuente a un InstagramPost normalizado."""
 
-    def get_posts(self, max_date: datetime | None = None) -> Iterator[InstagramPost]:
+    def _dump_raw(self, raw_post):
+        """Post crudo como JSON para el archivo (por defecto, tal cual)."""
+        return raw_post
+
+    @classmethod
+    def _load_raw(cls, item):
+        """Inversa de _dump_raw: post crudo listo para _to_post."""
+        return item
+
+    def _paced(self, raw_posts: Iterator) -> Iterator:
+        """Aplica el ritmo de la fuente antes de pedir cada post crudo.
+
+        Va sobre el iterator crudo y no sobre lo que devuelve get_posts: la
+        fuente hace un request por post aunque después se descarte (conocido,
+        tipo no soportado), así que todos cuentan para el ritmo. La espera va
+        antes del next() que hace el request (salvo el primero), no entre el
+        request y la entrega del post.
+        """
+        raw_posts = iter(raw_posts)
+        first = True
+        while True:
+            if not first:
+                self.pacing.pace()
+            first = False
+            try:
+                raw_post = next(raw_posts)
+            except StopIteration:
+                return
+            yield raw_post
+
+    def get_posts(
+        self,
+        max_date: datetime | None = None,
+        known_ids: Collection[int] = (),
+        known_shortcodes: Collection[str] = (),
+    ) -> Iterator[InstagramPost]:
         """Template method: itera posts con el filtrado común a todos los adapters.
 
         Args:
             max_date: Si se setea, corta en el primer post no pinned más
                 antiguo que esa fecha.
+            known_ids: mediaids que ya están en recipes.json: no se devuelven,
+                y tras KNOWN_POSTS_STOP seguidos
+                (sin contar los pinned) se deja de pedir posts.
+            known_shortcodes: Igual que known_ids, por shortcode.
 
         Returns:
-            Iterator de InstagramPost (excluye PINNED_MEDIAIDS).
+            Iterator de InstagramPost (excluye PINNED_MEDIAIDS y los conocidos).
         """
         print(f"📸 Obteniendo posts de @{self.config.username}...")
         if max_date:
@@ -99,9 +202,18 @@ class AdapterBase(ABC):
             )
 
         count = 0
+        # Posts no pinned conocidos seguidos
+        known_streak = 0
+        self.reviewed_count = 0
+        archive = RawArchive(self.archive_path) if self.config.record else None
+        if archive is not None:
+            print(f"📼 Grabando posts crudos en {self.archive_path}")
         try:
-            for i, raw_post in enumerate(self._iter_raw_posts()):
+            for i, raw_post in enumerate(self._paced(self._iter_raw_posts())):
+                self.reviewed_count = i + 1
                 post = self._to_post(raw_post)
+                if archive is not None:
+                    archive.append(self.SOURCE, post, self._dump_raw(raw_post))
                 # Incluir fotos, carruseles y reels
                 print(
                     f"  🔍 Revisando post {i + 1}: {post.shortcode} "
@@ -126,20 +238,35 @@ class AdapterBase(ABC):
                     )
                     break
 
+                if post.mediaid in known_ids or post.shortcode in known_shortcodes:
+                    # Los pinned (y PINNED_MEDIAIDS) están fuera del orden
+                    # cronológico: no cuentan para cortar ni cortan la racha
+                    if not pinned and post.mediaid not in PINNED_MEDIAIDS:
+                        known_streak += 1
+                        if KNOWN_POSTS_STOP and known_streak >= KNOWN_POSTS_STOP:
+                            print(
+                                f"⏹️  {known_streak} posts seguidos ya están en "
+                                "recipes.json, deteniendo búsqueda"
+                            )
+                            break
+                    continue
+
+                if not pinned and post.mediaid not in PINNED_MEDIAIDS:
+                    known_streak = 0
+
                 if post.mediaid not in PINNED_MEDIAIDS:
                     count += 1
                     yield post
 
-                # Pequeño jitter entre posts: los requests a Instagram son
-                # espaciados para no llamar la atención
-                time.sleep(1 + (random.random() * 2))
-
         except Exception as e:
             print(f"📦 Deteniendo búsqueda con {count} posts encontrados")
             print(f"❌ Error obteniendo posts: {e}")
             print("💡 Tip: Si es cuenta privada, configurá login en .env:")
             print("   INSTAGRAM_LOGIN_USERNAME=tu_usuario")
             print("   INSTAGRAM_LOGIN_PASSWORD=tu_password")
+        finally:
+            if archive is not None:
+                archive.close()
 
         print(f"✅ Encontrados {count} posts")
 
@@ -165,13 +292,60 @@ class AdapterBase(ABC):
                 return f"{Path(IMAGES_DIR).name}/{filename}"
 
             print(f"  ⬇️  Descargando imagen {shortcode}...")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            with self.http.get(
+                url, timeout=IMAGE_DOWNLOAD_TIMEOUT, stream=True
+            ) as response:
+                response.raise_for_status()
+
+                # En stream a un temporal: nunca queda una imagen a medias
+                tmp_path = temp_path(filepath)
+                try:
+                    with tmp_path.open("wb") as f:
+                        for chunk in response.iter_content(IMAGE_CHUNK_SIZE):
+                            f.write(chunk)
+                    tmp_path.replace(filepath)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
 
-            filepath.write_bytes(response.content)
             print(f"  ✅ Imagen guardada: {filename}")
             return f"{Path(IMAGES_DIR).name}/{filename}"
 
         except Exception as e:
             print(f"  ⚠️  Error descargando imagen: {e}")
-            return url  # Fallback a la URL original
\ No newline at end of file
+            return url  # Fallback a la URL original
+
+    def download_images(self, posts: Iterable[InstagramPost]) -> dict[str, str]:
+        """Descarga las imágenes de varios posts en paralelo.
+
+        posts se consume a medida que se libera un worker: puede ser un
+        generador que todavía se está llenando (ingest_pipeline.py), y cada
+        imagen arranca apenas llega su post.
+
+        Args:
+            posts: Posts cuyas imágenes descargar
+
+        Returns:
+            dict: shortcode → path relativo de la imagen (o URL original si
+                falló), igual que download_image
+        """
+        slots = threading.BoundedSemaphore(IMAGE_DOWNLOAD_WORKERS)
+
+        def download(url, shortcode):
+            try:
+                return self.download_image(url, shortcode)
+            finally:
+                slots.release()
+
+        futures = {}
+        with ThreadPoolExecutor(
+            max_workers=IMAGE_DOWNLOAD_WORKERS, thread_name_prefix="image"
+        ) as pool:
+            for post in posts:
+                if post.shortcode in futures:
+                    continue
+                slots.acquire()
+                futures[post.shortcode] = pool.submit(
+                    download, post.url, post.shortcode
+                )
+            return {shortcode: future.result() for shortcode, future in futures.items()}
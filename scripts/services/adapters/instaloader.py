@@ -7,8 +7,11 @@ y normaliza sus Post a InstagramPost. Es la fuente default de InstagramService.
 
 import instaloader
 
+import constants
+
 from .base import AdapterBase, AdapterConfig
 from .dto import InstagramPost
+from .pacing import PacingPolicy, TokenBucketPacing
 
 
 class ConservativeRateController(instaloader.RateController):
@@ -33,8 +36,13 @@ class ConservativeRateController(instaloader.RateController):
 class InstaloaderAdapter(AdapterBase):
     """Adapter que trae posts de Instagram usando instaloader."""
 
-    def __init__(self, config: AdapterConfig):
-        super().__init__(config)
+    SOURCE = "instaloader"
+
+    # Contexto sin sesión para reconstruir Posts grabados (_load_raw)
+    _replay_context = None
+
+    def __init__(self, config: AdapterConfig, pacing: PacingPolicy | None = None):
+        super().__init__(config, pacing)
         self.loader = instaloader.Instaloader(
             sleep=True,
             rate_controller=lambda ctx: ConservativeRateController(ctx),
@@ -42,6 +50,15 @@ class InstaloaderAdapter(AdapterBase):
         # Evita reintentar login en bucle dentro de una misma corrida
         self._login_attempted = False
 
+    def default_pacing(self) -> PacingPolicy:
+        """Token bucket conservador: los posts salen de requests a Instagram,
+        espaciados para no llamar la atención."""
+        return TokenBucketPacing(
+            interval=constants.INSTALOADER_PACING_INTERVAL,
+            burst=constants.INSTALOADER_PACING_BURST,
+            jitter=constants.INSTALOADER_PACING_JITTER,
+        )
+
     def login(self) -> bool:
         """Login seguro: reutiliza la sesión guardada si existe; solo hace
         login fresco con contraseña si no hay sesión. Nunca login fresco en
@@ -156,7 +173,20 @@ class InstaloaderAdapter(AdapterBase):
 
         return profile.get_posts()
 
-    def _to_post(self, raw_post) -> InstagramPost:
+    def _dump_raw(self, raw_post):
+        """JSON de instaloader del Post (incluye la metadata completa si
+        _to_post tuvo que pedirla, así reproducirlo no vuelve a la red)."""
+        return instaloader.get_json_structure(raw_post)
+
+    @classmethod
+    def _load_raw(cls, item):
+        """Reconstruye el instaloader.Post grabado, sin sesión ni requests."""
+        if cls._replay_context is None:
+            cls._replay_context = instaloader.Instaloader().context
+        return instaloader.load_structure(cls._replay_context, item)
+
+    @classmethod
+    def _to_post(cls, raw_post) -> InstagramPost:
         """Convierte un instaloader.Post a InstagramPost normalizado."""
         return InstagramPost(
             mediaid=raw_post.mediaid,
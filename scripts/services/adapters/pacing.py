@@ -0,0 +1,116 @@
+"""
+Políticas de ritmo (pacing) entre posts para los adapters de Instagram.
+
+Cada adapter declara la suya (default_pacing) y AdapterBase.get_posts llama
+a pace() antes de pedir cada post a la fuente, se use o no. Así el ritmo
+depende de la fuente: instaloader pega contra Instagram y necesita ir
+despacio; Apify ya trae el dataset completo y no tiene por qué esperar.
+
+El reloj y la función de espera se inyectan: con un VirtualClock los tests
+y las reproducciones corren en tiempo virtual, sin dormir de verdad.
+"""
+
+import random
+import time
+from abc import ABC, abstractmethod
+
+
+class VirtualClock:
+    """Reloj que solo avanza cuando se duerme en él (tests y replays).
+
+    Se pasa como clock=vc.now y sleep=vc.sleep a una política.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.current = start
+        # Esperas pedidas, en orden (para inspeccionarlas)
+        self.sleeps = []
+
+    def now(self) -> float:
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.current += max(seconds, 0.0)
+
+
+class PacingPolicy(ABC):
+    """Decide cuánto esperar entre un post y el siguiente."""
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            clock: Función que devuelve el tiempo actual en segundos
+            sleep: Función que espera esa cantidad de segundos
+        """
+        self.clock = clock
+        self.sleep = sleep
+
+    @abstractmethod
+    def pace(self) -> None:
+        """Espera lo que corresponda antes de pedir el próximo post."""
+
+
+class NoPacing(PacingPolicy):
+    """Sin esperas: para fuentes que ya trajeron todo (Apify)."""
+
+    def pace(self) -> None:
+        return None
+
+
+class TokenBucketPacing(PacingPolicy):
+    """Token bucket: en promedio un post cada `interval` segundos.
+
+    Se permiten hasta `burst` posts seguidos sin esperar; después cada post
+    espera a que se recargue un token. El tiempo que ya se fue en traer y
+    procesar el post cuenta como recarga. A cada espera se le suma un jitter
+    al azar de hasta `jitter` segundos para no tener un ritmo fijo.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        burst: int = 1,
+        jitter: float = 0.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+        rng=None,
+    ):
+        """
+        Args:
+            interval: Segundos por token (un post por token)
+            burst: Capacidad del bucket (arranca lleno)
+            jitter: Máximo de espera extra al azar, en segundos
+            clock: Función que devuelve el tiempo actual en segundos
+            sleep: Función que espera esa cantidad de segundos
+            rng: random.Random para el jitter (None = uno nuevo)
+        """
+        super().__init__(clock, sleep)
+        self.interval = interval
+        self.burst = burst
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.tokens = float(burst)
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        if self.interval > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed / self.interval)
+        else:
+            self.tokens = float(self.burst)
+
+    def pace(self) -> None:
+        self._refill()
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return
+
+        # Esperar hasta que el token que se usó se haya recargado
+        wait = -self.tokens * self.interval
+        if self.jitter:
+            wait += self.rng.random() * self.jitter
+        self.sleep(wait)
+        self._refill()
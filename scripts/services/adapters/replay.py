@@ -0,0 +1,89 @@
+"""
+Adapter que reproduce posts grabados, sin red.
+
+Lee el archivo de posts crudos que graban los otros adapters (main.py
+--record, ver archive.py) y los pasa por el mismo camino que una corrida
+real: cada item se reconstruye con el _load_raw de su fuente y se
+normaliza con su _to_post, y get_posts aplica el filtrado común. No hace
+requests ni espera entre posts: reprocesar el historial después de tocar
+ParserService es un trabajo local, que se puede medir y repetir.
+"""
+
+from pathlib import Path
+
+from constants import IMAGES_DIR
+
+from .apify import ApifyAdapter
+from .archive import RawArchive, record_time
+from .base import AdapterBase, AdapterConfig
+from .dto import InstagramPost
+from .instaloader import InstaloaderAdapter
+from .pacing import NoPacing, PacingPolicy
+
+# Fuentes que se pueden reproducir: nombre en el archivo → adapter
+_SOURCES = {adapter.SOURCE: adapter for adapter in (ApifyAdapter, InstaloaderAdapter)}
+
+
+class ReplayAdapter(AdapterBase):
+    """Adapter que trae los posts del archivo grabado (INSTAGRAM_ARCHIVE)."""
+
+    SOURCE = "replay"
+
+    def __init__(self, config: AdapterConfig, pacing: PacingPolicy | None = None):
+        super().__init__(config, pacing)
+        # Nunca grabar sobre el archivo que se está reproduciendo
+        self.config.record = False
+        self.archive = RawArchive(self.archive_path)
+
+    def default_pacing(self) -> PacingPolicy:
+        """Sin esperas: no hay requests."""
+        return NoPacing()
+
+    def login(self) -> bool:
+        """No hay nada contra qué autenticarse.
+
+        Returns:
+            True siempre.
+        """
+        self.logged_in = True
+        return True
+
+    def _iter_raw_posts(self):
+        """Registros del archivo, de más nuevo a más viejo.
+
+        Si un post se grabó en varias corridas queda la última versión. Se
+        ordena por fecha como lo devuelve Instagram, así max_date y el corte
+        por posts conocidos funcionan igual que en vivo.
+        """
+        if not self.archive.path.exists():
+            raise RuntimeError(f"No existe el archivo de posts grabados: {self.archive.path}")
+
+        print(f"📼 Reproduciendo posts grabados de {self.archive.path}")
+        records = {}
+        skipped = 0
+        for record in self.archive:
+            if record.get("source") not in _SOURCES:
+                skipped += 1
+                continue
+            records[(record["source"], record["id"])] = record
+        if skipped:
+            print(f"⚠️  {skipped} posts grabados de fuentes desconocidas, se ignoran")
+
+        return iter(sorted(records.values(), key=record_time, reverse=True))
+
+    def _to_post(self, record) -> InstagramPost:
+        """Normaliza un registro con el _to_post de la fuente que lo grabó."""
+        source = _SOURCES[record["source"]]
+        return source._to_post(source._load_raw(record["item"]))
+
+    def download_image(self, url: str, shortcode: str) -> str:
+        """Usa la imagen ya descargada; sin red, si no está queda la URL.
+
+        Returns:
+            str: Path relativo de la imagen guardada o la URL original
+        """
+        filename = f"{shortcode}.jpg"
+        if (self.images_path / filename).exists():
+            return f"{Path(IMAGES_DIR).name}/{filename}"
+        print(f"  ⚠️  Imagen {shortcode} no descargada (replay sin red), se usa la URL")
+        return url
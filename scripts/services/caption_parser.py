@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Caption Parser
+Recorre el caption de un post una sola vez y devuelve juntos el nombre, la
+descripción y las líneas de la sección de ingredientes. Los hashtags no:
+llegan ya extraídos por el adapter (post.caption_hashtags).
+
+Antes post_to_recipe partía el caption en líneas tres veces (nombre,
+descripción e ingredientes) y corría un regex sin compilar por línea; en un
+backfill de un perfil entero eso se repetía por cada post.
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import SECTION_END_MARKERS
+
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+
+# Título de la sección de ingredientes (comparado sin emojis ni puntuación)
+INGREDIENTS_HEADER = "ingredientes"
+# Palabras que indican que empezó otra sección
+SECTION_END_KEYWORDS = ("pasos", "tareas", "preparacion", "procedimiento")
+# Viñetas de cada ingrediente (todas de un caracter)
+INGREDIENT_BULLETS = ("•", "-", "🔸")
+
+# Los marcadores tienen distinto largo ("⏰" vs "🍽️"): se prueba cada
+# prefijo posible de la línea contra el set
+_SECTION_MARKERS = frozenset(SECTION_END_MARKERS)
+_SECTION_MARKER_LENGTHS = tuple(sorted({len(marker) for marker in _SECTION_MARKERS}))
+
+# Estados de la sección de ingredientes
+_BEFORE, _INSIDE, _DONE = range(3)
+
+
+@dataclass
+class ParsedCaption:
+    """Campos extraídos de un caption"""
+
+    name: str = "Receta"
+    description: str = ""
+    ingredients: list[str] = field(default_factory=list)
+
+
+def _starts_with_marker(line):
+    return any(line[:length] in _SECTION_MARKERS for length in _SECTION_MARKER_LENGTHS)
+
+
+def parse_caption(caption):
+    """
+    Parsea un caption en una sola pasada.
+
+    - name: primera línea sin hashtags y con espacios normalizados.
+    - description: todas las líneas sin hashtags, con espacios normalizados
+      y conservando los saltos de línea.
+    - ingredients: líneas con viñeta (•, -, 🔸) desde el título
+      "Ingredientes" (con o sin emojis alrededor) hasta la siguiente sección.
+
+    Args:
+        caption: Caption del post de Instagram (puede ser None)
+
+    Returns:
+        ParsedCaption: Campos extraídos
+    """
+    if not caption:
+        return ParsedCaption()
+
+    description_lines = []
+    ingredients = []
+    state = _BEFORE
+
+    for line in caption.split("\n"):
+        # Descripción: la línea sin hashtags
+        text = line
+        if "#" in line:
+            text = HASHTAG_PATTERN.sub("", line)
+        description_lines.append(" ".join(text.split()))
+
+        if state == _DONE:
+            continue
+
+        # Ingredientes: se compara sin emojis ni puntuación
+        line_clean = NON_WORD_PATTERN.sub("", line.lower())
+
+        if INGREDIENTS_HEADER in line_clean:
+            state = _INSIDE
+            continue
+
+        if state == _BEFORE:
+            continue
+
+        line_stripped = line.strip()
+
+        # Salir si empieza otra sección ("pasos", "tareas", 👣, 🔪, ...)
+        if any(keyword in line_clean for keyword in SECTION_END_KEYWORDS):
+            state = _DONE
+            continue
+        if _starts_with_marker(line_stripped):
+            state = _DONE
+            continue
+
+        if line_stripped.startswith(INGREDIENT_BULLETS):
+            # Remover el marcador (•, -, o 🔸)
+            ingredient = line_stripped[1:].strip()
+            if ingredient:
+                ingredients.append(ingredient)
+
+    return ParsedCaption(
+        name=description_lines[0],
+        description="\n".join(description_lines),
+        ingredients=ingredients,
+    )
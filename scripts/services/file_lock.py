@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+File Lock
+Escrituras atómicas y con lock de los archivos de recetas, para que varias
+etapas (main.py, local_update.py, fix_reel_urls.py, ia_main.py) puedan
+correr a la vez sin pisarse.
+
+- file_lock toma un lock advisory (flock) sobre un archivo .lock en la
+  cache, propio de cada archivo protegido. Es reentrante dentro del mismo
+  proceso: un store puede tomarlo en save() y volver a tomarlo en
+  write_atomic.
+- write_atomic escribe a un temporal en el mismo directorio, hace fsync y
+  lo publica con replace: quien lee ve el archivo viejo o el nuevo, nunca
+  uno a medio escribir.
+- La generación de un archivo es el hash de su contenido ("" si no existe).
+  Quien leyó el archivo guarda la generación que vio y la pasa como
+  expected al escribir: si otro proceso lo cambió en el medio, se levanta
+  StaleWriteError en lugar de pisar sus cambios. Se usa el hash y no un
+  contador para detectar también los cambios de git o de una edición a mano.
+
+Sin fcntl (Windows) el lock no hace nada; las escrituras siguen siendo
+atómicas y el chequeo de generación sigue valiendo.
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - depende del entorno
+    fcntl = None
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import CACHE_DIR
+
+from .recipe_index import data_hash, file_hash
+
+_REPO_ROOT = Path(__file__).parent.parent.parent
+
+# Locks tomados por este proceso: lock_path → [RLock, profundidad, archivo]
+_held = {}
+_held_guard = threading.Lock()
+
+
+class StaleWriteError(RuntimeError):
+    """El archivo cambió desde que se leyó: escribirlo pisaría esos cambios."""
+
+    def __init__(self, path):
+        super().__init__(
+            f"{path} cambió desde que se leyó (otro proceso lo escribió); "
+            "no se guardó para no pisar esos cambios: volvé a correr la etapa"
+        )
+        self.path = path
+
+
+def lock_path(path):
+    """Path del archivo .lock de path (en la cache, uno por archivo)"""
+    path = Path(path).resolve()
+    key = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+    return _REPO_ROOT / CACHE_DIR / "locks" / f"{path.name}.{key}.lock"
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Lock exclusivo sobre path mientras dura el bloque (espera si otro
+    proceso lo tiene)
+
+    Args:
+        path: Archivo a proteger (no hace falta que exista)
+    """
+    target = lock_path(path)
+    with _held_guard:
+        entry = _held.setdefault(target, [threading.RLock(), 0, None])
+
+    with entry[0]:
+        if entry[1] == 0:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            handle = target.open("a+b")
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            entry[2] = handle
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                handle, entry[2] = entry[2], None
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                handle.close()
+
+
+def file_generation(path):
+    """Generación del archivo: hash del contenido, o "" si no existe"""
+    path = Path(path)
+    return file_hash(path) if path.exists() else ""
+
+
+def check_generation(path, expected):
+    """
+    Levanta StaleWriteError si path ya no es el que se leyó
+
+    Args:
+        path: Archivo
+        expected: Generación vista al leerlo (None = no chequear)
+    """
+    if expected is not None and file_generation(path) != expected:
+        raise StaleWriteError(path)
+
+
+def _fsync_dir(directory):
+    """fsync del directorio, para que el rename quede en disco"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - depende del entorno
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - depende del entorno
+        pass
+    finally:
+        os.close(fd)
+
+
+def temp_path(path):
+    """
+    Crea un temporal vacío y único para escribir path (en el mismo
+    directorio, así el replace es atómico)
+    """
+    path = Path(path)
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    return Path(name)
+
+
+def replace_atomic(tmp_path, path, expected=None):
+    """
+    Publica un temporal ya escrito sobre path (fsync + replace), con lock y
+    chequeo de generación. Si el chequeo falla el temporal se borra.
+
+    Args:
+        tmp_path: Temporal (en el mismo directorio que path)
+        path: Archivo destino
+        expected: Generación de path vista al leerlo (None = no chequear)
+    """
+    path = Path(path)
+    tmp_path = Path(tmp_path)
+    with file_lock(path):
+        try:
+            check_generation(path, expected)
+            with tmp_path.open("rb") as f:
+                os.fsync(f.fileno())
+            tmp_path.replace(path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        _fsync_dir(path.parent)
+
+
+def write_atomic(path, data, expected=None):
+    """
+    Escribe bytes en path de forma atómica (temporal + fsync + replace), con
+    lock y chequeo de generación
+
+    Args:
+        path: Archivo destino
+        data: Contenido (bytes)
+        expected: Generación de path vista al leerlo (None = no chequear)
+
+    Returns:
+        str: Generación nueva de path
+    """
+    path = Path(path)
+    tmp_path = temp_path(path)
+    with file_lock(path):
+        check_generation(path, expected)
+        try:
+            with tmp_path.open("wb") as f:
+                f.write(data)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        replace_atomic(tmp_path, path)
+    return data_hash(data)
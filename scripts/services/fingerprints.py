@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Recipe Fingerprints
+Hashes estables del contenido de cada receta, para saber qué cambió desde
+una corrida anterior sin recalcular todo.
+
+Por receta se guarda un hash por campo: los que salen del caption (nombre,
+descripción, ingredientes) y los derivados (tags, cleaned_ingredientes,
+slug, related_recipes). Un snapshot es el conjunto de esos hashes en un
+momento dado; cada etapa que quiere procesar solo lo que cambió (IA,
+envío a buscadores, ...) guarda el suyo con un nombre propio en la cache y
+lo compara contra el catálogo actual con diff().
+
+Los hashes viven en la cache y no en recipes.json para no agrandar el
+archivo que descarga el frontend.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+
+# Subir si cambia la forma de calcular los hashes (invalida los snapshots)
+FINGERPRINT_VERSION = 1
+
+# Campos que salen del caption del post
+SOURCE_FIELDS = ("name", "description", "ingredients")
+# Campos calculados a partir de los anteriores
+DERIVED_FIELDS = ("tags", "cleaned_ingredientes", "slug", "related_recipes")
+TRACKED_FIELDS = SOURCE_FIELDS + DERIVED_FIELDS
+
+
+def field_hash(value):
+    """Hash corto y estable de un valor JSON (independiente del orden de claves)"""
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def recipe_fingerprint(recipe):
+    """
+    Hashes de los campos seguidos de una receta
+
+    Returns:
+        dict: Campo → hash (los campos ausentes no figuran)
+    """
+    return {
+        name: field_hash(recipe[name]) for name in TRACKED_FIELDS if name in recipe
+    }
+
+
+@dataclass
+class ChangeSet:
+    """Diferencias entre un snapshot y el catálogo actual"""
+
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    # id → campos seguidos que cambiaron
+    changed: dict = field(default_factory=dict)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def changed_ids(self, fields=TRACKED_FIELDS):
+        """
+        Ids de las recetas nuevas o con cambios en alguno de fields
+
+        Args:
+            fields: Campos a considerar (por defecto, todos los seguidos)
+
+        Returns:
+            set: Ids de recetas a reprocesar
+        """
+        fields = set(fields)
+        ids = set(self.added)
+        ids.update(rid for rid, names in self.changed.items() if names & fields)
+        return ids
+
+    def summary(self):
+        return (
+            f"{len(self.added)} nuevas, {len(self.changed)} modificadas, "
+            f"{len(self.removed)} borradas"
+        )
+
+
+@dataclass
+class FingerprintSnapshot:
+    """Hashes de todas las recetas del catálogo en un momento dado"""
+
+    fingerprints: dict = field(default_factory=dict)
+    taken_at: str = ""
+
+    @classmethod
+    def from_recipes(cls, recipes):
+        """
+        Args:
+            recipes: Iterable de recetas (las que no tienen id se ignoran)
+        """
+        return cls(
+            fingerprints={
+                recipe["id"]: recipe_fingerprint(recipe)
+                for recipe in recipes
+                if "id" in recipe
+            },
+            taken_at=datetime.now().isoformat(timespec="seconds"),
+        )
+
+    def diff(self, recipes):
+        """
+        Compara el snapshot con las recetas actuales
+
+        Args:
+            recipes: Iterable de recetas
+
+        Returns:
+            ChangeSet: Nuevas, borradas y modificadas (con sus campos)
+        """
+        changes = ChangeSet()
+        seen = set()
+        for recipe in recipes:
+            if "id" not in recipe:
+                continue
+            recipe_id = recipe["id"]
+            seen.add(recipe_id)
+
+            previous = self.fingerprints.get(recipe_id)
+            if previous is None:
+                changes.added.append(recipe_id)
+                continue
+
+            current = recipe_fingerprint(recipe)
+            changed_fields = {
+                name
+                for name in TRACKED_FIELDS
+                if current.get(name) != previous.get(name)
+            }
+            if changed_fields:
+                changes.changed[recipe_id] = changed_fields
+
+        changes.removed = [rid for rid in self.fingerprints if rid not in seen]
+        return changes
+
+    def to_dict(self):
+        return {
+            "version": FINGERPRINT_VERSION,
+            "taken_at": self.taken_at,
+            # Las claves JSON son strings: los ids van como lista de pares
+            "fingerprints": [[rid, fp] for rid, fp in self.fingerprints.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            fingerprints={rid: fp for rid, fp in data["fingerprints"]},
+            taken_at=data.get("taken_at", ""),
+        )
+
+
+def load_snapshot(path):
+    """
+    Lee un snapshot guardado
+
+    Returns:
+        FingerprintSnapshot | None: None si no existe, es ilegible o de otra versión
+    """
+    if not path.exists():
+        return None
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FINGERPRINT_VERSION:
+            return None
+        return FingerprintSnapshot.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️  Snapshot de cambios ilegible ({path.name}), se ignora: {e}")
+        return None
+
+
+def save_snapshot(snapshot, path):
+    """Guarda el snapshot (archivo temporal + replace)"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(snapshot.to_dict(), f, ensure_ascii=False)
+        tmp_path.replace(path)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar el snapshot de cambios: {e}")
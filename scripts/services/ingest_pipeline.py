@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Ingest Pipeline
+Convierte los posts nuevos de Instagram en recetas en etapas superpuestas,
+en lugar de traer todos los posts, después parsearlos y después bajar las
+imágenes:
+
+1. Fetch (un thread): recorre el generador del adapter, que respeta su
+   propio ritmo (PacingPolicy), y deja los posts en una cola acotada. Si
+   las etapas siguientes se atrasan la cola se llena y el fetch deja de
+   pedir posts: no se consulta Instagram más rápido de lo que se procesa,
+   y la memoria queda acotada por INGEST_QUEUE_SIZE.
+2. Parse (el thread que llama): post_to_recipe de cada post apenas llega.
+   Sigue en un solo thread, así el ParserService y sus caches no se
+   comparten entre threads.
+3. Imágenes (un thread): los posts parseados pasan por otra cola acotada
+   a download_images del adapter, que los descarga en paralelo
+   (IMAGE_DOWNLOAD_WORKERS, con su Session compartida) mientras se siguen
+   trayendo y parseando posts; la receta recibe su imageUrl al final, con
+   with_changes.
+
+Las recetas salen en el mismo orden que los posts.
+"""
+
+import queue
+import sys
+import threading
+from pathlib import Path
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import INGEST_QUEUE_SIZE
+
+# Marca de fin de la cola de posts
+_DONE = object()
+
+
+class _Fetcher(threading.Thread):
+    """Etapa de fetch: pasa los posts del adapter a una cola acotada."""
+
+    def __init__(self, posts, queue_size):
+        super().__init__(name="ingest-fetch", daemon=True)
+        self.posts = posts
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stopped = threading.Event()
+        self.error = None
+
+    def _put(self, item):
+        # Con timeout para poder cortar si el consumidor abandonó
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            for post in self.posts:
+                if not self._put(post):
+                    return
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                break
+            yield item
+        if self.error is not None:
+            raise self.error
+
+
+class _Downloader(threading.Thread):
+    """Etapa de imágenes: pasa los posts parseados a download_images."""
+
+    def __init__(self, download_images, queue_size):
+        super().__init__(name="ingest-images", daemon=True)
+        self.download_images = download_images
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.images = {}
+        self.error = None
+
+    def _posts(self):
+        while True:
+            post = self.queue.get()
+            if post is _DONE:
+                return
+            yield post
+
+    def run(self):
+        try:
+            self.images = self.download_images(self._posts())
+        except BaseException as e:
+            self.error = e
+
+    def put(self, post):
+        """Encola un post (espera si las descargas van atrasadas)."""
+        # Con timeout para no quedar colgado si el thread terminó con error
+        while self.is_alive():
+            try:
+                self.queue.put(post, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise self.error or RuntimeError(
+            "La descarga de imágenes terminó antes de tiempo"
+        )
+
+    def finish(self):
+        """
+        Espera las descargas pendientes
+
+        Returns:
+            dict: shortcode → imageUrl, de download_images
+        """
+        if self.is_alive():
+            self.put(_DONE)
+            self.join()
+        if self.error is not None:
+            raise self.error
+        return self.images
+
+
+def ingest_posts(
+    posts,
+    parser,
+    download_images,
+    skip_ids=(),
+    queue_size=INGEST_QUEUE_SIZE,
+):
+    """
+    Convierte posts en recetas con fetch, parseo y descarga de imágenes
+    superpuestos
+
+    Args:
+        posts: Iterable de InstagramPost (el generador del adapter)
+        parser: ParserService (post_to_recipe)
+        download_images: Función (posts) → {shortcode: imageUrl}, como
+            InstagramService.download_images; recibe un generador que se
+            va llenando a medida que se parsean los posts
+        skip_ids: mediaids ya conocidos (no se parsean ni se descargan)
+        queue_size: Posts que se pueden adelantar antes de que la etapa
+            anterior espere (en cada cola)
+
+    Returns:
+        tuple: (recetas nuevas en el orden de los posts, posts recibidos)
+    """
+    fetcher = _Fetcher(posts, queue_size)
+    downloader = _Downloader(download_images, queue_size)
+    pending = []
+    total = 0
+
+    fetcher.start()
+    downloader.start()
+    try:
+        for post in fetcher:
+            total += 1
+            if post.mediaid in skip_ids:
+                continue
+
+            # Si las descargas se atrasan, el parseo espera y con él el fetch
+            downloader.put(post)
+            recipe = parser.post_to_recipe(post, post.url)
+            pending.append((recipe, post.shortcode))
+            print(f"✨ Nueva: {recipe['name']} - {len(recipe['tags'])} tags")
+    finally:
+        fetcher.stopped.set()
+        images = downloader.finish()
+
+    new_recipes = [
+        recipe.with_changes({"imageUrl": images[shortcode]})
+        for recipe, shortcode in pending
+    ]
+    return new_recipes, total
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Ingredient Cleaner
+Limpieza de ingredientes (cantidades, unidades, tamaños, etc.) con todos los
+patrones de constants.py compilados una sola vez.
+
+El mismo IngredientCleaner se reutiliza en post_to_recipe, refresh_recipe y
+cualquier proceso batch: armar las alternancias y compilar los regex por
+cada ingrediente era el loop más caro de local_update.py --force.
+
+Las mismas líneas ("Sal y pimienta a gusto", "2 huevos") aparecen en cientos
+de recetas, así que el resultado por línea se memoiza: en memoria durante la
+corrida y en disco (CACHE_DIR) entre corridas. La cache se invalida sola si
+cambia cualquier lista de limpieza de constants.py (fingerprint).
+"""
+
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import (
+    CACHE_DIR,
+    UNIDADES_MEDIDA,
+    ARTICULOS_PREPOSICIONES,
+    TAMANOS_CUALIDADES,
+    FRACCIONES_TEXTO,
+    FRACCIONES_UNICODE,
+    PATRONES_FINAL,
+    PATRONES_INICIO,
+)
+
+# Máximo de artículos/preposiciones encadenados al inicio ("de medio", ...)
+MAX_ARTICULOS = 4
+
+
+def _alternation(words):
+    return "|".join(re.escape(w) for w in words)
+
+
+def _compile_patterns(patterns):
+    return [
+        re.compile(patron, re.IGNORECASE if flag == "IGNORECASE" else 0)
+        for patron, flag in patterns
+    ]
+
+
+class IngredientCleaner:
+    """Limpiador de ingredientes con los patrones precompilados y cache por línea"""
+
+    # Subir si cambia la lógica de limpieza (invalida las caches en disco)
+    CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        unidades=UNIDADES_MEDIDA,
+        articulos=ARTICULOS_PREPOSICIONES,
+        tamanos=TAMANOS_CUALIDADES,
+        fracciones_texto=FRACCIONES_TEXTO,
+        fracciones_unicode=FRACCIONES_UNICODE,
+        patrones_final=PATRONES_FINAL,
+        patrones_inicio=PATRONES_INICIO,
+        cache_path=None,
+    ):
+        """
+        Compila todos los patrones de limpieza. Por defecto usa las listas de
+        constants.py.
+
+        Args:
+            cache_path: Archivo de la cache persistente (None = solo en memoria)
+        """
+        config = [
+            self.CACHE_VERSION,
+            unidades,
+            articulos,
+            tamanos,
+            fracciones_texto,
+            fracciones_unicode,
+            patrones_final,
+            patrones_inicio,
+        ]
+        self.fingerprint = hashlib.sha256(
+            json.dumps(config, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+        # Línea cruda → tupla de partes limpias (no vacías)
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        self.cache_path = Path(cache_path) if cache_path else None
+        if self.cache_path:
+            self.load_cache()
+
+        tamanos_pattern = _alternation(tamanos)
+
+        # Patrones al final y al inicio (el orden importa: se aplican en secuencia)
+        self.patrones_final = _compile_patterns(patrones_final)
+        self.patrones_inicio = _compile_patterns(patrones_inicio)
+
+        self.tamanos_final = re.compile(
+            r"\s+(" + tamanos_pattern + r")$", re.IGNORECASE
+        )
+        self.fracciones_unicode = re.compile(fracciones_unicode)
+
+        # Todo lo que se remueve al inicio en una sola pasada anclada, en el
+        # mismo orden en que antes se aplicaban los re.sub:
+        # fracción en texto → cantidad → unidad → artículos (hasta
+        # MAX_ARTICULOS) → tamaño/cualidad
+        self.prefijo = re.compile(
+            r"^(?:(?:" + _alternation(fracciones_texto) + r")\s+)?"
+            r"(?:\d+[\./]?\d*\s*)?"
+            r"(?:(?:" + _alternation(unidades) + r")\b\s*)?"
+            r"(?:(?:" + _alternation(articulos) + r")\b\s+){0," + str(MAX_ARTICULOS) + "}"
+            r"(?:(?:" + tamanos_pattern + r")\s+)?",
+            re.IGNORECASE,
+        )
+
+    def split_parts(self, ingredient):
+        """
+        Separa por " o " y luego por " y " ("sal y pimienta", "tapita o cucharadita")
+        """
+        parts = []
+        for part_or in ingredient.split(" o "):
+            parts.extend(part_or.split(" y "))
+        return parts
+
+    def clean_part(self, part):
+        """
+        Limpia una parte de un ingrediente: patrones, fracciones, cantidades,
+        unidades, artículos y tamaños; luego minúsculas y singular.
+
+        Args:
+            part: Texto de una parte del ingrediente
+
+        Returns:
+            str: Ingrediente limpio (puede ser vacío)
+        """
+        cleaned_ing = part.strip()
+
+        # 1. Remover patrones al final PRIMERO (antes de otras operaciones)
+        # Esto resuelve "Alcaparras a gusto (opcional)" correctamente
+        for patron in self.patrones_final:
+            cleaned_ing = patron.sub("", cleaned_ing)
+
+        # 2. Remover patrones al inicio
+        for patron in self.patrones_inicio:
+            cleaned_ing = patron.sub("", cleaned_ing)
+
+        # 3. Remover tamaños/cualidades al final
+        cleaned_ing = self.tamanos_final.sub("", cleaned_ing)
+
+        # 4. Remover fracciones unicode (½, ¼, etc)
+        cleaned_ing = self.fracciones_unicode.sub("", cleaned_ing)
+
+        # 5-9. Remover fracciones, cantidades, unidades, artículos y tamaños al inicio
+        match = self.prefijo.match(cleaned_ing)
+        if match.end():
+            cleaned_ing = cleaned_ing[match.end():]
+
+        # 10. Limpiar espacios extras
+        cleaned_ing = " ".join(cleaned_ing.split())
+
+        # 11. Remover paréntesis sueltos (si hay desbalance, remover todos)
+        if cleaned_ing.count("(") != cleaned_ing.count(")"):
+            cleaned_ing = cleaned_ing.replace("(", "").replace(")", "")
+            cleaned_ing = cleaned_ing.strip()
+
+        # 12-13. Minúsculas y singular
+        return self.singularize(cleaned_ing.lower())
+
+    def clean_ingredient(self, ingredient):
+        """
+        Limpia una línea de ingrediente completa (memoizado)
+
+        Args:
+            ingredient: Línea cruda ("Sal y pimienta a gusto")
+
+        Returns:
+            tuple: Partes limpias no vacías, en orden ("sal", "pimienta")
+        """
+        cached = self.cache.get(ingredient)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        cleaned = tuple(
+            cleaned_ing
+            for cleaned_ing in map(self.clean_part, self.split_parts(ingredient))
+            if cleaned_ing
+        )
+        self.cache[ingredient] = cleaned
+        return cleaned
+
+    def clean(self, ingredients):
+        """
+        Limpia una lista de ingredientes
+
+        Args:
+            ingredients: Lista de ingredientes crudos
+
+        Returns:
+            list: Ingredientes limpios, únicos, singularizados y ordenados
+        """
+        cleaned_set = set()
+        for ingredient in ingredients:
+            cleaned_set.update(self.clean_ingredient(ingredient))
+        return sorted(cleaned_set)
+
+    @property
+    def hit_rate(self):
+        """Proporción de líneas resueltas desde la cache en esta corrida"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def merge(self, entries, hits=0, misses=0):
+        """
+        Incorpora líneas limpiadas en otro proceso (local_update.py --jobs)
+        para que queden en la cache persistente y en las estadísticas
+
+        Args:
+            entries: Dict línea cruda → partes limpias
+            hits: Hits de ese proceso
+            misses: Misses de ese proceso
+        """
+        for ingredient, cleaned in entries.items():
+            self.cache[ingredient] = tuple(cleaned)
+        self.hits += hits
+        self.misses += misses
+
+    def load_cache(self):
+        """
+        Carga la cache persistida si su fingerprint coincide con la
+        configuración actual (si no, se descarta)
+        """
+        if not self.cache_path or not self.cache_path.exists():
+            return
+
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Cache de ingredientes ilegible, se descarta: {e}")
+            return
+
+        if data.get("fingerprint") != self.fingerprint:
+            return
+
+        for ingredient, cleaned in data.get("entries", {}).items():
+            self.cache[ingredient] = tuple(cleaned)
+
+    def save_cache(self):
+        """
+        Persiste la cache en disco (solo si hubo líneas nuevas en esta corrida)
+        """
+        if not self.cache_path or not self.misses:
+            return
+
+        data = {"fingerprint": self.fingerprint, "entries": self.cache}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar la cache de ingredientes: {e}")
+
+    def singularize(self, word):
+        """
+        Convierte palabras del plural al singular (reglas básicas del español).
+        En frases de múltiples palabras singulariza solo la última.
+        """
+        words = word.split()
+        if len(words) > 1:
+            words[-1] = self.singularize_word(words[-1])
+            return " ".join(words)
+        return self.singularize_word(word)
+
+    @staticmethod
+    def singularize_word(word):
+        """
+        Singulariza una sola palabra
+        """
+        if len(word) < 3:
+            return word
+
+        # -ces -> -z (nueces -> nuez)
+        if word.endswith("ces"):
+            return word[:-3] + "z"
+
+        # -es después de consonante -> remover -es (limones -> limón)
+        if word.endswith("es") and len(word) > 3 and word[-3] not in "aeiouáéíóú":
+            return word[:-2]
+
+        # -s después de vocal -> remover -s (huevos -> huevo, tomates -> tomate)
+        if word.endswith("s") and word[-2] in "aeiouáéíóú":
+            return word[:-1]
+
+        return word
+
+
+@lru_cache(maxsize=None)
+def get_default_cleaner():
+    """
+    IngredientCleaner compartido, construido una sola vez desde constants.py
+    y con la cache persistente en CACHE_DIR
+    """
+    repo_root = Path(__file__).resolve().parent.parent.parent
+    return IngredientCleaner(cache_path=repo_root / CACHE_DIR / "ingredient_cleaner.json")
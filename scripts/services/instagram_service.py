@@ -30,11 +30,14 @@ from .adapters.instaloader import (
     ConservativeRateController,  # re-export para compatibilidad (fix_reel_urls.py)
     InstaloaderAdapter,
 )
+from .adapters.replay import ReplayAdapter
 
 # Mapeo nombre de adapter (desde INSTAGRAM_ADAPTER en .env) → clase concreta
 _ADAPTERS = {
     "instaloader": InstaloaderAdapter,
     "apify": ApifyAdapter,
+    # Posts grabados con main.py --record, sin red
+    "replay": ReplayAdapter,
 }
 
 
@@ -42,7 +45,7 @@ def _resolve_adapter_cls(adapter_cls=None):
     """Devuelve la clase adapter a usar.
 
     Si se pasa adapter_cls explícito, se usa ese. Si no, se resuelve desde
-    INSTAGRAM_ADAPTER del .env ("instaloader" o "apify").
+    INSTAGRAM_ADAPTER del .env ("instaloader", "apify" o "replay").
     """
     if adapter_cls is not None:
         return adapter_cls
@@ -59,7 +62,8 @@ class InstagramService:
     """Servicio para interactuar con Instagram (fachada sobre un adapter)."""
 
     def __init__(self, username, adapter_cls=None,
-                 login_username=None, login_password=None, force_login=False):
+                 login_username=None, login_password=None, force_login=False,
+                 pacing=None, record=False):
         """
         Inicializa el servicio de Instagram
 
@@ -67,8 +71,8 @@ class InstagramService:
             username: Usuario de Instagram a consultar (debe ser público para
                 funcionar sin login)
             adapter_cls: Clase adapter a usar (strategy). Si es None (default),
-                se resuelve desde INSTAGRAM_ADAPTER del .env: "instaloader"
-                o "apify".
+                se resuelve desde INSTAGRAM_ADAPTER del .env: "instaloader",
+                "apify" o "replay".
             login_username: Opcional. Solo se usa si el perfil es privado o
                 Instagram exige sesión. Si se provee, se reutiliza el session
                 file antes de hacer login fresco.
@@ -77,14 +81,20 @@ class InstagramService:
             force_login: Si True, saltea el intento anónimo y va directo a la
                 sesión guardada del usuario configurado; si no hay sesión
                 previa, hace login fresco con las credenciales.
+            pacing: Opcional. PacingPolicy entre posts; si es None se usa la
+                que declara el adapter (ninguna con Apify, token bucket con
+                instaloader).
+            record: Si True, graba cada post crudo en INSTAGRAM_ARCHIVE para
+                reprocesarlo después sin red (INSTAGRAM_ADAPTER=replay).
         """
         config = AdapterConfig(
             username=username,
             login_username=login_username,
             login_password=login_password,
             force_login=force_login,
+            record=record,
         )
-        self.adapter = _resolve_adapter_cls(adapter_cls)(config)
+        self.adapter = _resolve_adapter_cls(adapter_cls)(config, pacing=pacing)
 
     def login(self, username, password):
         """
@@ -102,17 +112,35 @@ class InstagramService:
         self.adapter.config.login_password = password
         return self.adapter.login()
 
-    def get_posts(self, max_date=None):
+    def get_posts(self, max_date=None, known_ids=(), known_shortcodes=()):
         """
-        Obtiene posts de Instagram hasta encontrar uno no pinned más antiguo que max_date
+        Obtiene posts de Instagram hasta encontrar uno no pinned más antiguo
+        que max_date, o varios seguidos ya conocidos (KNOWN_POSTS_STOP)
 
         Args:
             max_date: Fecha máxima (datetime object). Si es None, obtiene todos los posts.
+            known_ids: mediaids ya guardados (no se devuelven)
+            known_shortcodes: shortcodes ya guardados (no se devuelven)
 
         Returns:
             list: Lista de InstagramPost normalizados
         """
-        return list(self.adapter.get_posts(max_date))
+        return list(self.iter_posts(max_date, known_ids, known_shortcodes))
+
+    def iter_posts(self, max_date=None, known_ids=(), known_shortcodes=()):
+        """
+        Igual que get_posts pero de a un post por vez, a medida que el adapter
+        los trae (con su ritmo)
+
+        Returns:
+            Iterator de InstagramPost normalizados
+        """
+        return self.adapter.get_posts(max_date, known_ids, known_shortcodes)
+
+    @property
+    def reviewed_count(self):
+        """Posts revisados en la última búsqueda (incluye los ya conocidos)"""
+        return self.adapter.reviewed_count
 
     def download_image(self, url, shortcode):
         """
@@ -125,4 +153,17 @@ class InstagramService:
         Returns:
             str: Path relativo de la imagen guardada o URL original si falla
         """
-        return self.adapter.download_image(url, shortcode)
\ No newline at end of file
+        return self.adapter.download_image(url, shortcode)
+
+    def download_images(self, posts):
+        """
+        Descarga las imágenes de varios posts en paralelo (ver
+        IMAGE_DOWNLOAD_WORKERS), a medida que posts los va entregando
+
+        Args:
+            posts: Iterable de InstagramPost (lista o generador)
+
+        Returns:
+            dict: shortcode → path relativo de la imagen o URL original si falla
+        """
+        return self.adapter.download_images(posts)
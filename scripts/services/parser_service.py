@@ -5,7 +5,6 @@ Maneja el procesamiento de datos: parsing de captions, manejo de JSON, etc.
 """
 
 import re
-import json
 import unicodedata
 from pathlib import Path
 from datetime import datetime
@@ -14,34 +13,70 @@ import sys
 # Agregar el directorio padre al path para importar constants
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from constants import (
+    CACHE_DIR,
     EASY_TAG,
-    TAGS_TO_SKIP,
-    TAG_SYNONYMS,
-    UNIDADES_MEDIDA,
-    ARTICULOS_PREPOSICIONES,
-    TAMANOS_CUALIDADES,
-    FRACCIONES_TEXTO,
-    FRACCIONES_UNICODE,
-    PATRONES_FINAL,
-    PATRONES_INICIO,
-    TAG_SCORE,
-    INGREDIENT_SCORE,
-    EASY_SCORE,
+    JOURNAL_COMPACT_ENTRIES,
+    RECIPES_DB,
+    RECIPES_JOURNAL,
+    RECIPES_SHARDS_DIR,
+    RECIPES_STORAGE,
 )
 
+from .caption_parser import parse_caption
+from .fingerprints import FingerprintSnapshot, load_snapshot, save_snapshot
+from .ingredient_cleaner import get_default_cleaner
+from .recipe_index import RecipeIndex
+from .recipe_model import Recipe, as_dict, with_changes
+from .related import IncrementalRelatedUpdater, resolve_engine_cls
+from .slug_registry import SlugRegistry
+from .storage import (
+    UNCHANGED,
+    JournaledRecipeStore,
+    JsonRecipeStore,
+    ShardedRecipeStore,
+    SqliteRecipeStore,
+)
+from .tag_synonyms import TAGS_TO_SKIP_SET, resolve_tag
+
 
 class ParserService:
     """Servicio para procesar y parsear datos de recetas"""
 
-    def __init__(self, recipes_file="src/data/recipes.json"):
+    def __init__(self, recipes_file="src/data/recipes.json", storage=RECIPES_STORAGE):
         """
         Inicializa el servicio de parsing
 
         Args:
             recipes_file: Path al archivo recipes.json
+            storage: "json" (recipes.json), "sharded" (un archivo por receta
+                en RECIPES_SHARDS_DIR), "sqlite" (RECIPES_DB) o "journal"
+                (recipes.json + cambios en RECIPES_JOURNAL). Con los tres
+                últimos recipes.json se exporta con compact_recipes.py
         """
         self.recipes_file = recipes_file
-        self.recipes_path = Path(__file__).parent.parent.parent / self.recipes_file
+        repo_root = Path(__file__).parent.parent.parent
+        self.recipes_path = repo_root / self.recipes_file
+        # Índice de metadatos (fecha máxima, ids, ...) que acompaña al archivo
+        self.index_path = repo_root / CACHE_DIR / f"{self.recipes_path.stem}_index.json"
+
+        self.json_store = JsonRecipeStore(self.recipes_path, self.index_path)
+        if storage == "json":
+            self.store = self.json_store
+        elif storage == "sharded":
+            self.store = ShardedRecipeStore(repo_root / RECIPES_SHARDS_DIR)
+        elif storage == "sqlite":
+            self.store = SqliteRecipeStore(repo_root / RECIPES_DB)
+        elif storage == "journal":
+            self.store = JournaledRecipeStore(
+                self.json_store,
+                repo_root / RECIPES_JOURNAL,
+                compact_every=JOURNAL_COMPACT_ENTRIES,
+            )
+        else:
+            raise ValueError(f"Almacenamiento desconocido: {storage!r}")
+
+        # Limpiador de ingredientes compartido (patrones precompilados)
+        self.ingredient_cleaner = get_default_cleaner()
 
     def generate_slug(self, recipe_name):
         """
@@ -86,46 +121,31 @@ class ParserService:
 
         return slug
 
-    def generate_unique_slug(self, recipe_name, existing_recipes):
+    def generate_unique_slug(self, recipe_name, existing_recipes, ignore=None):
         """
         Genera un slug único verificando que no exista un duplicado en las recetas existentes.
         Si hay un duplicado, agrega un sufijo numérico (-2, -3, -4, ...) al final.
 
         Args:
             recipe_name: Nombre de la receta
-            existing_recipes: Lista de recetas existentes
+            existing_recipes: Lista de recetas existentes o SlugRegistry con
+                los slugs ocupados (conviene reutilizar uno en los loops)
+            ignore: Slug que se considera libre (el actual de la receta)
 
         Returns:
-            str: Slug único con sufijo si es necesario
+            str: Slug único con sufijo si es necesario (no queda registrado)
         """
-        # Generar el slug base
-        base_slug = self.generate_slug(recipe_name)
-
-        if not base_slug:
-            return ""
-
-        # Obtener todos los slugs existentes
-        existing_slugs = set()
-        for recipe in existing_recipes:
-            if "slug" in recipe and recipe["slug"]:
-                existing_slugs.add(recipe["slug"])
-
-        # Si el slug base no existe, devolverlo tal cual
-        if base_slug not in existing_slugs:
-            return base_slug
+        if isinstance(existing_recipes, SlugRegistry):
+            registry = existing_recipes
+        else:
+            registry = SlugRegistry.from_recipes(existing_recipes)
 
-        # Si existe un duplicado, agregar sufijos -2, -3, -4, ...
-        counter = 2
-        while True:
-            new_slug = f"{base_slug}-{counter}"
-            if new_slug not in existing_slugs:
-                return new_slug
-            counter += 1
+        return registry.unique(self.generate_slug(recipe_name), ignore=ignore)
 
     def fix_all_duplicate_slugs(self, recipes):
         """
         Busca y corrige TODOS los slugs duplicados en las recetas.
-        Regenera los slugs usando generate_unique_slug para asegurar unicidad.
+        Regenera los slugs con un SlugRegistry para asegurar unicidad.
 
         Args:
             recipes: Lista de recetas
@@ -153,7 +173,9 @@ class ParserService:
         if not duplicates:
             return recipes, []
 
-        updated = [r.copy() for r in recipes]
+        # Solo se copian las recetas cuyo slug cambia
+        updated = list(recipes)
+        registry = SlugRegistry.from_recipes(updated)
         changes = []
 
         for base_slug, indices in duplicates.items():
@@ -162,9 +184,11 @@ class ParserService:
             for idx in indices[1:]:
                 recipe_name = updated[idx].get("name", "")
                 old_slug = updated[idx].get("slug", "")
-                new_slug = self.generate_unique_slug(recipe_name, updated)
+                new_slug = self.generate_unique_slug(recipe_name, registry)
                 if new_slug != old_slug:
-                    updated[idx]["slug"] = new_slug
+                    updated[idx] = with_changes(updated[idx], {"slug": new_slug})
+                    registry.remove(old_slug)
+                    registry.add(new_slug)
                     changes.append(
                         {
                             "recipe": recipe_name,
@@ -195,18 +219,11 @@ class ParserService:
             tag_lower = tag.lower()
 
             # Omitir tags de la lista de skip
-            if tag_lower in TAGS_TO_SKIP:
+            if tag_lower in TAGS_TO_SKIP_SET:
                 continue
 
-            # Buscar si es sinónimo de algún tag
-            main_tag = next(
-                (
-                    main
-                    for main, syns in TAG_SYNONYMS.items()
-                    if tag_lower in [s.lower() for s in syns]
-                ),
-                None,
-            )
+            # Buscar si es sinónimo de algún tag (índice inverso, O(1))
+            main_tag = resolve_tag(tag_lower)
 
             if main_tag:
                 processed_tags.add(main_tag.capitalize())
@@ -232,55 +249,7 @@ class ParserService:
         Returns:
             list: Lista de ingredientes
         """
-        if not caption:
-            return []
-
-        lines = caption.split("\n")
-        ingredients = []
-        in_ingredients_section = False
-
-        for line in lines:
-            # Detectar inicio de sección de ingredientes
-            # Remover todos los emojis y espacios para comparar
-            line_clean = re.sub(r"[^\w\s]", "", line.lower()).strip()
-
-            if "ingredientes" in line_clean:
-                in_ingredients_section = True
-                continue
-
-            # Si encontramos otra sección, salir
-            if in_ingredients_section:
-                # Verificar si es inicio de nueva sección
-                line_stripped = line.strip()
-
-                # Salir si encontramos "pasos", "tareas", u otras secciones
-                if any(
-                    keyword in line_clean
-                    for keyword in ["pasos", "tareas", "preparacion", "procedimiento"]
-                ):
-                    break
-
-                # Salir si la línea empieza con emojis de sección
-                if any(
-                    line_stripped.startswith(marker)
-                    for marker in ["👣", "🔪", "📝", "🍽️", "⏰", "👨‍👦", "🧒"]
-                ):
-                    break
-
-            # Extraer ingredientes (líneas con •, -, o 🔸)
-            if in_ingredients_section:
-                line = line.strip()
-                if (
-                    line.startswith("•")
-                    or line.startswith("-")
-                    or line.startswith("🔸")
-                ):
-                    # Remover el marcador (•, -, o 🔸)
-                    ingredient = line[1:].strip()
-                    if ingredient:
-                        ingredients.append(ingredient)
-
-        return ingredients
+        return parse_caption(caption).ingredients
 
     def extract_description(self, caption):
         """
@@ -292,15 +261,7 @@ class ParserService:
         Returns:
             str: Descripción limpia
         """
-        if not caption:
-            return ""
-
-        # Remover hashtags pero preservar saltos de línea
-        desc = re.sub(r"#\w+", "", caption)
-        # Limpiar espacios múltiples en cada línea pero mantener \n
-        cleaned_lines = [" ".join(line.split()) for line in desc.split("\n")]
-
-        return "\n".join(cleaned_lines)
+        return parse_caption(caption).description
 
     def extract_recipe_name(self, caption):
         """
@@ -312,48 +273,119 @@ class ParserService:
         Returns:
             str: Nombre de la receta
         """
-        if not caption:
-            return "Receta"
-
-        # Primera línea sin hashtags ni emojis
-        first_line = caption.split("\n")[0].strip()
-        # Remover hashtags
-        name = re.sub(r"#\w+", "", first_line)
-        name = " ".join(name.split())
+        return parse_caption(caption).name
 
-        return name
+    def get_source_store(self):
+        """
+        Almacenamiento desde el que se lee: el configurado o, si todavía está
+        vacío, recipes.json (así el primer guardado lo inicializa)
+        """
+        if self.store is not self.json_store and not self.store.exists():
+            return self.json_store
+        return self.store
 
-    def get_existing_recipes(self):
+    def get_existing_recipes(self, as_models=False):
         """
         Lee el recipes.json actual y devuelve todas las recetas existentes
 
+        Args:
+            as_models: Devolver Recipe (slots, copy-on-write) en lugar de dicts
+
         Returns:
             tuple: (lista de recetas, fecha más reciente)
         """
-        if not self.recipes_path.exists():
+        store = self.get_source_store()
+        if not store.exists():
             return [], None
 
         try:
-            with self.recipes_path.open("r", encoding="utf-8") as f:
-                existing_recipes = json.load(f)
-
-            # Encontrar la fecha más reciente
-            max_date = None
-            for recipe in existing_recipes:
-                if "date" in recipe:
-                    try:
-                        date_obj = datetime.fromisoformat(recipe["date"])
-                        if max_date is None or date_obj > max_date:
-                            max_date = date_obj
-                    except ValueError:
-                        pass
-
-            return existing_recipes, max_date
+            # La fecha más reciente sale del índice (con recipes.json, ya
+            # decodificada en el snapshot binario)
+            existing_recipes, index = store.load_catalogue()
+            if as_models:
+                existing_recipes = [Recipe.from_dict(r) for r in existing_recipes]
+
+            return existing_recipes, index.max_date
 
         except Exception as e:
             print(f"⚠️  Error leyendo recetas existentes: {e}")
             return [], None
 
+    def get_recipe_index(self):
+        """
+        Devuelve el índice de metadatos del catálogo (fecha más reciente, ids,
+        shortcodes, slugs) sin cargar las recetas completas. Con recipes.json
+        sale del índice guardado en la cache (se reconstruye si quedó viejo).
+
+        Returns:
+            RecipeIndex: Índice (vacío si no hay catálogo o no se pudo leer)
+        """
+        store = self.get_source_store()
+        if not store.exists():
+            return RecipeIndex()
+
+        try:
+            return store.get_index()
+        except Exception as e:
+            print(f"⚠️  Error leyendo recetas existentes: {e}")
+            return RecipeIndex()
+
+    def get_taken_slugs(self, base_slug):
+        """
+        Slugs del catálogo que pueden chocar con base_slug (base_slug y
+        base_slug-N), sin cargar las recetas completas
+
+        Returns:
+            list: Slugs ocupados (vacía si no hay catálogo o no se pudo leer)
+        """
+        store = self.get_source_store()
+        if not store.exists():
+            return []
+
+        try:
+            return store.find_slugs(base_slug)
+        except Exception as e:
+            print(f"⚠️  Error leyendo recetas existentes: {e}")
+            return []
+
+    def snapshot_path(self, name):
+        """Path del snapshot de hashes guardado con ese nombre"""
+        cache_dir = self.index_path.parent
+        return cache_dir / f"{self.recipes_path.stem}_{name}_fingerprints.json"
+
+    def save_snapshot(self, name, recipes):
+        """
+        Guarda los hashes de contenido de las recetas como snapshot, para
+        después preguntar qué cambió con changes_since(name)
+
+        Args:
+            name: Nombre de la etapa que usa el snapshot ("ia", "search_engines", ...)
+            recipes: Recetas tal como quedaron procesadas por esa etapa
+
+        Returns:
+            FingerprintSnapshot: Snapshot guardado
+        """
+        snapshot = FingerprintSnapshot.from_recipes(recipes)
+        save_snapshot(snapshot, self.snapshot_path(name))
+        return snapshot
+
+    def changes_since(self, name, recipes=None):
+        """
+        Qué recetas cambiaron desde el último save_snapshot(name). Sin
+        snapshot previo, todas cuentan como nuevas.
+
+        Args:
+            name: Nombre del snapshot
+            recipes: Recetas actuales (None = las del catálogo guardado)
+
+        Returns:
+            ChangeSet: Recetas nuevas, borradas y modificadas (por campo)
+        """
+        if recipes is None:
+            recipes, _ = self.get_existing_recipes()
+        snapshot = load_snapshot(self.snapshot_path(name)) or FingerprintSnapshot()
+        return snapshot.diff(recipes)
+
     def post_to_recipe(self, post, local_image):
         """
         Convierte un post de Instagram en un objeto de receta
@@ -363,22 +395,23 @@ class ParserService:
             local_image: Path local de la imagen
 
         Returns:
-            dict: Objeto de receta
+            Recipe: Objeto de receta
         """
-        caption = post.caption if post.caption else ""
+        # Nombre, descripción e ingredientes en una sola pasada por el caption
+        parsed = parse_caption(post.caption)
         post_type = "reel" if post.is_video else "p"
         post_url = f"https://www.instagram.com/{post_type}/{post.shortcode}/"
         tags = self.extract_hashtags(post)
 
         recipe = {
             "id": post.mediaid,
-            "name": self.extract_recipe_name(caption),
-            "description": self.extract_description(caption),
+            "name": parsed.name,
+            "description": parsed.description,
             "tags": tags,
             "instagramUrl": post_url,
             "facebookUrl": "",
             "imageUrl": local_image,
-            "ingredients": self.extract_ingredients(caption),
+            "ingredients": parsed.ingredients,
             "date": post.date_local.isoformat(),
             "easy": EASY_TAG.capitalize() in tags,
             "hidden": False,
@@ -386,7 +419,7 @@ class ParserService:
         }
         recipe["cleaned_ingredientes"] = self.get_cleaned_ingredients(recipe)
 
-        return recipe
+        return Recipe.from_dict(recipe)
 
     def get_hidden_status(self, recipe):
         """
@@ -404,6 +437,7 @@ class ParserService:
         """
         Limpia los ingredientes removiendo cantidades, unidades, tamaños, etc.
         Toda la configuración de qué remover está en constants.py para fácil modificación.
+        Los patrones viven precompilados en IngredientCleaner (se arman una sola vez).
 
         Args:
             recipe: Receta con ingredientes
@@ -415,156 +449,7 @@ class ParserService:
         if not ingredients:
             return []
 
-        cleaned_set = set()  # Usar set para evitar duplicados
-
-        for ingredient in ingredients:
-            # Separar por " y " o " o " para casos como "sal y pimienta" o "tapita o cucharadita"
-            # Primero separar por "o", luego cada parte por "y"
-            parts_or = ingredient.split(" o ")
-            parts = []
-            for part_or in parts_or:
-                parts.extend(part_or.split(" y "))
-
-            for part in parts:
-                cleaned_ing = part.strip()
-
-                # 1. Remover patrones al final PRIMERO (antes de otras operaciones)
-                # Esto resuelve "Alcaparras a gusto (opcional)" correctamente
-                for patron, flag in PATRONES_FINAL:
-                    flags = re.IGNORECASE if flag == "IGNORECASE" else 0
-                    cleaned_ing = re.sub(patron, "", cleaned_ing, flags=flags)
-
-                # 2. Remover patrones al inicio
-                for patron, flag in PATRONES_INICIO:
-                    flags = re.IGNORECASE if flag == "IGNORECASE" else 0
-                    cleaned_ing = re.sub(patron, "", cleaned_ing, flags=flags)
-
-                # 3. Remover tamaños/cualidades al final (antes de procesar el inicio)
-                tamanos_pattern = "|".join([re.escape(t) for t in TAMANOS_CUALIDADES])
-                cleaned_ing = re.sub(
-                    r"\s+(" + tamanos_pattern + r")$",
-                    "",
-                    cleaned_ing,
-                    flags=re.IGNORECASE,
-                )
-
-                # 4. Remover fracciones unicode (½, ¼, etc)
-                cleaned_ing = re.sub(FRACCIONES_UNICODE, "", cleaned_ing)
-
-                # 5. Remover fracciones en texto al inicio
-                fracciones_pattern = "|".join([re.escape(f) for f in FRACCIONES_TEXTO])
-                cleaned_ing = re.sub(
-                    r"^(" + fracciones_pattern + r")\s+",
-                    "",
-                    cleaned_ing,
-                    flags=re.IGNORECASE,
-                )
-
-                # 6. Remover cantidades numéricas al inicio
-                cleaned_ing = re.sub(r"^\d+[\./]?\d*\s*", "", cleaned_ing)
-
-                # 7. Remover unidades de medida al inicio (incluye "jugo", "diente", etc)
-                unidades_pattern = "|".join([re.escape(u) for u in UNIDADES_MEDIDA])
-                cleaned_ing = re.sub(
-                    r"^(" + unidades_pattern + r")\b\s*",
-                    "",
-                    cleaned_ing,
-                    flags=re.IGNORECASE,
-                )
-
-                # 8. Remover artículos/preposiciones al inicio (repetir para casos como "de medio")
-                articulos_pattern = "|".join(
-                    [re.escape(a) for a in ARTICULOS_PREPOSICIONES]
-                )
-                for _ in range(4):  # Aumentar iteraciones para casos complejos
-                    before = cleaned_ing
-                    cleaned_ing = re.sub(
-                        r"^(" + articulos_pattern + r")\b\s+",
-                        "",
-                        cleaned_ing,
-                        flags=re.IGNORECASE,
-                    )
-                    if before == cleaned_ing:
-                        break
-
-                # 9. Remover tamaños/cualidades al principio (si quedaron)
-                cleaned_ing = re.sub(
-                    r"^(" + tamanos_pattern + r")\s+",
-                    "",
-                    cleaned_ing,
-                    flags=re.IGNORECASE,
-                )
-
-                # 10. Limpiar espacios extras
-                cleaned_ing = " ".join(cleaned_ing.split())
-
-                # 11. Remover paréntesis sueltos (abiertos sin cerrar o cerrados sin abrir)
-                # Contar paréntesis
-                open_count = cleaned_ing.count("(")
-                close_count = cleaned_ing.count(")")
-
-                # Si hay desbalance, remover todos los paréntesis
-                if open_count != close_count:
-                    cleaned_ing = cleaned_ing.replace("(", "").replace(")", "")
-                    cleaned_ing = cleaned_ing.strip()
-
-                # 12. Convertir a minúsculas
-                cleaned_ing = cleaned_ing.lower()
-
-                # 13. Singularizar
-                cleaned_ing = self._singularize(cleaned_ing)
-
-                # Agregar al set si no está vacío
-                if cleaned_ing:
-                    cleaned_set.add(cleaned_ing)
-
-        return sorted(list(cleaned_set))
-
-    def _singularize(self, word):
-        """
-        Convierte palabras del plural al singular (reglas básicas del español)
-
-        Args:
-            word: Palabra o frase a singularizar
-
-        Returns:
-            str: Palabra singularizada
-        """
-        # Si es una frase de múltiples palabras, singularizar la última palabra
-        words = word.split()
-        if len(words) > 1:
-            words[-1] = self._singularize_word(words[-1])
-            return " ".join(words)
-        else:
-            return self._singularize_word(word)
-
-    def _singularize_word(self, word):
-        """
-        Singulariza una sola palabra
-
-        Args:
-            word: Palabra a singularizar
-
-        Returns:
-            str: Palabra en singular
-        """
-        if len(word) < 3:
-            return word
-
-        # Reglas de singularización en español
-        # -ces -> -z (nueces -> nuez)
-        if word.endswith("ces"):
-            return word[:-3] + "z"
-
-        # -es después de consonante -> remover -es (limones -> limón)
-        if word.endswith("es") and len(word) > 3 and word[-3] not in "aeiouáéíóú":
-            return word[:-2]
-
-        # -s después de vocal -> remover -s (huevos -> huevo, tomates -> tomate)
-        if word.endswith("s") and word[-2] in "aeiouáéíóú":
-            return word[:-1]
-
-        return word
+        return self.ingredient_cleaner.clean(ingredients)
 
     def get_shortcode(self, recipe):
         """
@@ -613,17 +498,10 @@ class ParserService:
             if len(tag_clean) < 3 and tag_clean != "vs":
                 continue
 
-            if tag_clean in TAGS_TO_SKIP:
+            if tag_clean in TAGS_TO_SKIP_SET:
                 continue
 
-            main_tag = next(
-                (
-                    main
-                    for main, syns in TAG_SYNONYMS.items()
-                    if tag_clean in [s.lower() for s in syns]
-                ),
-                None,
-            )
+            main_tag = resolve_tag(tag_clean)
 
             if main_tag:
                 processed_tags.add(main_tag.capitalize())
@@ -632,15 +510,42 @@ class ParserService:
 
         return sorted(processed_tags)
 
-    def refresh_recipe(self, recipe, force=False, existing_recipes=None):
+    def refresh_recipe(
+        self, recipe, force=False, existing_recipes=None, slug_registry=None
+    ):
         """
         Actualiza los tags de una receta aplicando normalización
         También verifica y genera campos faltantes: hidden, cleaned_ingredientes, shortcode, slug
 
         Args:
-            recipe: Receta a actualizar
+            recipe: Receta a actualizar (dict o Recipe; no se modifica)
             force: Forzar la actualización de todos los campos
             existing_recipes: Lista de recetas existentes para generar slug único. Si no se proporciona, se obtiene del archivo.
+            slug_registry: SlugRegistry con los slugs ocupados (reemplaza a
+                existing_recipes; el slug resultante lo registra quien llama)
+
+        Returns:
+            tuple: (receta actualizada, bool indicando si hubo cambios)
+        """
+        updated_recipe, changed = self.refresh_recipe_fields(recipe, force=force)
+        updated_recipe, slug_changed = self.refresh_recipe_slug(
+            recipe,
+            updated_recipe,
+            force=force,
+            existing_recipes=existing_recipes,
+            slug_registry=slug_registry,
+        )
+        return updated_recipe, changed or slug_changed
+
+    def refresh_recipe_fields(self, recipe, force=False):
+        """
+        Parte de refresh_recipe que depende solo de la propia receta: tags,
+        easy, hidden, ingredientes, cleaned_ingredientes y shortcode (todo
+        menos el slug). Se puede correr en paralelo (local_update.py --jobs).
+
+        Args:
+            recipe: Receta a actualizar (dict o Recipe; no se modifica)
+            force: Forzar la actualización de todos los campos
 
         Returns:
             tuple: (receta actualizada, bool indicando si hubo cambios)
@@ -653,12 +558,8 @@ class ParserService:
             original_tags = current_tags
             normalized_tags = self.normalize_tags(original_tags)
 
-        recipe_name = recipe.get("name", "")
-
-        # Crear copia de la receta
-        updated_recipe = recipe.copy()
-        updated_recipe["old_tags"] = original_tags
-        updated_recipe["tags"] = normalized_tags
+        # Campos a actualizar (se aplican juntos al final, en este orden)
+        updates = {"old_tags": original_tags, "tags": normalized_tags}
 
         # Verificar si hubo cambios
         changed = force or set(current_tags) != set(normalized_tags)
@@ -666,12 +567,12 @@ class ParserService:
         if force or (
             EASY_TAG.capitalize() in normalized_tags and not recipe.get("easy", False)
         ):
-            updated_recipe["easy"] = True
+            updates["easy"] = True
             changed = True
 
         # Verificar y generar campo 'hidden' si no existe
         if force or "hidden" not in recipe:
-            updated_recipe["hidden"] = self.get_hidden_status(recipe)
+            updates["hidden"] = self.get_hidden_status(recipe)
             changed = True
 
         # Verificar y generar campo 'ingredients' si no existe o está vacío
@@ -682,128 +583,180 @@ class ParserService:
             if description:
                 extracted_ingredients = self.extract_ingredients(description)
                 if extracted_ingredients:
-                    updated_recipe["ingredients"] = extracted_ingredients
+                    updates["ingredients"] = extracted_ingredients
                     changed = True
 
         # Verificar y generar campo 'cleaned_ingredientes' si no existe
         if force or "cleaned_ingredientes" not in recipe:
-            updated_recipe["cleaned_ingredientes"] = self.get_cleaned_ingredients(
-                updated_recipe
+            updates["cleaned_ingredientes"] = self.get_cleaned_ingredients(
+                {"ingredients": updates.get("ingredients", ingredients)}
             )
             changed = True
 
         # Verificar y generar campo 'shortcode' si no existe
         if force or "shortcode" not in recipe:
-            updated_recipe["shortcode"] = self.get_shortcode(recipe)
+            updates["shortcode"] = self.get_shortcode(recipe)
             changed = True
 
+        return with_changes(recipe, updates), changed
+
+    def refresh_recipe_slug(
+        self,
+        recipe,
+        updated_recipe,
+        force=False,
+        existing_recipes=None,
+        slug_registry=None,
+    ):
+        """
+        Parte de refresh_recipe que genera el slug de updated_recipe. Depende
+        de los slugs ya asignados, así que se corre en serie y en orden.
+
+        Args:
+            recipe: Receta original (nombre y slug actual)
+            updated_recipe: Receta actualizada a la que se le asigna el slug
+            force: Forzar la regeneración del slug
+            existing_recipes: Lista de recetas existentes (si no hay slug_registry)
+            slug_registry: SlugRegistry con los slugs ocupados
+
+        Returns:
+            tuple: (receta con el slug, bool indicando si se generó el slug)
+        """
         # Verificar y generar campo 'slug' si no existe o forzar regeneración
-        if force or "slug" not in recipe:
-            # Obtener recetas existentes si no se proporcionaron
+        if not force and "slug" in recipe:
+            return updated_recipe, False
+
+        base_slug = self.generate_slug(recipe.get("name", ""))
+        if slug_registry is None:
             if existing_recipes is None:
-                existing_recipes, _ = self.get_existing_recipes()
-
-            # Excluir la propia receta (por slug actual) para no generar sufijos innecesarios
-            current_slug = recipe.get("slug")
-            if current_slug:
-                filtered_existing_recipes = [
-                    r for r in existing_recipes if r.get("slug") != current_slug
-                ]
+                # Solo los slugs del catálogo que pueden chocar con este (sin
+                # cargar las recetas; con SQLite, por el índice de slug)
+                slug_registry = SlugRegistry(self.get_taken_slugs(base_slug))
             else:
-                filtered_existing_recipes = existing_recipes
+                slug_registry = SlugRegistry.from_recipes(existing_recipes)
 
-            generated_slug = self.generate_unique_slug(
-                recipe_name, filtered_existing_recipes
-            )
-            updated_recipe["slug"] = generated_slug
-            changed = True
-
-        return updated_recipe, changed
+        # Ignorar el slug actual de la receta para no generar sufijos innecesarios
+        slug = slug_registry.unique(base_slug, ignore=recipe.get("slug"))
+        return with_changes(updated_recipe, {"slug": slug}), True
 
-    def save_recipes(self, recipes):
+    def sort_recipes(self, recipes):
         """
-        Guarda las recetas en el archivo recipes.json ordenadas por fecha
+        Ordena las recetas por fecha (más reciente primero), igual que se guardan
 
         Args:
-            recipes: Lista de recetas a guardar
+            recipes: Lista de recetas
+
+        Returns:
+            list: Nueva lista ordenada (orden estable ante fechas iguales)
         """
-        # Ordenar recetas por fecha (más reciente primero)
-        sorted_recipes = sorted(
+        return sorted(
             recipes,
             key=lambda r: datetime.fromisoformat(r.get("date", "1970-01-01")),
             reverse=True,
         )
 
-        # Guardar como JSON
-        with self.recipes_path.open("w", encoding="utf-8") as f:
-            json.dump(sorted_recipes, f, ensure_ascii=False, indent=2)
+    def save_recipes(self, recipes):
+        """
+        Guarda las recetas en el archivo recipes.json ordenadas por fecha.
+        Con los almacenamientos "sharded", "sqlite" y "journal" solo se escribe
+        lo que cambió (recipes.json se exporta después con compact_recipes.py).
+
+        Args:
+            recipes: Lista de recetas a guardar
+
+        Raises:
+            StaleWriteError: Si otro proceso guardó el catálogo después de que
+                se leyó con get_existing_recipes (no se pisa nada)
+        """
+        sorted_recipes = [as_dict(r) for r in self.sort_recipes(recipes)]
 
-        print(f"✅ Archivo actualizado: {self.recipes_path}")
+        detail = self.store.save(sorted_recipes)
+        if detail == UNCHANGED:
+            print(f"✅ Sin cambios: {self.store.location} ya estaba al día")
+            return
+
+        print(f"✅ Archivo actualizado: {self.store.location}")
         print(f"📊 Total de recetas: {len(sorted_recipes)}")
+        if detail:
+            print(f"📝 {detail}")
 
-    def compute_related_recipes(self, recipes, max_results=3):
+    def compute_related_recipes(self, recipes, max_results=3, backend=None):
         """
         Calcula las recetas relacionadas para cada receta basándose en tags e ingredientes.
         Agrega un campo 'related_recipes' a cada receta con una lista de objetos
         {recipe_id: <id>, recipe_name: <name>, score: <score>} ordenados por
         score descendente.
 
+        Por defecto usa un índice invertido (tag/ingrediente → recetas): solo
+        se puntúan las recetas que comparten algo con la actual, sin recorrer
+        todo el catálogo por cada receta. Con backend="numpy" los scores se
+        calculan por bloques con productos de matrices. Ambos dan el mismo
+        resultado.
+
         Args:
             recipes: Lista de todas las recetas
             max_results: Número máximo de recetas relacionadas por receta
+            backend: Motor a usar ("index" o "numpy"). None = "index"
 
         Returns:
             Lista de recetas con el campo related_recipes agregado
         """
-        recipes_with_related = []
-
-        for recipe in recipes:
-            recipe_id = recipe["id"]
-            recipe_tags = set(t.lower() for t in recipe.get("tags", []))
-            recipe_ingredients = set(
-                i.lower() for i in recipe.get("cleaned_ingredientes", [])
+        engine_cls = resolve_engine_cls(backend)
+        if not engine_cls.EXACT:
+            print(
+                f"⚠️  Backend {backend!r} aproximado: las recetas relacionadas pueden "
+                "diferir de las del motor exacto (recall medido con "
+                "bench_related_recipes.py, perillas MINHASH_* en constants.py)"
             )
+        engine = engine_cls(recipes)
+        all_related = engine.compute(max_results)
+        recipes_with_related = []
 
-            scored = []
+        for recipe, top_related in zip(recipes, all_related):
+            print(f"Recipe: {recipe['name']}")
+            for top in top_related:
+                print(f"Score: {top['score']} - {top['recipe_name']}")
 
-            for other in recipes:
-                if other["id"] == recipe_id:
-                    continue
+            recipes_with_related.append(
+                with_changes(recipe, {"related_recipes": top_related})
+            )
 
-                score = 0
+        return recipes_with_related
 
-                other_tags = other.get("tags", [])
-                for tag in other_tags:
-                    if tag.lower() in recipe_tags:
-                        score += TAG_SCORE
-                        break
+    def update_related_recipes(self, recipes, previous_recipes, max_results=3):
+        """
+        Versión incremental de compute_related_recipes.
 
-                other_ingredients = other.get("cleaned_ingredientes", [])
-                for ing in other_ingredients:
-                    if ing.lower() in recipe_ingredients:
-                        score += INGREDIENT_SCORE
+        Solo recalcula las recetas nuevas o con cambios en tags,
+        cleaned_ingredientes o easy, y parchea las listas existentes en las
+        que esas recetas pueden entrar o salir. Da el mismo resultado que
+        compute_related_recipes si las related_recipes de previous_recipes se
+        calcularon con las recetas sin cambios en el mismo orden relativo.
 
-                if recipe.get("easy", False) == other.get("easy", False):
-                    score += EASY_SCORE
+        Args:
+            recipes: Lista de todas las recetas (en el orden en que se guardan)
+            previous_recipes: Recetas de la corrida anterior con related_recipes
+            max_results: Número máximo de recetas relacionadas por receta
 
-                if score > 0:
-                    scored.append(
-                        {
-                            "recipe_id": other["id"],
-                            "recipe_name": other["name"],
-                            "score": score,
-                        }
-                    )
+        Returns:
+            Lista de recetas con el campo related_recipes actualizado
+        """
+        updater = IncrementalRelatedUpdater(recipes, previous_recipes)
+        updates, recomputed, patched = updater.update(max_results)
 
-            scored.sort(key=lambda x: x["score"], reverse=True)
-            top_related = scored[:max_results]
+        recipes_with_related = []
+        for idx, recipe in enumerate(recipes):
+            if idx not in updates:
+                recipes_with_related.append(recipe)
+                continue
 
             print(f"Recipe: {recipe['name']}")
-            for top in top_related:
+            for top in updates[idx]:
                 print(f"Score: {top['score']} - {top['recipe_name']}")
 
-            updated = recipe.copy()
-            updated["related_recipes"] = top_related
-            recipes_with_related.append(updated)
+            recipes_with_related.append(
+                with_changes(recipe, {"related_recipes": updates[idx]})
+            )
 
+        print(f"🔁 {recomputed} recetas recalculadas, {patched} parcheadas")
         return recipes_with_related
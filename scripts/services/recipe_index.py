@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Recipe Index
+Índice chico que acompaña a recipes.json: fecha más reciente, ids,
+shortcodes y slugs, junto con el hash, tamaño y mtime del archivo del que
+salió.
+
+main.py solo necesita la fecha más reciente y los ids conocidos para
+consultar Instagram; con el índice no hace falta parsear todo el catálogo
+al arrancar. save_recipes lo actualiza cada vez que escribe el archivo y,
+si el archivo cambió por otro lado (fix_reel_urls.py, edición a mano, git),
+el índice queda viejo y se reconstruye recorriendo las recetas en stream.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .recipe_stream import iter_recipes
+
+# Subir si cambia el formato del índice (invalida los índices en disco)
+INDEX_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """SHA-256 del contenido de un archivo, leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_hash(data):
+    """SHA-256 de bytes en memoria (mismo valor que file_hash del archivo)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_signature(path):
+    """(tamaño, mtime en ns) de un archivo: chequeo barato de si cambió"""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+@dataclass
+class RecipeIndex:
+    """Metadatos de recipes.json que se usan antes de cargar el catálogo"""
+
+    count: int = 0
+    max_date: datetime | None = None
+    ids: set = field(default_factory=set)
+    shortcodes: set = field(default_factory=set)
+    # Con repetidos: cada receta ocupa su slug (ver SlugRegistry)
+    slugs: list = field(default_factory=list)
+    # Archivo del que salió el índice
+    content_hash: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+
+    @classmethod
+    def from_recipes(cls, recipes):
+        """
+        Arma el índice recorriendo las recetas una sola vez
+
+        Args:
+            recipes: Iterable de recetas (lista o stream)
+        """
+        index = cls()
+        for recipe in recipes:
+            index.add(recipe)
+        return index
+
+    def add(self, recipe):
+        """Suma una receta al índice"""
+        self.count += 1
+        if "id" in recipe:
+            self.ids.add(recipe["id"])
+        if recipe.get("shortcode"):
+            self.shortcodes.add(recipe["shortcode"])
+        if recipe.get("slug"):
+            self.slugs.append(recipe["slug"])
+
+        # Misma regla que get_existing_recipes: se ignoran fechas inválidas
+        if "date" in recipe:
+            try:
+                date_obj = datetime.fromisoformat(recipe["date"])
+            except ValueError:
+                return
+            if self.max_date is None or date_obj > self.max_date:
+                self.max_date = date_obj
+
+    def stamp(self, path, content_hash=None):
+        """
+        Registra hash, tamaño y mtime del archivo que describe el índice
+
+        Args:
+            path: Archivo descripto
+            content_hash: Hash ya calculado del contenido (evita releerlo)
+        """
+        self.content_hash = content_hash or file_hash(path)
+        self.size, self.mtime_ns = file_signature(path)
+
+    def matches(self, path):
+        """
+        Indica si el índice sigue describiendo al archivo. Si tamaño y mtime
+        coinciden no se lee el archivo; si solo cambió el mtime (checkout,
+        touch) se compara el hash y se actualiza el mtime.
+        """
+        size, mtime_ns = file_signature(path)
+        if size != self.size:
+            return False
+        if mtime_ns == self.mtime_ns:
+            return True
+        if file_hash(path) != self.content_hash:
+            return False
+        self.mtime_ns = mtime_ns
+        return True
+
+    def to_dict(self):
+        return {
+            "version": INDEX_VERSION,
+            "count": self.count,
+            "max_date": self.max_date.isoformat() if self.max_date else None,
+            "ids": sorted(self.ids, key=str),
+            "shortcodes": sorted(self.shortcodes),
+            "slugs": self.slugs,
+            "content_hash": self.content_hash,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        max_date = data.get("max_date")
+        return cls(
+            count=data["count"],
+            max_date=datetime.fromisoformat(max_date) if max_date else None,
+            ids=set(data["ids"]),
+            shortcodes=set(data["shortcodes"]),
+            slugs=list(data["slugs"]),
+            content_hash=data["content_hash"],
+            size=data["size"],
+            mtime_ns=data["mtime_ns"],
+        )
+
+
+def load_index(index_path):
+    """
+    Lee un índice guardado
+
+    Returns:
+        RecipeIndex | None: None si no existe, es ilegible o de otra versión
+    """
+    if not index_path.exists():
+        return None
+
+    try:
+        with index_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return RecipeIndex.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️  Índice de recetas ilegible, se reconstruye: {e}")
+        return None
+
+
+def save_index(index, index_path):
+    """Guarda el índice (archivo temporal + replace)"""
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Un temporal por proceso: varias etapas pueden guardar a la vez
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False)
+        tmp_path.replace(index_path)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar el índice de recetas: {e}")
+
+
+def get_index(recipes_path, index_path):
+    """
+    Devuelve el índice de recipes_path, reconstruyéndolo (en stream) y
+    guardándolo solo si el guardado no existe o quedó viejo
+
+    Args:
+        recipes_path: Path a recipes.json
+        index_path: Path del índice
+
+    Returns:
+        RecipeIndex: Índice (vacío si recipes_path no existe)
+    """
+    if not recipes_path.exists():
+        return RecipeIndex()
+
+    index = load_index(index_path)
+    if index is not None:
+        mtime_ns = index.mtime_ns
+        if index.matches(recipes_path):
+            if index.mtime_ns != mtime_ns:
+                save_index(index, index_path)
+            return index
+
+    index = RecipeIndex.from_recipes(iter_recipes(recipes_path))
+    index.stamp(recipes_path)
+    save_index(index, index_path)
+    return index
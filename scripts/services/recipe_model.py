@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Recipe Model
+Receta con __slots__ en lugar de un dict libre, para el pipeline de
+main.py y local_update.py.
+
+Se lee como un dict (recipe["name"], recipe.get("tags"), "slug" in recipe)
+así que los motores de related, el SlugRegistry y el resto del código que
+solo lee no cambian. Los cambios son copy-on-write: with_changes devuelve
+una receta nueva que comparte todos los valores que no cambiaron (o la misma
+receta si no cambió nada), en lugar de copiar el dict entero en cada etapa.
+
+Los tags y cleaned_ingredientes se guardan como tuplas de strings
+internados: cada tag repetido en el catálogo ocupa memoria una sola vez.
+to_dict devuelve el dict original (mismas claves, mismo orden, listas), así
+que recipes.json sale idéntico.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+# Campos conocidos de una receta (en el orden en que los crea post_to_recipe)
+RECIPE_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "tags",
+    "instagramUrl",
+    "facebookUrl",
+    "imageUrl",
+    "ingredients",
+    "date",
+    "old_tags",
+    "easy",
+    "hidden",
+    "cleaned_ingredientes",
+    "shortcode",
+    "slug",
+    "related_recipes",
+)
+_FIELD_SET = frozenset(RECIPE_FIELDS)
+
+# Listas de strings que se guardan como tuplas internadas
+INTERNED_FIELDS = frozenset({"tags", "old_tags", "cleaned_ingredientes"})
+
+# Órdenes de claves compartidos entre recetas (hay muy pocos distintos)
+_KEY_ORDERS = {}
+
+
+def _intern_keys(keys):
+    keys = tuple(keys)
+    return _KEY_ORDERS.setdefault(keys, keys)
+
+
+def _stored_value(key, value):
+    """Valor tal como se guarda en el campo (tupla internada para tags)"""
+    if key in INTERNED_FIELDS and isinstance(value, (list, tuple)):
+        return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+    return value
+
+
+@dataclass(slots=True, eq=False, repr=False)
+class Recipe(Mapping):
+    """Receta inmutable con acceso de solo lectura tipo dict"""
+
+    id: Any = None
+    name: Any = None
+    description: Any = None
+    tags: Any = None
+    instagramUrl: Any = None
+    facebookUrl: Any = None
+    imageUrl: Any = None
+    ingredients: Any = None
+    date: Any = None
+    old_tags: Any = None
+    easy: Any = None
+    hidden: Any = None
+    cleaned_ingredientes: Any = None
+    shortcode: Any = None
+    slug: Any = None
+    related_recipes: Any = None
+    # Claves presentes, en el orden del dict original
+    _keys: tuple = ()
+    # Claves fuera de RECIPE_FIELDS (None si no hay)
+    _extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Args:
+            data: Receta como dict (o Recipe, que se devuelve tal cual)
+        """
+        if isinstance(data, Recipe):
+            return data
+
+        recipe = cls(_keys=_intern_keys(data))
+        extra = None
+        for key, value in data.items():
+            if key in _FIELD_SET:
+                setattr(recipe, key, _stored_value(key, value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        recipe._extra = extra
+        return recipe
+
+    def to_dict(self):
+        """Dict con las mismas claves y orden que el original (listas, no tuplas)"""
+        data = {}
+        for key in self._keys:
+            value = self[key]
+            if key in INTERNED_FIELDS and isinstance(value, tuple):
+                value = list(value)
+            data[key] = value
+        return data
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            if key not in self._keys:
+                raise KeyError(key)
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"Recipe(id={self.id!r}, name={self.name!r})"
+
+    def with_changes(self, changes):
+        """
+        Receta con los campos de changes actualizados (las claves nuevas van
+        al final, como en un dict). Si ningún valor cambia devuelve self.
+
+        Args:
+            changes: Dict campo → valor nuevo
+        """
+        pending = {}
+        for key, value in changes.items():
+            value = _stored_value(key, value)
+            if key not in self._keys or self[key] != value:
+                pending[key] = value
+        if not pending:
+            return self
+
+        clone = Recipe.__new__(Recipe)
+        for name in _SLOTS:
+            setattr(clone, name, getattr(self, name))
+
+        new_keys = [key for key in pending if key not in self._keys]
+        if new_keys:
+            clone._keys = _intern_keys(self._keys + tuple(new_keys))
+
+        for key, value in pending.items():
+            if key in _FIELD_SET:
+                setattr(clone, key, value)
+            else:
+                # Copy-on-write también para las claves extra
+                clone._extra = dict(clone._extra or {})
+                clone._extra[key] = value
+        return clone
+
+
+_SLOTS = Recipe.__slots__
+
+
+def with_changes(recipe, changes):
+    """
+    Aplica cambios a una receta sin modificarla: Recipe.with_changes para
+    Recipe y una copia del dict para recetas dict
+
+    Returns:
+        Recipe | dict: Receta actualizada
+    """
+    if isinstance(recipe, Recipe):
+        return recipe.with_changes(changes)
+    updated = recipe.copy()
+    updated.update(changes)
+    return updated
+
+
+def as_dict(recipe):
+    """Dict de una receta (Recipe.to_dict o el mismo dict)"""
+    return recipe.to_dict() if isinstance(recipe, Recipe) else recipe
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Recipe Snapshot
+Copia binaria (pickle) de recipes.json ya parseado, para que los scripts no
+vuelvan a decodificar el JSON ni las fechas en cada arranque.
+
+El snapshot guarda primero el RecipeIndex del archivo (fecha máxima ya
+decodificada, ids, shortcodes, slugs, y tamaño/mtime/hash del JSON del que
+salió) y después las recetas en bloques de SNAPSHOT_BATCH_SIZE. Así se puede
+recorrer en stream igual que iter_recipes, con memoria acotada por bloque.
+
+Si recipes.json cambió (otro tamaño, u otro hash con distinto mtime) el
+snapshot se descarta y se rearma mientras se recorre el JSON, sin que quien
+lee se entere. Si solo cambió el mtime (touch, checkout) se reescribe el
+encabezado con el mtime nuevo, para no volver a hashear el JSON.
+Vive en la cache: borrarlo solo cuesta una lectura lenta.
+"""
+
+import os
+import pickle
+import shutil
+import sys
+from itertools import islice
+from pathlib import Path
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import CACHE_DIR
+
+from .recipe_index import RecipeIndex
+from .recipe_stream import iter_recipes
+
+# Subir si cambia el formato del snapshot (invalida los guardados)
+SNAPSHOT_VERSION = 1
+
+# Recetas por bloque pickleado
+SNAPSHOT_BATCH_SIZE = 256
+
+_REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+def snapshot_path(recipes_path):
+    """Path del snapshot de un archivo de recetas (en la cache del repo)"""
+    return _REPO_ROOT / CACHE_DIR / f"{Path(recipes_path).stem}_snapshot.pickle"
+
+
+def _tmp_path(path):
+    """Temporal del snapshot, uno por proceso (varias etapas pueden leer a la vez)"""
+    return path.with_suffix(f".{os.getpid()}.tmp")
+
+
+def _read_header(f):
+    """RecipeIndex del encabezado, o None si el snapshot no sirve"""
+    try:
+        header = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(header, dict) or header.get("version") != SNAPSHOT_VERSION:
+        return None
+    index = header.get("index")
+    return index if isinstance(index, RecipeIndex) else None
+
+
+def _open_valid(recipes_path, path):
+    """
+    Abre el snapshot si corresponde al recipes_path actual
+
+    Returns:
+        tuple: (archivo abierto posicionado en las recetas, RecipeIndex) o
+            (None, None)
+    """
+    if not path.exists():
+        return None, None
+    f = path.open("rb")
+    index = _read_header(f)
+    if index is not None:
+        mtime_ns = index.mtime_ns
+        if index.matches(recipes_path):
+            if index.mtime_ns != mtime_ns:
+                # Confirmado por hash: guardar el mtime nuevo para no volver
+                # a hashear recipes.json en cada carga
+                _restamp(f, path, index)
+            return f, index
+    f.close()
+    return None, None
+
+
+def _restamp(f, path, index):
+    """
+    Reescribe el snapshot con el encabezado de index y las mismas recetas
+    (temporal + replace); f queda posicionado en las recetas
+    """
+    start = f.tell()
+    tmp_path = _tmp_path(path)
+    try:
+        with tmp_path.open("wb") as out:
+            _dump_header(out, index)
+            shutil.copyfileobj(f, out)
+        tmp_path.replace(path)
+    except OSError as e:
+        print(f"⚠️  No se pudo actualizar el snapshot de recetas: {e}")
+        tmp_path.unlink(missing_ok=True)
+    f.seek(start)
+
+
+def write_snapshot(path, recipes, index):
+    """
+    Guarda un snapshot (archivo temporal + replace)
+
+    Args:
+        path: Path del snapshot
+        recipes: Lista de recetas
+        index: RecipeIndex ya estampado con el archivo del que salen
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _tmp_path(path)
+        with tmp_path.open("wb") as f:
+            _dump_header(f, index)
+            for start in range(0, len(recipes), SNAPSHOT_BATCH_SIZE):
+                batch = recipes[start : start + SNAPSHOT_BATCH_SIZE]
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"⚠️  No se pudo guardar el snapshot de recetas: {e}")
+
+
+def _dump_header(f, index):
+    header = {"version": SNAPSHOT_VERSION, "index": index}
+    pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def iter_catalogue(recipes_path, path=None):
+    """
+    Itera las recetas de recipes_path desde el snapshot si está al día; si
+    no, desde el JSON (en stream) guardando un snapshot nuevo al terminar
+
+    Args:
+        recipes_path: Path a recipes.json
+        path: Path del snapshot (None = snapshot_path(recipes_path))
+
+    Yields:
+        dict: Cada receta, en el orden del archivo
+    """
+    recipes_path = Path(recipes_path)
+    path = Path(path) if path is not None else snapshot_path(recipes_path)
+
+    f, _ = _open_valid(recipes_path, path)
+    if f is not None:
+        with f:
+            while True:
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    return
+                yield from batch
+
+    # Sin snapshot válido: recorrer el JSON y armar el snapshot en el camino
+    index = RecipeIndex()
+    index.stamp(recipes_path)
+    tmp_path = _tmp_path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        out = tmp_path.open("wb")
+    except OSError:
+        out = None
+
+    completed = False
+    try:
+        if out is not None:
+            _dump_header(out, index)
+        recipes = iter_recipes(recipes_path)
+        while True:
+            batch = list(islice(recipes, SNAPSHOT_BATCH_SIZE))
+            if not batch:
+                break
+            for recipe in batch:
+                index.add(recipe)
+            # Se pickle-a antes de entregar las recetas: quien las recorre
+            # puede modificarlas (fix_reel_urls.py)
+            if out is not None:
+                pickle.dump(batch, out, protocol=pickle.HIGHEST_PROTOCOL)
+            yield from batch
+        completed = True
+    finally:
+        if out is not None:
+            out.close()
+            if completed:
+                # El encabezado se reescribe con el índice completo
+                _finish_snapshot(tmp_path, path, index)
+            else:
+                # Recorrido cortado (islice, error): no se guarda nada
+                tmp_path.unlink(missing_ok=True)
+
+
+def _finish_snapshot(tmp_path, path, index):
+    """Reescribe el encabezado del temporal con el índice completo y lo publica"""
+    try:
+        with tmp_path.open("rb") as f:
+            _read_header(f)
+            body = f.read()
+        with tmp_path.open("wb") as f:
+            _dump_header(f, index)
+            f.write(body)
+        tmp_path.replace(path)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar el snapshot de recetas: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_catalogue(recipes_path, path=None):
+    """
+    Carga todas las recetas junto con su índice (fechas ya decodificadas)
+
+    Args:
+        recipes_path: Path a recipes.json
+        path: Path del snapshot (None = snapshot_path(recipes_path))
+
+    Returns:
+        tuple: (lista de recetas, RecipeIndex)
+    """
+    recipes_path = Path(recipes_path)
+    path = Path(path) if path is not None else snapshot_path(recipes_path)
+
+    f, index = _open_valid(recipes_path, path)
+    if f is not None:
+        recipes = []
+        with f:
+            while True:
+                try:
+                    recipes.extend(pickle.load(f))
+                except EOFError:
+                    break
+        return recipes, index
+
+    recipes = list(iter_catalogue(recipes_path, path))
+    f, index = _open_valid(recipes_path, path)
+    if f is not None:
+        f.close()
+        return recipes, index
+    # No se pudo guardar el snapshot: índice armado en memoria
+    index = RecipeIndex.from_recipes(recipes)
+    index.stamp(recipes_path)
+    return recipes, index
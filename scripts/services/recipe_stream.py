@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Recipe Stream
+Lectura y escritura de recipes.json de a una receta por vez.
+
+iter_recipes recorre el array del archivo sin cargarlo entero: mantiene en
+memoria solo un bloque del archivo y la receta actual. write_recipes emite
+exactamente el mismo texto que json.dump(recipes, f, ensure_ascii=False,
+indent=2), pero receta por receta y a partir de cualquier iterable.
+
+Los scripts que solo recorren el catálogo (extract_field.py, fix_reel_urls.py,
+ia_main.py) usan este camino para que la memoria y el arranque no crezcan con
+la cantidad de recetas.
+
+serialize_recipes arma los bytes de todo el archivo de una vez (así
+save_recipes puede compararlos con lo que ya está en disco). Si orjson está
+instalado se usa para serializar; el texto es el mismo byte a byte que con
+json, y donde podría no serlo (floats con exponente) se usa json.
+"""
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Tamaño de cada lectura del archivo (caracteres)
+READ_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+# orjson escribe 1e16 / 1e-7 donde json escribe 1e+16 / 1e-07
+_EXPONENT_PATTERN = re.compile(rb"\de-?\d")
+
+
+def _orjson_dumps(value):
+    """
+    value con indent=2 vía orjson, o None si no está instalado o el texto
+    podría no coincidir con el de json (floats con exponente, enteros fuera
+    de 64 bits, claves que no son strings)
+    """
+    if orjson is None:
+        return None
+    try:
+        data = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    except TypeError:
+        return None
+    if _EXPONENT_PATTERN.search(data):
+        return None
+    return data
+
+
+def dumps_indented(value):
+    """Igual que json.dumps(value, ensure_ascii=False, indent=2)"""
+    data = _orjson_dumps(value)
+    if data is not None:
+        return data.decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, indent=2)
+
+
+def serialize_recipes(recipes):
+    """
+    Bytes (UTF-8) del archivo de recetas, idénticos a los de write_recipes
+    y a json.dump(recipes, f, ensure_ascii=False, indent=2)
+
+    Args:
+        recipes: Lista de recetas
+
+    Returns:
+        bytes: Contenido del archivo
+    """
+    data = _orjson_dumps(recipes)
+    if data is not None:
+        return data
+    return json.dumps(recipes, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def iter_recipes(path, chunk_size=READ_CHUNK_SIZE):
+    """
+    Itera las recetas de un archivo JSON (un array de objetos) de a una.
+    Si el archivo tiene un único objeto en lugar de un array, lo devuelve
+    como única receta.
+
+    Args:
+        path: Path al archivo (recipes.json)
+        chunk_size: Caracteres por lectura
+
+    Yields:
+        dict: Cada receta, en el orden del archivo
+
+    Raises:
+        json.JSONDecodeError: Si el archivo no es JSON válido
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill(min_size):
+            """Lee del archivo hasta tener al menos min_size caracteres desde pos"""
+            nonlocal buffer, pos, eof
+            if pos:
+                buffer = buffer[pos:]
+                pos = 0
+            while not eof and len(buffer) < min_size:
+                # Crecer de forma geométrica si una receta ocupa varios bloques
+                data = f.read(max(chunk_size, len(buffer)))
+                if not data:
+                    eof = True
+                buffer += data
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                fill(1)
+
+        fill(chunk_size)
+        skip_whitespace()
+
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Expecting value", buffer, pos)
+
+        if buffer[pos] != "[":
+            # No es un array: un único objeto
+            fill(float("inf"))
+            yield json.loads(buffer)
+            return
+
+        pos += 1
+        skip_whitespace()
+        if buffer[pos : pos + 1] == "]":
+            return
+
+        while True:
+            # Decodificar la próxima receta, leyendo más si quedó cortada
+            while True:
+                try:
+                    recipe, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    fill(len(buffer) - pos + chunk_size)
+                    continue
+                next_char = buffer[end : end + 1]
+                if not eof and (not next_char or next_char not in _DELIMITERS):
+                    # Un número cortado por el bloque ("2." de "2.5") decodifica
+                    # igual: solo vale si después viene un separador
+                    fill(len(buffer) - pos + chunk_size)
+                    continue
+                break
+
+            yield recipe
+            pos = end
+
+            skip_whitespace()
+            separator = buffer[pos : pos + 1]
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            skip_whitespace()
+
+
+def write_recipes(path, recipes):
+    """
+    Escribe recetas como array JSON, de a una, con el mismo formato que
+    json.dump(..., ensure_ascii=False, indent=2)
+
+    Args:
+        path: Path del archivo a escribir
+        recipes: Iterable de recetas (puede ser un generador)
+
+    Returns:
+        int: Cantidad de recetas escritas
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for recipe in recipes:
+            f.write(",\n  " if count else "[\n  ")
+            # Los saltos de línea dentro de strings salen escapados, así que
+            # todos los "\n" del dump son de la indentación
+            f.write(dumps_indented(recipe).replace("\n", "\n  "))
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
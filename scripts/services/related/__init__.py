@@ -0,0 +1,52 @@
+"""
+Motores de recetas relacionadas (strategy pattern).
+
+Cada motor calcula, para cada receta, las recetas más parecidas según los
+pesos de constants.py (TAG_SCORE, INGREDIENT_SCORE, EASY_SCORE). Todos
+exponen la misma interfaz definida por RelatedEngineBase. Los motores
+exactos (EXACT = True) devuelven el mismo resultado que el cálculo original
+por fuerza bruta; los aproximados solo acotan los candidatos a puntuar.
+"""
+
+from .base import RelatedEngineBase
+from .incremental import IncrementalRelatedUpdater, related_fingerprint
+from .inverted_index import InvertedIndexEngine
+from .minhash import MinHashLSHEngine
+from .numpy_engine import NumpyEngine
+
+# Mapeo nombre de backend (flag --related-backend) → clase concreta
+ENGINES = {
+    "index": InvertedIndexEngine,
+    "numpy": NumpyEngine,
+    # Aproximado: candidatos por MinHash/LSH, rescoring exacto
+    "minhash": MinHashLSHEngine,
+}
+
+DEFAULT_ENGINE = "index"
+
+
+def resolve_engine_cls(name=None):
+    """Devuelve la clase de motor para el nombre de backend dado.
+
+    Si name es None se usa DEFAULT_ENGINE ("index").
+    """
+    name = (name or DEFAULT_ENGINE).strip().lower()
+    if name not in ENGINES:
+        raise ValueError(
+            f"Backend de recetas relacionadas desconocido: {name!r}. "
+            f"Valores válidos: {', '.join(ENGINES)}"
+        )
+    return ENGINES[name]
+
+
+__all__ = [
+    "ENGINES",
+    "DEFAULT_ENGINE",
+    "IncrementalRelatedUpdater",
+    "RelatedEngineBase",
+    "InvertedIndexEngine",
+    "MinHashLSHEngine",
+    "NumpyEngine",
+    "related_fingerprint",
+    "resolve_engine_cls",
+]
@@ -0,0 +1,148 @@
+"""
+Base de los motores de recetas relacionadas.
+
+RelatedEngineBase define el contrato (strategy pattern) y la semántica de
+score que todos los motores deben respetar, idéntica al cálculo original
+de ParserService.compute_related_recipes:
+
+- TAG_SCORE una sola vez si comparten al menos un tag (sin importar
+  mayúsculas).
+- INGREDIENT_SCORE por cada ingrediente limpio de la otra receta que
+  también está en la receta actual.
+- EASY_SCORE si ambas tienen el mismo valor de "easy".
+- Solo entran recetas con score > 0 y distinto id; se ordenan por score
+  descendente y, ante empate, por posición en la lista original.
+"""
+
+import heapq
+import sys
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from pathlib import Path
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from constants import EASY_SCORE, INGREDIENT_SCORE, TAG_SCORE
+
+
+class RelatedEngineBase(ABC):
+    """Contrato abstracto que debe cumplir todo motor de recetas relacionadas.
+
+    EXACT indica si el motor devuelve exactamente el resultado de fuerza
+    bruta (True) o una aproximación (False).
+
+    Al construirse normaliza una sola vez los campos que intervienen en el
+    score (tags e ingredientes en minúsculas, easy, id) para que ningún
+    motor tenga que volver a recorrerlos por cada par de recetas.
+    """
+
+    EXACT = True
+
+    def __init__(self, recipes):
+        """
+        Args:
+            recipes: Lista de recetas (dicts con id, name, tags,
+                cleaned_ingredientes y easy)
+        """
+        self.recipes = recipes
+        self.ids = [r["id"] for r in recipes]
+        self.easy = [r.get("easy", False) for r in recipes]
+        self.tags = [frozenset(t.lower() for t in r.get("tags", [])) for r in recipes]
+        # Se conserva la multiplicidad: cada aparición en la otra receta suma
+        self.ingredients = [
+            [i.lower() for i in r.get("cleaned_ingredientes", [])] for r in recipes
+        ]
+        self.ingredient_sets = [frozenset(ings) for ings in self.ingredients]
+
+        # Posiciones por valor de "easy", en orden original (relleno EASY_SCORE)
+        self.easy_groups = defaultdict(list)
+        # Posiciones por id (una receta nunca se relaciona con su mismo id)
+        self.id_positions = defaultdict(list)
+        for idx in range(len(recipes)):
+            self.easy_groups[self.easy[idx]].append(idx)
+            self.id_positions[self.ids[idx]].append(idx)
+
+    def score(self, idx, other):
+        """Score de la receta en posición `other` relativo a la de posición `idx`."""
+        score = 0
+        if not self.tags[other].isdisjoint(self.tags[idx]):
+            score += TAG_SCORE
+        recipe_ingredients = self.ingredient_sets[idx]
+        for ing in self.ingredients[other]:
+            if ing in recipe_ingredients:
+                score += INGREDIENT_SCORE
+        if self.easy[idx] == self.easy[other]:
+            score += EASY_SCORE
+        return score
+
+    def entry(self, other, score):
+        """Arma el objeto de related_recipes para la receta en posición `other`."""
+        other_recipe = self.recipes[other]
+        return {
+            "recipe_id": other_recipe["id"],
+            "recipe_name": other_recipe["name"],
+            "score": score,
+        }
+
+    def easy_fillers(self, idx, exclude, max_results):
+        """Primeras recetas del grupo de "easy" de `idx` que no están en `exclude`.
+
+        Si no comparten tags ni ingredientes valen EASY_SCORE, así que solo
+        las primeras max_results (por posición) pueden llegar al top.
+
+        Returns:
+            list: Posiciones en orden original
+        """
+        if EASY_SCORE <= 0:
+            return []
+
+        recipe_id = self.ids[idx]
+        fillers = []
+        for other in self.easy_groups[self.easy[idx]]:
+            if len(fillers) >= max_results:
+                break
+            if other in exclude or self.ids[other] == recipe_id:
+                continue
+            fillers.append(other)
+        return fillers
+
+    def rank(self, scored, max_results):
+        """Top max_results de pares (posición, score) como related_recipes.
+
+        Más score primero y, ante empate, menor posición (el mismo orden que
+        un sort estable por score descendente). Hay pocos scores distintos:
+        se agrupa por score y dentro de cada grupo se usa un heap acotado.
+        """
+        buckets = defaultdict(list)
+        for other, score in scored:
+            if score > 0:
+                buckets[score].append(other)
+
+        top = []
+        for score in sorted(buckets, reverse=True):
+            remaining = max_results - len(top)
+            if remaining <= 0:
+                break
+            for other in heapq.nsmallest(remaining, buckets[score]):
+                top.append(self.entry(other, score))
+        return top
+
+    @abstractmethod
+    def top_related(self, idx, max_results=3):
+        """Devuelve las related_recipes de la receta en posición `idx`.
+
+        Args:
+            idx: Posición de la receta en la lista original
+            max_results: Número máximo de recetas relacionadas
+
+        Returns:
+            list: Objetos {recipe_id, recipe_name, score} ordenados por score
+        """
+
+    def compute(self, max_results=3):
+        """Calcula las related_recipes de todas las recetas, en orden.
+
+        Returns:
+            list: Una lista de related_recipes por receta
+        """
+        return [self.top_related(idx, max_results) for idx in range(len(self.recipes))]
@@ -0,0 +1,179 @@
+"""
+Mantenimiento incremental de related_recipes (dirty tracking).
+
+En una corrida diaria entran 1-3 posts nuevos: en lugar de recalcular las
+related_recipes de todo el catálogo, se recalculan solo las recetas nuevas
+o cambiadas (tags, cleaned_ingredientes o easy) y se parchean las listas de
+las recetas existentes en las que una receta cambiada puede entrar o salir.
+
+El resultado es idéntico a un recálculo completo siempre que las
+related_recipes guardadas se hayan calculado con las recetas sin cambios en
+el mismo orden relativo (el orden por fecha de recipes.json).
+"""
+
+from collections import defaultdict
+
+from .base import EASY_SCORE
+from .inverted_index import InvertedIndexEngine
+
+
+def related_fingerprint(recipe):
+    """Campos que intervienen en el score de una receta (dirty tracking)."""
+    return (
+        tuple(recipe.get("tags", [])),
+        tuple(recipe.get("cleaned_ingredientes", [])),
+        recipe.get("easy", False),
+    )
+
+
+class IncrementalRelatedUpdater:
+    """Actualiza related_recipes comparando contra la versión anterior del catálogo."""
+
+    def __init__(self, recipes, previous_recipes):
+        """
+        Args:
+            recipes: Lista actual de recetas (en el orden en que se guardan)
+            previous_recipes: Recetas de la corrida anterior, con su campo
+                related_recipes ya calculado
+        """
+        self.recipes = recipes
+        self.engine = InvertedIndexEngine(recipes)
+        self.previous_by_id = {r["id"]: r for r in previous_recipes if "id" in r}
+
+        current_ids = set(self.engine.ids)
+        self.removed_ids = set(self.previous_by_id) - current_ids
+        # Con ids duplicados las entradas guardadas son ambiguas: recálculo total
+        self.has_duplicates = len(current_ids) != len(self.engine.ids)
+
+    def _position(self, recipe_id):
+        return self.engine.id_positions[recipe_id][0]
+
+    def _key(self, score, position):
+        """Clave de orden: más score primero y, ante empate, menor posición."""
+        return (score, -position)
+
+    def _classify(self, max_results):
+        """Separa las recetas en cambiadas (dirty), desactualizadas y limpias.
+
+        Returns:
+            tuple: (posiciones dirty, posiciones a recalcular sin afectar a
+                otras, posiciones limpias)
+        """
+        dirty, stale, clean = [], [], []
+        for idx, recipe in enumerate(self.recipes):
+            previous = self.previous_by_id.get(recipe["id"])
+            if previous is None or related_fingerprint(previous) != related_fingerprint(
+                recipe
+            ):
+                dirty.append(idx)
+            elif (
+                "related_recipes" not in recipe
+                or len(recipe["related_recipes"]) > max_results
+            ):
+                stale.append(idx)
+            else:
+                clean.append(idx)
+        return dirty, stale, clean
+
+    def _is_weak(self, related, max_results):
+        """True si una receta que solo suma EASY_SCORE podría entrar en la lista."""
+        return len(related) < max_results or related[-1]["score"] <= EASY_SCORE
+
+    def _sharing(self, idx):
+        """Recetas que comparten al menos un tag o ingrediente con la de `idx`."""
+        engine = self.engine
+        sharing = set()
+        for tag in engine.tags[idx]:
+            sharing.update(engine.tag_postings[tag])
+        for ing in engine.ingredient_sets[idx]:
+            sharing.update(engine.ingredient_postings[ing])
+        return sharing
+
+    def update(self, max_results=3):
+        """
+        Calcula las related_recipes que cambian respecto de la corrida anterior.
+
+        Returns:
+            tuple: (dict posición → related_recipes nuevas, cantidad de
+                recetas recalculadas, cantidad de recetas parcheadas)
+        """
+        engine = self.engine
+        if self.has_duplicates:
+            related = engine.compute(max_results)
+            return dict(enumerate(related)), len(related), 0
+
+        dirty, stale, clean = self._classify(max_results)
+        changed_ids = {engine.ids[idx] for idx in dirty} | self.removed_ids
+        renamed_ids = {
+            recipe["id"]
+            for recipe in self.recipes
+            if recipe["id"] in self.previous_by_id
+            and self.previous_by_id[recipe["id"]].get("name") != recipe.get("name")
+        }
+
+        # Índice inverso: id relacionado → recetas limpias que lo listan
+        listed_by = defaultdict(list)
+        for idx in clean:
+            for entry in self.recipes[idx]["related_recipes"]:
+                listed_by[entry["recipe_id"]].append(idx)
+
+        # Si una receta cambiada o borrada estaba en la lista, puede salir y
+        # dejar lugar a otra: esas listas se recalculan completas
+        recompute = set(dirty) | set(stale)
+        for recipe_id in changed_ids:
+            recompute.update(listed_by.get(recipe_id, []))
+
+        # Recetas cambiadas que ahora pueden entrar en listas existentes
+        weak = {
+            idx
+            for idx in clean
+            if idx not in recompute
+            and self._is_weak(self.recipes[idx]["related_recipes"], max_results)
+        }
+        inserts = defaultdict(list)
+        for d in dirty:
+            candidates = self._sharing(d)
+            candidates.update(idx for idx in weak if engine.easy[idx] == engine.easy[d])
+            for idx in candidates:
+                if idx in recompute or engine.ids[idx] == engine.ids[d]:
+                    continue
+                score = engine.score(idx, d)
+                if score <= 0:
+                    continue
+                related = self.recipes[idx]["related_recipes"]
+                if len(related) >= max_results:
+                    last = related[-1]
+                    last_key = self._key(last["score"], self._position(last["recipe_id"]))
+                    if self._key(score, d) <= last_key:
+                        continue
+                inserts[idx].append((d, score))
+
+        updates = {idx: engine.top_related(idx, max_results) for idx in recompute}
+
+        for idx, entering in inserts.items():
+            ranked = [
+                (self._key(entry["score"], self._position(entry["recipe_id"])), entry)
+                for entry in self.recipes[idx]["related_recipes"]
+            ]
+            ranked.extend(
+                (self._key(score, d), engine.entry(d, score)) for d, score in entering
+            )
+            ranked.sort(key=lambda item: item[0], reverse=True)
+            updates[idx] = [entry for _, entry in ranked[:max_results]]
+
+        # Renombres: solo cambia el recipe_name de las entradas que los listan
+        for recipe_id in renamed_ids:
+            name = self.recipes[self._position(recipe_id)]["name"]
+            for idx in listed_by.get(recipe_id, []):
+                if idx in recompute:
+                    continue
+                related = updates.get(idx, self.recipes[idx]["related_recipes"])
+                updates[idx] = [
+                    {**entry, "recipe_name": name}
+                    if entry["recipe_id"] == recipe_id
+                    else entry
+                    for entry in related
+                ]
+
+        patched = len(updates) - len(recompute)
+        return updates, len(recompute), patched
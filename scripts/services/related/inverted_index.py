@@ -0,0 +1,72 @@
+"""
+Motor de recetas relacionadas basado en índices invertidos.
+
+En lugar de comparar cada receta contra todas las demás (O(n²)), arma una
+sola vez las posting lists tag → recetas e ingrediente limpio → recetas y
+acumula score solo para las recetas que comparten algo con la actual. El
+top sale de un heap acotado a max_results dentro de cada grupo de score.
+
+Las recetas que no comparten nada solo pueden sumar EASY_SCORE; como ante
+empate gana la posición original, alcanza con tomar las primeras
+max_results de su grupo de "easy" como relleno.
+"""
+
+from collections import Counter, defaultdict
+
+from .base import EASY_SCORE, INGREDIENT_SCORE, TAG_SCORE, RelatedEngineBase
+
+
+class InvertedIndexEngine(RelatedEngineBase):
+    """Motor exacto con posting lists por tag e ingrediente."""
+
+    def __init__(self, recipes):
+        super().__init__(recipes)
+        self.tag_postings = defaultdict(list)
+        self.ingredient_postings = defaultdict(list)
+
+        for idx in range(len(recipes)):
+            for tag in self.tags[idx]:
+                self.tag_postings[tag].append(idx)
+            # Una entrada por aparición: respeta la multiplicidad del score
+            for ing in self.ingredients[idx]:
+                self.ingredient_postings[ing].append(idx)
+
+    def candidate_scores(self, idx):
+        """Scores de las recetas que comparten al menos un tag o ingrediente.
+
+        Returns:
+            dict: posición → score (incluye EASY_SCORE si corresponde)
+        """
+        tag_matches = set()
+        for tag in self.tags[idx]:
+            tag_matches.update(self.tag_postings[tag])
+
+        # Counter.update cuenta en C: cada aparición en la posting list suma 1
+        shared_ingredients = Counter()
+        for ing in self.ingredient_sets[idx]:
+            shared_ingredients.update(self.ingredient_postings[ing])
+
+        recipe_easy = self.easy[idx]
+        easy = self.easy
+        scores = {}
+        for other in tag_matches.union(shared_ingredients):
+            score = INGREDIENT_SCORE * shared_ingredients[other]
+            if other in tag_matches:
+                score += TAG_SCORE
+            if easy[other] == recipe_easy:
+                score += EASY_SCORE
+            scores[other] = score
+
+        for other in self.id_positions[self.ids[idx]]:
+            scores.pop(other, None)
+
+        return scores
+
+    def top_related(self, idx, max_results=3):
+        scores = self.candidate_scores(idx)
+        scored = list(scores.items())
+        scored.extend(
+            (other, EASY_SCORE)
+            for other in self.easy_fillers(idx, scores, max_results)
+        )
+        return self.rank(scored, max_results)
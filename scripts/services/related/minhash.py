@@ -0,0 +1,132 @@
+"""
+Motor aproximado de recetas relacionadas (MinHash + LSH).
+
+Con catálogos muy grandes, ingredientes comunes como "sal" o "huevo" hacen
+que las posting lists del índice invertido abarquen casi todo el catálogo.
+Este motor calcula una firma MinHash por receta sobre sus tags e
+ingredientes limpios, agrupa las firmas en bandas (LSH) y solo puntúa, con
+los pesos exactos de siempre, a las recetas que caen en algún bucket en
+común con la actual.
+
+Perillas de recall vs velocidad:
+- num_perm: largo de la firma (más = estimación más estable, más costo).
+- bands: cantidad de bandas; con rows = num_perm // bands, el umbral de
+  similitud Jaccard a partir del cual dos recetas suelen ser candidatas es
+  aproximadamente (1 / bands) ** (1 / rows). Más bandas = más recall y más
+  candidatos.
+- max_token_df: los tokens presentes en más de esa fracción del catálogo
+  no entran en la firma (generan buckets enormes y casi no discriminan).
+"""
+
+import random
+import zlib
+from collections import Counter, defaultdict
+
+from constants import MINHASH_BANDS, MINHASH_MAX_TOKEN_DF, MINHASH_NUM_PERM
+
+from .base import RelatedEngineBase
+
+# Primo de Mersenne 2^61 - 1 para las permutaciones (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+
+
+class MinHashLSHEngine(RelatedEngineBase):
+    """Motor aproximado: candidatos por LSH y rescoring exacto."""
+
+    EXACT = False
+
+    def __init__(
+        self,
+        recipes,
+        num_perm=MINHASH_NUM_PERM,
+        bands=MINHASH_BANDS,
+        max_token_df=MINHASH_MAX_TOKEN_DF,
+        seed=1,
+    ):
+        """
+        Args:
+            recipes: Lista de recetas
+            num_perm: Largo de la firma MinHash
+            bands: Cantidad de bandas LSH (debe dividir a num_perm)
+            max_token_df: Fracción máxima de recetas en la que puede aparecer
+                un token para entrar en la firma ("sal", "huevo" quedan
+                afuera de la firma, pero siguen sumando en el rescoring)
+            seed: Semilla de las permutaciones (resultado reproducible)
+        """
+        if bands <= 0 or num_perm % bands:
+            raise ValueError(
+                f"bands ({bands}) debe ser positivo y dividir a num_perm ({num_perm})"
+            )
+        super().__init__(recipes)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+        self._token_hashes = {}
+
+        document_frequency = Counter()
+        for idx in range(len(recipes)):
+            document_frequency.update(self._tokens(idx))
+        max_df = max(1, int(max_token_df * len(recipes)))
+        self.common_tokens = {t for t, df in document_frequency.items() if df > max_df}
+
+        self.buckets = defaultdict(list)
+        self.band_keys = []
+        for idx in range(len(recipes)):
+            keys = self._band_keys(self.signature(idx))
+            self.band_keys.append(keys)
+            for key in keys:
+                self.buckets[key].append(idx)
+
+    def _token_vector(self, token):
+        """Hash permutado del token para cada una de las num_perm permutaciones."""
+        vector = self._token_hashes.get(token)
+        if vector is None:
+            x = zlib.crc32(token.encode("utf-8"))
+            vector = [(a * x + b) % _PRIME for a, b in self._perms]
+            self._token_hashes[token] = vector
+        return vector
+
+    def _tokens(self, idx):
+        tokens = [f"t:{tag}" for tag in self.tags[idx]]
+        tokens.extend(f"i:{ing}" for ing in self.ingredient_sets[idx])
+        return tokens
+
+    def signature(self, idx):
+        """Firma MinHash de la receta en posición `idx` (None si no tiene tokens)."""
+        tokens = [t for t in self._tokens(idx) if t not in self.common_tokens]
+        if not tokens:
+            return None
+        return list(map(min, zip(*(self._token_vector(t) for t in tokens))))
+
+    def _band_keys(self, signature):
+        if signature is None:
+            return []
+        rows = self.rows
+        return [
+            (band, tuple(signature[band * rows : (band + 1) * rows]))
+            for band in range(self.bands)
+        ]
+
+    def candidates(self, idx):
+        """Recetas que comparten al menos un bucket LSH con la de `idx`."""
+        found = set()
+        for key in self.band_keys[idx]:
+            found.update(self.buckets[key])
+        for other in self.id_positions[self.ids[idx]]:
+            found.discard(other)
+        return found
+
+    def top_related(self, idx, max_results=3):
+        candidates = self.candidates(idx)
+        # Relleno por grupo de "easy" (igual que el motor exacto); se
+        # puntúan exacto porque, a diferencia del índice, acá un relleno
+        # puede compartir algo que LSH no detectó
+        candidates.update(self.easy_fillers(idx, candidates, max_results))
+        return self.rank(
+            ((other, self.score(idx, other)) for other in candidates), max_results
+        )
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Slug Registry
+Registro de slugs ocupados para asignar slugs únicos sin volver a recorrer
+todas las recetas en cada llamada.
+
+Guarda cuántas recetas usan cada slug y, por slug base, el próximo sufijo
+numérico que puede estar libre, así "pan-casero" seguido de "pan-casero-2",
+"pan-casero-3", ... se resuelve sin probar de nuevo los sufijos ya ocupados.
+La semántica es la misma que la búsqueda original: el slug base si está
+libre; si no, el primer "-2", "-3", ... libre.
+"""
+
+from collections import Counter
+
+
+def _split_suffix(slug):
+    """
+    Separa un slug con sufijo numérico generado ("pan-casero-3") en
+    (slug base, sufijo). Devuelve None si no termina en -N con N >= 2.
+    """
+    base, sep, tail = slug.rpartition("-")
+    if not (sep and base and tail.isascii() and tail.isdigit()):
+        return None
+    number = int(tail)
+    if number < 2 or tail != str(number):
+        return None
+    return base, number
+
+
+class SlugRegistry:
+    """Slugs ocupados (con multiplicidad) y próximo sufijo libre por slug base"""
+
+    def __init__(self, slugs=()):
+        """
+        Args:
+            slugs: Slugs ya ocupados (los vacíos se ignoran)
+        """
+        self._counts = Counter()
+        # Slug base → menor N tal que todos los base-2 .. base-(N-1) están ocupados
+        self._next_suffix = {}
+        for slug in slugs:
+            self.add(slug)
+
+    @classmethod
+    def from_recipes(cls, recipes):
+        """Registro con los slugs de una lista de recetas"""
+        return cls(recipe.get("slug") for recipe in recipes)
+
+    def __contains__(self, slug):
+        return self._counts.get(slug, 0) > 0
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, slug):
+        """Marca un slug como ocupado (una receta más lo usa)"""
+        if slug:
+            self._counts[slug] += 1
+
+    def remove(self, slug):
+        """Libera una ocurrencia de un slug (una receta dejó de usarlo)"""
+        if not slug or slug not in self:
+            return
+
+        self._counts[slug] -= 1
+        if self._counts[slug]:
+            return
+
+        del self._counts[slug]
+        parsed = _split_suffix(slug)
+        if parsed:
+            base, number = parsed
+            if self._next_suffix.get(base, 2) > number:
+                self._next_suffix[base] = number
+
+    def unique(self, base_slug, ignore=None):
+        """
+        Devuelve un slug libre a partir de base_slug (no lo registra).
+        Si base_slug está ocupado agrega un sufijo numérico (-2, -3, -4, ...).
+
+        Args:
+            base_slug: Slug generado a partir del nombre
+            ignore: Slug que se considera libre aunque esté ocupado (el slug
+                actual de la receta, para no generar sufijos innecesarios)
+
+        Returns:
+            str: Slug único ("" si base_slug es vacío)
+        """
+        if not base_slug:
+            return ""
+
+        if base_slug == ignore or base_slug not in self:
+            return base_slug
+
+        counter = self._next_suffix.get(base_slug, 2)
+
+        # Todos los sufijos menores a counter están ocupados; si el ignorado
+        # es uno de ellos, es el primero libre
+        if ignore:
+            parsed = _split_suffix(ignore)
+            if parsed and parsed[0] == base_slug and parsed[1] < counter:
+                return ignore
+
+        while True:
+            new_slug = f"{base_slug}-{counter}"
+            if new_slug == ignore or new_slug not in self:
+                break
+            counter += 1
+
+        self._next_suffix[base_slug] = counter
+        return new_slug
@@ -0,0 +1,37 @@
+"""
+Almacenamientos de recetas (strategy pattern).
+
+ParserService lee y guarda el catálogo a través de un RecipeStore; el
+formato se elige con RECIPES_STORAGE. recipes.json sigue siendo lo que lee
+el frontend: con los otros almacenamientos se exporta con compact_recipes.py.
+"""
+
+from .base import UNCHANGED, RecipeStore
+from .journal import JournaledRecipeStore
+from .json_store import JsonRecipeStore
+from .sharded import ShardedRecipeStore
+from .sqlite_store import SqliteRecipeStore
+
+# Mapeo nombre (RECIPES_STORAGE) → clase concreta
+STORES = {
+    "json": JsonRecipeStore,
+    # Un archivo por receta + manifest
+    "sharded": ShardedRecipeStore,
+    # SQLite con índices y FTS5
+    "sqlite": SqliteRecipeStore,
+    # recipes.json + journal append-only de cambios
+    "journal": JournaledRecipeStore,
+}
+
+DEFAULT_STORE = "json"
+
+__all__ = [
+    "STORES",
+    "DEFAULT_STORE",
+    "UNCHANGED",
+    "RecipeStore",
+    "JsonRecipeStore",
+    "JournaledRecipeStore",
+    "ShardedRecipeStore",
+    "SqliteRecipeStore",
+]
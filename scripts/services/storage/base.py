@@ -0,0 +1,90 @@
+"""
+Base de los almacenamientos de recetas.
+
+RecipeStore define el contrato que usa ParserService para leer y guardar el
+catálogo, sin saber si vive en recipes.json, en un archivo por receta o en
+SQLite. Todos guardan las recetas en el orden recibido (save_recipes ya las
+ordena por fecha) y las devuelven en ese mismo orden.
+"""
+
+from abc import ABC, abstractmethod
+
+from ..recipe_index import RecipeIndex
+from ..recipe_stream import write_recipes
+
+# Lo que devuelve save() cuando el catálogo guardado ya era igual
+UNCHANGED = "Sin cambios: no se reescribió nada"
+
+
+class RecipeStore(ABC):
+    """Contrato abstracto de un almacenamiento de recetas."""
+
+    @property
+    @abstractmethod
+    def location(self):
+        """Path del archivo o directorio donde viven las recetas."""
+
+    @abstractmethod
+    def exists(self):
+        """True si el almacenamiento ya tiene un catálogo guardado."""
+
+    @abstractmethod
+    def iter_recipes(self):
+        """Itera las recetas en el orden en que se guardaron."""
+
+    def load(self):
+        """Devuelve todas las recetas en el orden en que se guardaron."""
+        return list(self.iter_recipes())
+
+    def load_catalogue(self):
+        """Todas las recetas junto con su RecipeIndex (una sola pasada).
+
+        Returns:
+            tuple: (lista de recetas, RecipeIndex)
+        """
+        recipes = self.load()
+        return recipes, RecipeIndex.from_recipes(recipes)
+
+    @abstractmethod
+    def save(self, recipes):
+        """Guarda las recetas (reemplaza el catálogo completo).
+
+        Args:
+            recipes: Lista de recetas, en el orden en que se deben guardar
+
+        Returns:
+            str | None: Detalle de lo que se escribió, para mostrar
+                (UNCHANGED si no hizo falta escribir)
+        """
+
+    def get_index(self):
+        """Metadatos del catálogo (fecha máxima, ids, shortcodes, slugs).
+
+        Por defecto recorre las recetas; los almacenamientos que guardan
+        esos campos aparte lo sobrescriben para no cargar el contenido.
+        """
+        return RecipeIndex.from_recipes(self.iter_recipes())
+
+    def find_slugs(self, base_slug):
+        """Slugs ocupados que pueden chocar con base_slug (base_slug y base_slug-N).
+
+        Por defecto salen de get_index(); SQLite los busca con el índice de
+        la columna slug, sin recorrer el catálogo.
+
+        Returns:
+            list: Slugs, con repetidos (uno por receta que lo usa)
+        """
+        prefix = f"{base_slug}-"
+        return [
+            slug
+            for slug in self.get_index().slugs
+            if slug == base_slug or slug.startswith(prefix)
+        ]
+
+    def export_json(self, output_path):
+        """Escribe el catálogo como recipes.json (mismo formato que save_recipes).
+
+        Returns:
+            int: Cantidad de recetas escritas
+        """
+        return write_recipes(output_path, self.iter_recipes())
@@ -0,0 +1,342 @@
+"""
+Almacenamiento de recetas en recipes.json + un journal append-only.
+
+En lugar de reescribir recipes.json en cada corrida, save() compara las
+recetas con el estado actual y agrega al journal solo lo que cambió:
+recetas nuevas o reemplazadas ("upsert"), campos modificados ("patch"),
+recetas borradas ("delete") y, si cambió, el orden ("order").
+
+Cada save() es una sola línea del JSONL con todas sus operaciones
+({"ops": [...]}), escrita con fsync. Si el proceso se corta a mitad de la
+escritura la línea queda ilegible y se descarta entera al leer: nunca se
+aplica media tanda (por ejemplo las recetas nuevas sin el "order" o los
+"delete" que las acompañaban).
+
+Al leer se parte de recipes.json y se reaplica el journal. La compactación
+(compact_recipes.py o automática al superar JOURNAL_COMPACT_ENTRIES) vuelca
+el resultado en recipes.json con un archivo temporal + replace y recién
+después vacía el journal. Todas las operaciones son idempotentes: si el
+proceso se corta entre esos dos pasos, reaplicar el journal sobre el
+recipes.json nuevo da el mismo resultado.
+
+Guardar, parchear y compactar toman el lock de recipes.json (file_lock.py).
+La generación del catálogo es el hash de recipes.json más el tamaño del
+journal: save() no agrega nada si cambió desde que este store lo leyó.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from ..file_lock import (
+    StaleWriteError,
+    file_generation,
+    file_lock,
+    replace_atomic,
+    temp_path,
+)
+from ..recipe_index import RecipeIndex, save_index
+from ..recipe_stream import write_recipes
+from .base import RecipeStore
+
+_MISSING = object()
+
+
+def apply_entry(recipes, entry):
+    """
+    Aplica una operación del journal
+
+    Args:
+        recipes: Dict id → receta, en orden (se modifica en el lugar)
+        entry: Operación ({"op": "upsert" | "patch" | "delete" | "order", ...})
+    """
+    op = entry["op"]
+    if op == "upsert":
+        recipe = entry["recipe"]
+        recipes[recipe["id"]] = recipe
+    elif op == "patch":
+        recipe = recipes.get(entry["id"])
+        if recipe is None:
+            return
+        for field in entry.get("unset", []):
+            recipe.pop(field, None)
+        recipe.update(entry.get("set", {}))
+    elif op == "delete":
+        recipes.pop(entry["id"], None)
+    elif op == "order":
+        ordered = {rid: recipes[rid] for rid in entry["ids"] if rid in recipes}
+        # Las que no figuran en el orden (no debería pasar) quedan al final
+        ordered.update(recipes)
+        recipes.clear()
+        recipes.update(ordered)
+    else:
+        raise ValueError(f"Operación de journal desconocida: {op!r}")
+
+
+def diff_recipe(old, new):
+    """
+    Operación que lleva la receta old a new (None si son iguales). Se usa
+    "patch" con los campos que cambiaron, salvo que así no quede el mismo
+    orden de campos que new (recipes.json tiene que salir idéntico).
+    """
+    if old == new and list(old) == list(new):
+        return None
+
+    changed = {
+        field: value for field, value in new.items() if old.get(field, _MISSING) != value
+    }
+    removed = [field for field in old if field not in new]
+
+    patched_fields = [field for field in old if field not in removed]
+    patched_fields += [field for field in changed if field not in old]
+    if patched_fields != list(new):
+        return {"op": "upsert", "recipe": new}
+
+    entry = {"op": "patch", "id": new["id"], "set": changed}
+    if removed:
+        entry["unset"] = removed
+    return entry
+
+
+class RecipeJournal:
+    """Archivo JSONL de operaciones, con escrituras fsync'eadas."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Path del journal (se crea al primer append)
+        """
+        self.path = Path(path)
+
+    def append(self, entries):
+        """
+        Agrega una tanda de operaciones al final del journal, como una sola
+        línea (se aplica entera o no se aplica), y espera a que esté en disco
+
+        Returns:
+            int: Cantidad de operaciones escritas
+        """
+        if not entries:
+            return 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a+b") as f:
+            # Si una escritura anterior quedó cortada, aislar esa línea
+            f.seek(0, os.SEEK_END)
+            torn = False
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+            line = json.dumps({"ops": list(entries)}, ensure_ascii=False)
+            text = ("\n" if torn else "") + line + "\n"
+            f.write(text.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        return len(entries)
+
+    def iter_entries(self):
+        """
+        Itera las operaciones en el orden en que se escribieron. Las líneas
+        ilegibles (una tanda cortada) se saltean enteras con un aviso.
+        """
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"⚠️  Journal: línea {line_number} incompleta, se ignora")
+                    continue
+                if "ops" in record:
+                    yield from record["ops"]
+                else:
+                    # Journal de antes de las tandas: una operación por línea
+                    yield record
+
+    def size(self):
+        """Tamaño del journal en bytes (0 si no existe)."""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def count(self):
+        """Cantidad de operaciones del journal (de las tandas completas)."""
+        return sum(1 for _ in self.iter_entries())
+
+    def clear(self):
+        """Vacía el journal (después de compactar)."""
+        if self.path.exists():
+            with self.path.open("wb") as f:
+                os.fsync(f.fileno())
+
+
+class JournaledRecipeStore(RecipeStore):
+    """recipes.json como base + journal de cambios."""
+
+    def __init__(self, base, journal_path, compact_every=None):
+        """
+        Args:
+            base: JsonRecipeStore de recipes.json
+            journal_path: Path del journal
+            compact_every: Compactar al superar esta cantidad de operaciones
+                (None o 0: solo a mano, con compact_recipes.py)
+        """
+        self.base = base
+        self.journal = RecipeJournal(journal_path)
+        self.compact_every = compact_every
+        # Generación del catálogo la última vez que se leyó o escribió (None:
+        # todavía no se leyó, save() no chequea lost updates)
+        self.generation = None
+
+    @property
+    def location(self):
+        return self.journal.path
+
+    def exists(self):
+        return self.base.exists() or self.journal.size() > 0
+
+    def _current_generation(self):
+        """Hash de recipes.json + tamaño del journal."""
+        return f"{file_generation(self.base.recipes_path)}+{self.journal.size()}"
+
+    def _replay(self):
+        """Dict id → receta: recipes.json con el journal aplicado."""
+        # Se toma antes de leer: si algo cambia durante la lectura, el
+        # próximo save() lo detecta
+        self.generation = self._current_generation()
+        recipes = {}
+        if self.base.exists():
+            for recipe in self.base.load():
+                recipes[recipe.get("id")] = recipe
+        for entry in self.journal.iter_entries():
+            apply_entry(recipes, entry)
+        return recipes
+
+    def iter_recipes(self):
+        return iter(self._replay().values())
+
+    def load(self):
+        return list(self._replay().values())
+
+    def get_index(self):
+        if self.journal.size() == 0:
+            return self.base.get_index()
+        return RecipeIndex.from_recipes(self.iter_recipes())
+
+    def save(self, recipes):
+        """
+        Agrega al journal las operaciones que llevan el estado actual a
+        recipes (en ese orden)
+
+        Returns:
+            str: Operaciones agregadas al journal
+
+        Raises:
+            ValueError: Si hay ids repetidos o recetas sin id
+            StaleWriteError: Si el catálogo cambió desde que se leyó
+        """
+        with file_lock(self.base.recipes_path):
+            if (
+                self.generation is not None
+                and self._current_generation() != self.generation
+            ):
+                raise StaleWriteError(self.location)
+            return self._save(recipes)
+
+    def _save(self, recipes):
+        current = self._replay()
+
+        entries = []
+        seen_ids = []
+        for recipe in recipes:
+            recipe_id = recipe.get("id")
+            if recipe_id is None:
+                raise ValueError(f"Receta sin id: {recipe.get('name', '')!r}")
+            seen_ids.append(recipe_id)
+
+            old = current.get(recipe_id)
+            entry = (
+                {"op": "upsert", "recipe": recipe}
+                if old is None
+                else diff_recipe(old, recipe)
+            )
+            if entry is not None:
+                entries.append(entry)
+
+        kept_ids = set(seen_ids)
+        if len(kept_ids) != len(seen_ids):
+            duplicated = next(rid for rid in seen_ids if seen_ids.count(rid) > 1)
+            raise ValueError(f"Id de receta repetido: {duplicated}")
+
+        for recipe_id in current.keys() - kept_ids:
+            entries.append({"op": "delete", "id": recipe_id})
+
+        # Orden resultante de aplicar lo anterior: el actual (sin las
+        # borradas) con las nuevas al final
+        new_ids = [rid for rid in seen_ids if rid not in current]
+        expected = [rid for rid in current if rid in kept_ids] + new_ids
+        if expected != seen_ids:
+            entries.append({"op": "order", "ids": seen_ids})
+
+        written = self.journal.append(entries)
+        self.generation = self._current_generation()
+
+        detail = f"{written} operaciones agregadas al journal"
+        if self.compact_every and self.journal.count() > self.compact_every:
+            total = self.compact()
+            detail += f" (compactado en {self.base.location}: {total} recetas)"
+        return detail
+
+    def patch(self, recipe_id, fields):
+        """
+        Registra un cambio de campos de una receta sin reescribir nada más
+        (por ejemplo, una URL corregida por fix_reel_urls.py)
+        """
+        with file_lock(self.base.recipes_path):
+            in_sync = self.generation == self._current_generation()
+            self.journal.append([{"op": "patch", "id": recipe_id, "set": fields}])
+            if in_sync:
+                self.generation = self._current_generation()
+
+    def export_json(self, output_path):
+        """
+        Escribe el catálogo como recipes.json (temporal + replace). Si el
+        destino es el recipes.json base, compacta: vacía el journal.
+        """
+        output_path = Path(output_path)
+        if output_path.resolve() == Path(self.base.location).resolve():
+            return self.compact()
+        return _write_atomic(output_path, self.iter_recipes())
+
+    def compact(self):
+        """
+        Vuelca el journal en recipes.json y lo vacía
+
+        Returns:
+            int: Cantidad de recetas en recipes.json
+        """
+        with file_lock(self.base.recipes_path):
+            recipes = self.load()
+            total = _write_atomic(self.base.recipes_path, recipes)
+
+            index = RecipeIndex.from_recipes(recipes)
+            index.stamp(self.base.recipes_path)
+            save_index(index, self.base.index_path)
+            self.base.generation = index.content_hash
+
+            self.journal.clear()
+            self.generation = self._current_generation()
+        return total
+
+
+def _write_atomic(path, recipes):
+    """write_recipes a un temporal, con fsync y replace sobre path."""
+    tmp_path = temp_path(path)
+    try:
+        total = write_recipes(tmp_path, recipes)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    replace_atomic(tmp_path, path)
+    return total
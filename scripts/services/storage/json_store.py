@@ -0,0 +1,100 @@
+"""
+Almacenamiento en un único recipes.json (el formato que lee el frontend).
+
+Se acompaña del índice de metadatos de recipe_index.py para que obtener la
+fecha máxima o los ids no requiera parsear el archivo, y del snapshot
+binario de recipe_snapshot.py para que cargar las recetas no decodifique el
+JSON en cada arranque.
+
+save() escribe con lock, temporal + fsync + replace (file_lock.py) y, si
+este store ya leyó el archivo, solo si nadie lo cambió desde entonces.
+"""
+
+from pathlib import Path
+
+from ..file_lock import check_generation, file_lock, write_atomic
+from ..recipe_index import RecipeIndex, data_hash, get_index, load_index, save_index
+from ..recipe_snapshot import (
+    iter_catalogue,
+    load_catalogue,
+    snapshot_path as default_snapshot_path,
+    write_snapshot,
+)
+from ..recipe_stream import serialize_recipes
+from .base import UNCHANGED, RecipeStore
+
+
+class JsonRecipeStore(RecipeStore):
+    """recipes.json + índice de metadatos en la cache."""
+
+    def __init__(self, recipes_path, index_path, snapshot_path=None):
+        """
+        Args:
+            recipes_path: Path a recipes.json
+            index_path: Path del índice de metadatos
+            snapshot_path: Path del snapshot binario (None = el de la cache)
+        """
+        self.recipes_path = Path(recipes_path)
+        self.index_path = Path(index_path)
+        self.snapshot_path = (
+            Path(snapshot_path)
+            if snapshot_path is not None
+            else default_snapshot_path(self.recipes_path)
+        )
+        # Hash de recipes.json la última vez que se leyó o escribió (None:
+        # todavía no se leyó, save() no chequea lost updates)
+        self.generation = None
+
+    @property
+    def location(self):
+        return self.recipes_path
+
+    def exists(self):
+        return self.recipes_path.exists()
+
+    def iter_recipes(self):
+        return iter_catalogue(self.recipes_path, self.snapshot_path)
+
+    def load(self):
+        return self.load_catalogue()[0]
+
+    def load_catalogue(self):
+        recipes, index = load_catalogue(self.recipes_path, self.snapshot_path)
+        self.generation = index.content_hash
+        return recipes, index
+
+    def save(self, recipes):
+        """
+        Raises:
+            StaleWriteError: Si recipes.json cambió desde que se leyó
+        """
+        # Mismo formato que json.dump(indent=2, ensure_ascii=False)
+        data = serialize_recipes(recipes)
+        digest = data_hash(data)
+
+        with file_lock(self.recipes_path):
+            check_generation(self.recipes_path, self.generation)
+
+            # Si el archivo en disco ya tiene exactamente estos bytes (según
+            # el índice) no se escribe nada
+            saved = load_index(self.index_path)
+            if (
+                saved is not None
+                and saved.content_hash == digest
+                and self.recipes_path.exists()
+                and saved.matches(self.recipes_path)
+            ):
+                self.generation = digest
+                return UNCHANGED
+
+            self.generation = write_atomic(self.recipes_path, data)
+
+            # Actualizar el índice y el snapshot con lo que se acaba de escribir
+            index = RecipeIndex.from_recipes(recipes)
+            index.stamp(self.recipes_path, content_hash=digest)
+            save_index(index, self.index_path)
+            write_snapshot(self.snapshot_path, recipes, index)
+        return None
+
+    def get_index(self):
+        return get_index(self.recipes_path, self.index_path)
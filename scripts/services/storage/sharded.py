@@ -0,0 +1,181 @@
+"""
+Almacenamiento opcional de recetas en un archivo JSON por id más un
+manifest (id, slug, shortcode, fecha y hash del contenido), en el orden en
+que se guardan.
+
+Con recipes.json cada corrida reescribe el catálogo entero aunque haya
+cambiado una sola receta. Acá save() solo escribe los archivos cuyo hash
+cambió y borra los de recetas que ya no están; export_json() (vía
+compact_recipes.py) arma el recipes.json monolítico que necesita el frontend.
+
+save() trabaja con lock sobre el directorio: escribe cada archivo con
+temporal + replace, publica el manifest nuevo y recién entonces borra los
+archivos que quedaron afuera, así un corte en el medio nunca deja un
+manifest que apunte a archivos borrados. Como JsonRecipeStore, si este
+store ya leyó el manifest solo guarda si nadie lo cambió desde entonces.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from ..file_lock import StaleWriteError, file_lock, temp_path, write_atomic
+from ..recipe_index import RecipeIndex, data_hash
+from .base import RecipeStore
+
+MANIFEST_FILE = "manifest.json"
+
+
+def serialize_recipe(recipe):
+    """Texto con el que se guarda una receta en su archivo"""
+    return json.dumps(recipe, ensure_ascii=False, indent=2) + "\n"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ShardedRecipeStore(RecipeStore):
+    """Un archivo por receta ({id}.json) + manifest.json."""
+
+    def __init__(self, root):
+        """
+        Args:
+            root: Directorio de los archivos de recetas
+        """
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_FILE
+        # Hash del manifest la última vez que se leyó o escribió (None:
+        # todavía no se leyó, save() no chequea lost updates)
+        self.generation = None
+
+    @property
+    def location(self):
+        return self.root
+
+    def recipe_path(self, recipe_id):
+        return self.root / f"{recipe_id}.json"
+
+    def exists(self):
+        return self.manifest_path.exists()
+
+    def _read_manifest(self):
+        """
+        Returns:
+            tuple: (entradas, generación: hash del manifest o "" si no existe)
+        """
+        try:
+            data = self.manifest_path.read_bytes()
+        except FileNotFoundError:
+            return [], ""
+        return json.loads(data), data_hash(data)
+
+    def load_manifest(self):
+        """
+        Returns:
+            list: Entradas {id, slug, shortcode, date, hash} en orden ([] si
+                no existe)
+        """
+        manifest, self.generation = self._read_manifest()
+        return manifest
+
+    def iter_recipes(self):
+        """Itera las recetas en el orden del manifest, leyendo de a una"""
+        for entry in self.load_manifest():
+            with self.recipe_path(entry["id"]).open("r", encoding="utf-8") as f:
+                yield json.load(f)
+
+    def get_index(self):
+        # El manifest ya tiene id, slug, shortcode y fecha por receta
+        return RecipeIndex.from_recipes(self.load_manifest())
+
+    def save(self, recipes):
+        """
+        Guarda las recetas en el orden dado, escribiendo solo los archivos
+        que cambiaron
+
+        Args:
+            recipes: Lista de recetas (ids únicos)
+
+        Returns:
+            str: Archivos escritos y borrados
+
+        Raises:
+            ValueError: Si hay ids repetidos o recetas sin id
+            StaleWriteError: Si el manifest cambió desde que se leyó
+        """
+        with file_lock(self.root):
+            saved, generation = self._read_manifest()
+            if self.generation is not None and generation != self.generation:
+                raise StaleWriteError(self.manifest_path)
+            return self._save(recipes, saved, generation)
+
+    def _save(self, recipes, saved, generation):
+        """save() ya con el lock tomado y el manifest guardado leído"""
+        previous = {entry["id"]: entry for entry in saved}
+
+        manifest = []
+        seen_ids = set()
+        written = 0
+        for recipe in recipes:
+            recipe_id = recipe.get("id")
+            if recipe_id is None:
+                raise ValueError(f"Receta sin id: {recipe.get('name', '')!r}")
+            if recipe_id in seen_ids:
+                raise ValueError(f"Id de receta repetido: {recipe_id}")
+            seen_ids.add(recipe_id)
+
+            text = serialize_recipe(recipe)
+            digest = content_hash(text)
+            old_entry = previous.get(recipe_id)
+            path = self.recipe_path(recipe_id)
+            if old_entry is None or old_entry["hash"] != digest or not path.exists():
+                self.root.mkdir(parents=True, exist_ok=True)
+                _write_shard(path, text)
+                written += 1
+
+            manifest.append(
+                {
+                    "id": recipe_id,
+                    "slug": recipe.get("slug", ""),
+                    "shortcode": recipe.get("shortcode", ""),
+                    "date": recipe.get("date"),
+                    "hash": digest,
+                }
+            )
+
+        # Primero el manifest nuevo: los archivos que se borran después ya
+        # no figuran en él
+        if saved != manifest:
+            self.root.mkdir(parents=True, exist_ok=True)
+            data = (json.dumps(manifest, ensure_ascii=False, indent=2) + "\n").encode(
+                "utf-8"
+            )
+            self.generation = write_atomic(self.manifest_path, data)
+        else:
+            self.generation = generation
+
+        removed = 0
+        for recipe_id in previous.keys() - seen_ids:
+            path = self.recipe_path(recipe_id)
+            if path.exists():
+                path.unlink()
+                removed += 1
+
+        return f"{written} archivos escritos, {removed} borrados"
+
+
+def _write_shard(path, text):
+    """Escribe el archivo de una receta con temporal + fsync + replace (sin
+    lock propio: save() ya tiene el del directorio)"""
+    tmp_path = temp_path(path)
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
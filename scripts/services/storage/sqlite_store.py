@@ -0,0 +1,294 @@
+"""
+Almacenamiento de recetas en SQLite.
+
+Cada receta se guarda completa (JSON) junto con columnas indexadas para id,
+slug, shortcode, fecha y hidden; los tags y los ingredientes limpios van en
+tablas de unión indexadas, y una tabla FTS5 cubre nombre, descripción e
+ingredientes. Así las búsquedas por slug, tag, ingrediente o texto no
+recorren todo el catálogo.
+
+La base usa WAL: varias etapas del pipeline pueden leer mientras otra
+escribe. Cada operación abre su propia conexión.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from ..recipe_index import RecipeIndex
+from .base import RecipeStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    slug TEXT,
+    shortcode TEXT,
+    date TEXT,
+    hidden INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recipes_position ON recipes(position);
+CREATE INDEX IF NOT EXISTS idx_recipes_slug ON recipes(slug);
+CREATE INDEX IF NOT EXISTS idx_recipes_shortcode ON recipes(shortcode);
+CREATE INDEX IF NOT EXISTS idx_recipes_date ON recipes(date);
+CREATE INDEX IF NOT EXISTS idx_recipes_hidden ON recipes(hidden);
+
+CREATE TABLE IF NOT EXISTS recipe_tags (
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (recipe_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_recipe_tags_tag ON recipe_tags(tag);
+
+CREATE TABLE IF NOT EXISTS recipe_ingredients (
+    recipe_id INTEGER NOT NULL REFERENCES recipes(id) ON DELETE CASCADE,
+    ingredient TEXT NOT NULL,
+    PRIMARY KEY (recipe_id, ingredient)
+);
+CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_ingredient
+    ON recipe_ingredients(ingredient);
+"""
+
+# rowid = id de la receta; sin acentos para que "rapida" encuentre "rápida"
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+    name, description, ingredients,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def fts_query(text):
+    """
+    Convierte texto libre ("Cena rápida sin gluten") en una consulta FTS5
+    que matchea cualquiera de las palabras (ordenada después por bm25)
+    """
+    words = "".join(c if c.isalnum() else " " for c in text).split()
+    return " OR ".join(f'"{w}"' for w in words)
+
+
+class SqliteRecipeStore(RecipeStore):
+    """Catálogo en una base SQLite con índices y búsqueda full-text."""
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: Path del archivo de la base (se crea si no existe)
+        """
+        self.db_path = Path(db_path)
+        self._fts = None
+
+    @property
+    def location(self):
+        return self.db_path
+
+    def connect(self):
+        """Conexión nueva con el esquema creado (WAL, foreign keys)."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        if self._fts is None:
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError:
+                # SQLite compilado sin FTS5: todo funciona menos search()
+                print("⚠️  SQLite sin FTS5: la búsqueda de texto no está disponible")
+                self._fts = False
+        return conn
+
+    def exists(self):
+        if not self.db_path.exists():
+            return False
+        with closing(self.connect()) as conn:
+            return conn.execute("SELECT 1 FROM recipes LIMIT 1").fetchone() is not None
+
+    def iter_recipes(self):
+        with closing(self.connect()) as conn:
+            for (data,) in conn.execute("SELECT data FROM recipes ORDER BY position"):
+                yield json.loads(data)
+
+    def save(self, recipes):
+        """
+        Guarda las recetas en el orden dado en una sola transacción; solo
+        reescribe las filas (y sus tags, ingredientes y texto) que cambiaron
+
+        Raises:
+            ValueError: Si hay ids repetidos o recetas sin id
+        """
+        written = 0
+        with closing(self.connect()) as conn:
+            with conn:
+                previous = dict(conn.execute("SELECT id, data FROM recipes"))
+                seen_ids = set()
+
+                for position, recipe in enumerate(recipes):
+                    recipe_id = recipe.get("id")
+                    if recipe_id is None:
+                        raise ValueError(f"Receta sin id: {recipe.get('name', '')!r}")
+                    if recipe_id in seen_ids:
+                        raise ValueError(f"Id de receta repetido: {recipe_id}")
+                    seen_ids.add(recipe_id)
+
+                    data = json.dumps(recipe, ensure_ascii=False)
+                    if previous.get(recipe_id) == data:
+                        conn.execute(
+                            "UPDATE recipes SET position = ? WHERE id = ? AND position != ?",
+                            (position, recipe_id, position),
+                        )
+                        continue
+
+                    self._write_recipe(conn, position, recipe, data, recipe_id in previous)
+                    written += 1
+
+                removed_ids = [(rid,) for rid in previous.keys() - seen_ids]
+                conn.executemany("DELETE FROM recipes WHERE id = ?", removed_ids)
+                if self._fts:
+                    conn.executemany("DELETE FROM recipes_fts WHERE rowid = ?", removed_ids)
+
+        return f"{written} recetas escritas, {len(removed_ids)} borradas"
+
+    def _write_recipe(self, conn, position, recipe, data, replace):
+        recipe_id = recipe["id"]
+        if replace:
+            conn.execute("DELETE FROM recipe_tags WHERE recipe_id = ?", (recipe_id,))
+            conn.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (recipe_id,))
+            if self._fts:
+                conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", (recipe_id,))
+
+        conn.execute(
+            "INSERT INTO recipes (id, position, slug, shortcode, date, hidden, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(id) DO UPDATE SET position = excluded.position,"
+            " slug = excluded.slug, shortcode = excluded.shortcode,"
+            " date = excluded.date, hidden = excluded.hidden, data = excluded.data",
+            (
+                recipe_id,
+                position,
+                recipe.get("slug"),
+                recipe.get("shortcode"),
+                recipe.get("date"),
+                int(bool(recipe.get("hidden", False))),
+                data,
+            ),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO recipe_tags (recipe_id, tag) VALUES (?, ?)",
+            [(recipe_id, tag) for tag in recipe.get("tags", [])],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO recipe_ingredients (recipe_id, ingredient) VALUES (?, ?)",
+            [(recipe_id, ing) for ing in recipe.get("cleaned_ingredientes", [])],
+        )
+        if self._fts:
+            conn.execute(
+                "INSERT INTO recipes_fts (rowid, name, description, ingredients)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    recipe_id,
+                    recipe.get("name", ""),
+                    recipe.get("description", ""),
+                    "\n".join(recipe.get("ingredients", [])),
+                ),
+            )
+
+    def get_index(self):
+        # Solo columnas indexadas: no se decodifica el JSON de cada receta
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, slug, shortcode, date FROM recipes ORDER BY position"
+            )
+            return RecipeIndex.from_recipes(
+                {
+                    key: value
+                    for key, value in zip(("id", "slug", "shortcode", "date"), row)
+                    if value is not None
+                }
+                for row in rows
+            )
+
+    def _fetch(self, query, params=()):
+        with closing(self.connect()) as conn:
+            return [json.loads(data) for (data,) in conn.execute(query, params)]
+
+    def get(self, recipe_id):
+        """Receta por id (None si no existe)."""
+        found = self._fetch("SELECT data FROM recipes WHERE id = ?", (recipe_id,))
+        return found[0] if found else None
+
+    def find_by_slug(self, slug):
+        """Recetas con ese slug (más de una si está duplicado)."""
+        return self._fetch(
+            "SELECT data FROM recipes WHERE slug = ? ORDER BY position", (slug,)
+        )
+
+    def find_slugs(self, base_slug):
+        # Rango sobre el índice de slug: "base-" <= slug < "base." cubre
+        # todos los "base-..." ("." es el caracter siguiente a "-")
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                "SELECT slug FROM recipes WHERE slug = ? OR (slug >= ? AND slug < ?)",
+                (base_slug, f"{base_slug}-", f"{base_slug}."),
+            )
+            return [slug for (slug,) in rows]
+
+    def find_by_shortcode(self, shortcode):
+        """Recetas con ese shortcode."""
+        return self._fetch(
+            "SELECT data FROM recipes WHERE shortcode = ? ORDER BY position", (shortcode,)
+        )
+
+    def find_by_tag(self, tag):
+        """Recetas con ese tag, en orden de guardado."""
+        return self._fetch(
+            "SELECT r.data FROM recipes r JOIN recipe_tags t ON t.recipe_id = r.id"
+            " WHERE t.tag = ? ORDER BY r.position",
+            (tag,),
+        )
+
+    def find_by_ingredient(self, ingredient):
+        """Recetas con ese ingrediente limpio, en orden de guardado."""
+        return self._fetch(
+            "SELECT r.data FROM recipes r JOIN recipe_ingredients i ON i.recipe_id = r.id"
+            " WHERE i.ingredient = ? ORDER BY r.position",
+            (ingredient,),
+        )
+
+    def duplicate_slugs(self):
+        """Dict slug → cantidad, solo para slugs usados por más de una receta."""
+        with closing(self.connect()) as conn:
+            return dict(
+                conn.execute(
+                    "SELECT slug, COUNT(*) FROM recipes WHERE slug IS NOT NULL"
+                    " AND slug != '' GROUP BY slug HAVING COUNT(*) > 1"
+                )
+            )
+
+    def search(self, text, limit=20):
+        """
+        Búsqueda full-text sobre nombre, descripción e ingredientes
+
+        Args:
+            text: Texto libre (matchea cualquiera de sus palabras)
+            limit: Máximo de resultados
+
+        Returns:
+            list: Recetas ordenadas por relevancia (bm25)
+        """
+        query = fts_query(text)
+        if not query or not self._fts_available():
+            return []
+        return self._fetch(
+            "SELECT r.data FROM recipes_fts f JOIN recipes r ON r.id = f.rowid"
+            " WHERE recipes_fts MATCH ? ORDER BY bm25(recipes_fts) LIMIT ?",
+            (query, limit),
+        )
+
+    def _fts_available(self):
+        if self._fts is None:
+            self.connect().close()
+        return self._fts
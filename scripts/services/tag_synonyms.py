@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tag Synonyms
+Índice inverso de TAG_SYNONYMS (sinónimo en minúsculas → tag canónico),
+construido una sola vez al importar el módulo.
+
+Antes cada hashtag recorría todas las entradas de TAG_SYNONYMS armando una
+lista en minúsculas por entrada; con el índice la resolución es O(1).
+"""
+
+import sys
+from pathlib import Path
+from types import MappingProxyType
+
+# Agregar el directorio scripts al path para importar constants
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from constants import TAG_SYNONYMS, TAGS_TO_SKIP
+
+
+def build_synonym_index(tag_synonyms, strict=False):
+    """
+    Arma el índice inverso sinónimo → tag canónico.
+
+    Si un sinónimo aparece bajo dos tags canónicos gana el primero en orden
+    de TAG_SYNONYMS (mismo comportamiento que la búsqueda lineal original) y
+    el caso se reporta como conflicto.
+
+    Args:
+        tag_synonyms: Dict tag canónico → lista de sinónimos
+        strict: Si True, un conflicto lanza ValueError
+
+    Returns:
+        tuple: (índice de solo lectura, tupla de conflictos
+            (sinónimo, canónico que gana, canónico descartado))
+    """
+    index = {}
+    conflicts = []
+
+    for main_tag, synonyms in tag_synonyms.items():
+        for synonym in synonyms:
+            key = synonym.lower()
+            current = index.setdefault(key, main_tag)
+            if current != main_tag:
+                conflicts.append((key, current, main_tag))
+
+    if strict and conflicts:
+        detail = ", ".join(f"{s!r} ({a} / {b})" for s, a, b in conflicts)
+        raise ValueError(f"Sinónimos asignados a más de un tag: {detail}")
+
+    return MappingProxyType(index), tuple(conflicts)
+
+
+SYNONYM_INDEX, SYNONYM_CONFLICTS = build_synonym_index(TAG_SYNONYMS)
+
+# TAGS_TO_SKIP como set para chequeos O(1)
+TAGS_TO_SKIP_SET = frozenset(TAGS_TO_SKIP)
+
+
+def resolve_tag(tag_lower):
+    """
+    Devuelve el tag canónico de un tag en minúsculas, o None si no es sinónimo
+    """
+    return SYNONYM_INDEX.get(tag_lower)
@@ -3,6 +3,7 @@ Script para actualizar índices de Google y Bing
 Ejecutar como: python update_search_engines.py
 """
 
+import argparse
 import httplib2
 import json
 import requests
@@ -12,12 +13,18 @@ from random import random
 from xml.etree import ElementTree
 from oauth2client.service_account import ServiceAccountCredentials
 
-from constants import BING_API_KEY, BING_BULK_SIZE, JSON_KEY_FILE, SITE_URL
+from constants import BING_API_KEY, BING_BULK_SIZE, JSON_KEY_FILE, RECIPES_FILE, SITE_URL
+from services.fingerprints import SOURCE_FIELDS
+from services.parser_service import ParserService
 
 
 # ============= CONFIGURACIÓN =============
 SCRIPT_DIR = Path(__file__).resolve().parent
 SITEMAP_PATH = SCRIPT_DIR.parent / "public" / "sitemap.xml"
+# Nombre del snapshot de hashes de las recetas ya enviadas (--changed-only)
+SNAPSHOT_NAME = "search_engines"
+# Cambios que modifican la página de una receta
+PAGE_FIELDS = SOURCE_FIELDS + ("tags", "slug")
 
 
 # ============= FUNCIONES =============
@@ -56,6 +63,31 @@ def extraer_urls_del_sitemap(sitemap_path):
         return []
 
 
+def recipe_url(recipe):
+    """URL pública de una receta (misma forma que generate-sitemap.js)."""
+    return f"{SITE_URL.rstrip('/')}/recipe/{recipe.get('slug') or recipe['id']}/"
+
+
+def filtrar_urls_cambiadas(urls, parser, recipes):
+    """
+    Deja solo las URLs de recetas nuevas o modificadas desde el último envío.
+
+    Args:
+        urls (list): URLs del sitemap
+        parser (ParserService): Servicio con los snapshots de cambios
+        recipes (list): Recetas actuales
+
+    Returns:
+        list: URLs a enviar, en el orden del sitemap
+    """
+    changes = parser.changes_since(SNAPSHOT_NAME, recipes)
+    changed_ids = changes.changed_ids(PAGE_FIELDS)
+    print(f"🧬 Cambios desde el último envío: {changes.summary()}")
+
+    changed_urls = {recipe_url(r) for r in recipes if r.get("id") in changed_ids}
+    return [url for url in urls if url in changed_urls]
+
+
 def step_delay():
     """
     Aplica un delay aleatorio entre requests para evitar rate limiting.
@@ -227,6 +259,16 @@ def main():
     """
     Función principal que ejecuta la actualización de ambos buscadores.
     """
+    parser_args = argparse.ArgumentParser(
+        description="Envía las URLs del sitemap a Google, Bing e IndexNow"
+    )
+    parser_args.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Enviar solo las recetas nuevas o modificadas desde el último envío",
+    )
+    args = parser_args.parse_args()
+
     print("\n" + "=" * 50)
     print("🔄 ACTUALIZADOR DE ÍNDICES - Google & Bing")
     print("=" * 50 + "\n")
@@ -240,11 +282,24 @@ def main():
 
     print(f"📊 Se encontraron {len(urls)} URLs en el sitemap\n")
 
+    if args.changed_only:
+        parser = ParserService(RECIPES_FILE)
+        recipes, _ = parser.get_existing_recipes()
+        urls = filtrar_urls_cambiadas(urls, parser, recipes)
+        if not urls:
+            print("✨ No hay recetas nuevas ni modificadas para enviar")
+            return
+        print(f"📊 {len(urls)} URLs con cambios\n")
+
     # Ejecutar actualizaciones
     solicitar_indexacion_google(urls)
     enviar_a_bing(urls, BING_API_KEY)
     submit_urls_to_indexnow(urls, BING_API_KEY)
 
+    if args.changed_only:
+        # Lo enviado no se vuelve a mandar en la próxima corrida
+        parser.save_snapshot(SNAPSHOT_NAME, recipes)
+
     print("=" * 50)
     print("✅ Proceso completado")
     print("=" * 50 + "\n")